@@ -0,0 +1,90 @@
+"""
+Compare the resident memory of a queue of AudioTracks and a TrackQueue
+
+Usage: python benchmarks/queue_memory.py [tracks per queue] [queues]
+"""
+import base64
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from lavalink import AudioTrack  # pylint: disable=C0413, E0401
+
+from ext.track_queue import TrackQueue  # pylint: disable=C0413, E0401
+
+ARTISTS = [f"Artist {i}" for i in range(200)]
+SOURCES = ["youtube", "soundcloud", "spotify"]
+
+
+def make_playlist(size: int) -> str:
+    """Build a Lavalink playlist response, as JSON like it comes off the wire"""
+    rng = random.Random(size)
+    tracks = []
+    for i in range(size):
+        identifier = base64.urlsafe_b64encode(rng.randbytes(8)).decode()[:11]
+        tracks.append(
+            {
+                "encoded": base64.b64encode(rng.randbytes(220)).decode(),
+                "info": {
+                    "identifier": identifier,
+                    "isSeekable": True,
+                    "author": rng.choice(ARTISTS),
+                    "length": rng.randint(120_000, 420_000),
+                    "isStream": False,
+                    "position": 0,
+                    "title": f"Song number {i} (Official Video)",
+                    "uri": f"https://www.youtube.com/watch?v={identifier}",
+                    "artworkUrl": f"https://i.ytimg.com/vi/{identifier}/maxresdefault.jpg",
+                    "isrc": None,
+                    "sourceName": rng.choice(SOURCES),
+                },
+                "pluginInfo": {},
+                "userData": {},
+            }
+        )
+    return json.dumps(tracks)
+
+
+def measure(build, payload: str, queues: int) -> int:
+    """Allocated bytes held by `queues` queues built from the payload"""
+    tracemalloc.start()
+    held = []
+    for guild in range(queues):
+        # Every guild loads the playlist on its own, like separate /play calls
+        held.append(build(json.loads(payload), guild))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def build_list(tracks, requester):
+    return [AudioTrack(track, requester) for track in tracks]
+
+
+def build_queue(tracks, requester):
+    queue = TrackQueue()
+    queue.extend(AudioTrack(track, requester) for track in tracks)
+    return queue
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    queues = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    payload = make_playlist(size)
+
+    baseline = measure(build_list, payload, queues)
+    compacted = measure(build_queue, payload, queues)
+    total = size * queues
+
+    print(f"{queues} queues x {size} tracks")
+    print(f"list[AudioTrack]: {baseline / 2**20:8.1f} MiB ({baseline / total:6.0f} B/track)")
+    print(f"TrackQueue:       {compacted / 2**20:8.1f} MiB ({compacted / total:6.0f} B/track)")
+    print(f"saved:            {(1 - compacted / baseline) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,45 @@
-import random  # pylint: disable=E0401
+import asyncio  # pylint: disable=E0401
 import re  # pylint: disable=E0401
-from typing import Any, Dict, List, Optional  # pylint: disable=E0401
+import time  # pylint: disable=E0401
+from typing import Any, Callable, Dict, List, Optional  # pylint: disable=E0401
 
 import disnake  # pylint: disable=C0302, C0114, E0401
 import lavalink  # pylint: disable=E0401
 from disnake.ext import commands  # pylint: disable=E0401
-from lavalink import LoadType, Node  # pylint: disable=E0401
-from lavalink.errors import ClientError  # pylint: disable=E0401
+from lavalink import AudioTrack, EndReason, LoadResult, LoadType, Node  # pylint: disable=E0401
+from lavalink.errors import ClientError, RequestError  # pylint: disable=E0401
+from lavalink.events import NodeChangedEvent  # pylint: disable=E0401
+from lavalink.events import NodeReadyEvent  # pylint: disable=E0401
 from lavalink.events import QueueEndEvent  # pylint: disable=E0401
 from lavalink.events import TrackEndEvent  # pylint: disable=E0401
 from lavalink.events import TrackExceptionEvent  # pylint: disable=E0401
 from lavalink.events import TrackStartEvent  # pylint: disable=E0401; pylint: disable=E0401
 
+from ext.admission import AdmissionController, AdmissionRejected, admitted, request_guild  # pylint: disable=E0401
+from ext.batch_import import BatchImporter, split_queries  # pylint: disable=E0401
+from ext.component_router import ComponentRouter  # pylint: disable=E0401
+from ext.federated_search import FederatedSearch  # pylint: disable=E0401
+from ext.guild_executor import QUEUE, GuildBusy, GuildExecutor, serialized, serialized_event  # pylint: disable=E0401
+from ext.lazy_resolver import LazyResolver  # pylint: disable=E0401
+from ext.live_panels import LivePanels  # pylint: disable=E0401
 from ext.logger import get_logger  # pylint: disable=E0401
+from ext.message_scheduler import MessageScheduler  # pylint: disable=E0401
+from ext.metrics import Metrics  # pylint: disable=E0401
+from ext.node_health import NodeHealthMonitor  # pylint: disable=E0401
+from ext.node_pool import NodePool  # pylint: disable=E0401
+from ext.persistent_cache import PersistentTrackCache  # pylint: disable=E0401
+from ext.play_history import PlayHistory  # pylint: disable=E0401
+from ext.player import MusicPlayer  # pylint: disable=E0401
+from ext.prefetch import TrackPrefetcher  # pylint: disable=E0401
+from ext.progressive_enqueue import ProgressiveEnqueue  # pylint: disable=E0401
+from ext.queue_journal import QueueJournal  # pylint: disable=E0401
+from ext.queue_view import QueueControls, QueuePages  # pylint: disable=E0401
+from ext.search_sessions import SearchSessions  # pylint: disable=E0401
+from ext.session_resume import SessionStore  # pylint: disable=E0401
+from ext.singleflight import SingleFlight  # pylint: disable=E0401
+from ext.track_cache import TrackCache, clone_result  # pylint: disable=E0401
 from ext.utils import Utils  # pylint: disable=E0401
+from ext.voice_lifecycle import VoiceLifecycle  # pylint: disable=E0401
 
 logger = get_logger("MusicCog")
 
@@ -23,6 +49,18 @@ URL_RX = re.compile(r"https?://(?:www\.)?.+")
 SPOTIFY_URL_PATTERN = re.compile(
     r"https?://open.spotify.com/(?P<type>album|playlist|track|artist)/(?P<id>[a-zA-Z0-9]+)"
 )
+# YouTube video opened from a playlist, the video can start before the playlist loads
+YOUTUBE_PLAYLIST_VIDEO = re.compile(
+    r"https?://(?:www\.|music\.)?youtube\.com/watch\?(?=.*\bv=(?P<video>[\w-]{11}))(?=.*\blist=[\w-]+)"
+)
+# Search prefixes behind the /search platform choices, None means every enabled source
+SEARCH_PLATFORMS = {
+    "YouTube": ["ytsearch"],
+    "SoundCloud": ["scsearch"],
+    "All": None,
+}
+# Encoded tracks decoded per request when restoring queues
+DECODE_BATCH = 500
 
 
 # noinspection PyMissingConstructor
@@ -38,15 +76,9 @@ class LavalinkVoiceClient(disnake.VoiceProtocol):
         self._destroyed = False
 
         if not hasattr(self.client, "lavalink"):
-            self.client.lavalink = lavalink.Client(client.user.id)
-            # Configure your lavalink node details here
-            self.client.lavalink.add_node(
-                host="localhost",
-                port=8080,
-                password="youshallnotpass",
-                region="us",
-                name="default-node",
-            )
+            # Nodes are configured in the "lavalink" section of config/config.json
+            node_pool = NodePool.from_config(Utils.load_config().get("lavalink", {}))
+            self.client.lavalink = node_pool.create_client(client.user.id, player=MusicPlayer)
 
         self.lavalink = self.client.lavalink
 
@@ -133,12 +165,102 @@ class MusicCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.utils = Utils()
+        self.config = Utils.load_config()
+        self.lavalink: Optional[lavalink.Client] = None
+
+        # Lavalink sessions and players handed over by the previous process
+        self.session_store = SessionStore.from_config(self.config.get("resume", {}))
+        self._resume_state = self.session_store.load()
+
+        # Every guild's queue, journaled to survive a crash
+        self.queue_journal = QueueJournal.from_config(self.config.get("queue_journal", {}))
+        self._journal_state: Dict[int, Dict[str, Any]] = {}
+
+        # Shared cache of Lavalink load results across all guilds
+        self.track_cache = TrackCache.from_config(self.config.get("cache", {}))
+
+        # Disk-backed tier shared across restarts and bot processes
+        persistent_config = self.config.get("persistent_cache", {})
+        self.persistent_cache: Optional[PersistentTrackCache] = None
+        if persistent_config.get("enabled", True):
+            self.persistent_cache = PersistentTrackCache.from_config(persistent_config)
+
+        # Concurrent identical loads share a single Lavalink request
+        self.track_loads = SingleFlight()
+
+        # Lavalink nodes players get placed on
+        self.node_pool = NodePool.from_config(self.config.get("lavalink", {}))
+        self.node_monitor: Optional[NodeHealthMonitor] = None
+
+        # Parallel, deadline-bounded search across every enabled source
+        self.federated_search = FederatedSearch.from_config(
+            self.load_tracks, self.config.get("search", {})
+        )
+
+        # Runtime counters and latency summaries, shown by /stats
+        self.metrics = Metrics()
+        self._track_ended: Dict[int, float] = {}
+
+        # Commands and player events of a guild run one at a time, in order
+        self.guild_executor = GuildExecutor.from_config(
+            self.metrics, self.config.get("guild_executor", {})
+        )
+
+        # Track loads of user requests are rate limited, bounded and shed when busy
+        self.admission = AdmissionController.from_config(
+            self.metrics, self.config.get("admission", {})
+        )
+
+        # Connections linger after the queue ends, idle and abandoned ones get reaped
+        self.voice_lifecycle = VoiceLifecycle.from_config(
+            lambda guild_id, reason: self.guild_executor.run(
+                guild_id, lambda: self._leave_voice(guild_id, reason), QUEUE
+            ),
+            self._is_channel_empty,
+            self.config.get("voice", {}),
+        )
+
+        # Opt-in /nowplaying and /queue messages refreshed by one shared ticker
+        self.live_panels = LivePanels.from_config(self.metrics, self.config.get("live_panels", {}))
+
+        # Event messages go through per-channel, rate limited queues
+        self.outbox = MessageScheduler.from_config(self.metrics, self.config.get("outbound", {}))
+
+        # Pending /search results per guild, user and search
+        self.search_sessions = SearchSessions.from_config(
+            self.config.get("search_sessions", {})
+        )
+
+        # Mirrored playlist entries get resolved shortly before they play
+        self.lazy_resolver = LazyResolver.from_config(
+            self.load_tracks, self.config.get("lazy_playlists", {})
+        )
+
+        # Pasted batches of links and queries resolve together
+        self.batch_importer = BatchImporter.from_config(
+            self.resolve_query, self.config.get("batch_import", {})
+        )
+
+        # Large playlists start playing before every track is queued
+        self.enqueuer = ProgressiveEnqueue.from_config(
+            self.mutate_queue, self.start_playback, self.config.get("progressive_enqueue", {})
+        )
+
+        # The next entries are checked while the current track plays
+        prefetch_config = self.config.get("prefetch", {})
+        self.prefetcher: Optional[TrackPrefetcher] = None
+        if prefetch_config.get("enabled", True):
+            self.prefetcher = TrackPrefetcher.from_config(
+                self.lazy_resolver,
+                self.validate_load,
+                self.metrics,
+                prefetch_config,
+            )
 
         bot.loop.create_task(self._setup_lavalink())
 
-        self._queue_history: Dict[
-            int, List[Dict[str, Any]]
-        ] = {}  # Store queue history per guild
+        # Recently played tracks, written behind to disk for /history
+        self.play_history = PlayHistory.from_config(self.config.get("history", {}))
 
         # Map of emojis for different music sources
         self.source_emojis = {
@@ -153,39 +275,274 @@ class MusicCog(commands.Cog):
             "local": "💻",
         }
 
+        # Components carry their state in their custom IDs, one router serves them all
+        self.components = ComponentRouter()
+        self.components.route("search_pick", self._on_search_pick)
+
+        # Rendered /queue pages, reused until the queue changes
+        self.queue_pages = QueuePages(self.format_time, self.get_platform_emoji)
+        self.queue_controls = QueueControls(
+            self.queue_pages,
+            self.components,
+            lambda guild_id: self.lavalink.player_manager.get(guild_id),
+        )
+
         logger.info("Music cog initialized")
 
     async def _setup_lavalink(self):
         """Setup Lavalink once the bot is ready"""
+        if self.persistent_cache:
+            try:
+                await self.persistent_cache.open()
+                warmed = await self.persistent_cache.warm(self.track_cache)
+                logger.info(f"Warmed track cache with {warmed} entries")
+            except Exception:  # pylint: disable=W0718
+                # A corrupt or locked file must not keep Lavalink from starting
+                logger.error(
+                    "Failed to open the persistent track cache, using the in-memory cache only",
+                    exc_info=True,
+                )
+                self.persistent_cache.close()
+                self.persistent_cache = None
+        if self.play_history.store:
+            await self.play_history.store.start()
+
+        # Guilds handed over through the resume file are rebuilt from it instead
+        resumed = self._resume_state["players"] if self._resume_state else {}
+        self._journal_state = {
+            guild_id: state
+            for guild_id, state in self.queue_journal.load().items()
+            if str(guild_id) not in resumed
+        }
+        await self.queue_journal.start(
+            lambda: self.lavalink.player_manager.players.values() if self.lavalink else ()
+        )
+        MusicPlayer.observers.append(self.queue_journal.record)
+
         await self.bot.wait_until_ready()
 
         if not hasattr(self.bot, "lavalink"):
-            self.bot.lavalink = lavalink.Client(self.bot.user.id)
-            # Configure your lavalink node details here
-            self.bot.lavalink.add_node(
-                host="localhost",
-                port=8080,
-                password="youshallnotpass",
-                region="us",
-                name="default-node",
+            session_ids = self._resume_state["nodes"] if self._resume_state else None
+            self.bot.lavalink = self.node_pool.create_client(
+                self.bot.user.id, session_ids=session_ids, player=MusicPlayer
             )
 
         self.lavalink = self.bot.lavalink
         self.lavalink.add_event_hooks(self)
+
+        # Move players off dead or degraded nodes
+        self.node_monitor = NodeHealthMonitor.from_config(
+            self.lavalink, self.node_pool, self.config.get("failover", {})
+        )
+        self.node_monitor.start()
+        self.voice_lifecycle.start(lambda: self.lavalink.player_manager.players.values())
         logger.info("Lavalink setup complete")
 
+    async def suspend(self):
+        """
+        Hand every player over to the next bot process
+        Called on a restart-mode shutdown, audio keeps playing on the nodes
+        """
+        if not self.lavalink or not self.config.get("resume", {}).get("enabled", True):
+            return
+
+        if self.node_monitor:
+            self.node_monitor.stop()
+
+        await self.session_store.suspend(self.lavalink)
+
+        # Detach the voice clients so closing the bot doesn't leave the channels
+        for voice_client in list(self.bot.voice_clients):
+            voice_client.cleanup()
+
+        # Forget the players locally so nothing destroys or moves them on the node
+        self.lavalink.player_manager.players.clear()
+        await self.lavalink.close()
+
+    async def _resume_players(self, event: NodeReadyEvent):
+        """Rebind the players saved before a restart to their node"""
+        saved = {
+            guild_id: state
+            for guild_id, state in self._resume_state["players"].items()
+            if state["node"] == event.node.name
+        }
+        for guild_id in saved:
+            del self._resume_state["players"][guild_id]
+
+        if not saved:
+            return
+
+        if not event.resumed:
+            logger.warning(
+                f"Session on node {event.node.name} was not resumed, restarting saved tracks"
+            )
+
+        for guild_id, state in saved.items():
+            try:
+                await self._resume_player(event.node, int(guild_id), state, event.resumed)
+            except Exception as e:  # pylint: disable=W0718
+                logger.error(f"Failed to resume player for guild {guild_id}: {e}")
+
+        logger.info(f"Resumed {len(saved)} players on node {event.node.name}")
+
+    async def _resume_player(self, node: Node, guild_id: int, state: dict, resumed: bool):
+        """Rebuild one player from its saved state and rejoin its voice channel"""
+        guild = self.bot.get_guild(guild_id)
+        channel = guild.get_channel(state["voice_channel"]) if guild else None
+
+        if channel is None:
+            if resumed:
+                await node.destroy_player(guild_id)
+            return
+
+        player = self.lavalink.player_manager.create(guild_id, node=node)
+        player.store("channel", state["text_channel"])
+        player.set_loop(state["loop"])
+        player.volume = state["volume"]
+
+        queue = state["queue"]
+        if queue:
+            tracks = await node.decode_tracks([encoded for encoded, _ in queue])
+            for track, (_, requester) in zip(tracks, queue):
+                player.add(track=track, requester=requester)
+
+        raw_player = None
+        if resumed:
+            try:
+                raw_player = await node.get_player(guild_id)
+            except (ClientError, RequestError):
+                raw_player = None
+
+        start_time = 0
+        if raw_player and raw_player.get("track"):
+            # Still playing on the node, adopt its state
+            requester = state["current"][1] if state["current"] else 0
+            player.current = AudioTrack(raw_player["track"], requester)
+            player.paused = raw_player["paused"]
+            player.volume = raw_player["volume"]
+            # Anchor the local clock to the adopted track, as play_track would
+            player.clock.start(raw_player["state"].get("position", 0))
+            await player.update_state(raw_player["state"])
+            player.clock.set_paused(raw_player["paused"])
+        elif state["current"]:
+            encoded, requester = state["current"]
+            track = await node.decode_track(encoded)
+            player.add(track=track, requester=requester, index=0)
+            if not track.is_stream:
+                start_time = min(state["position"], max(track.duration - 1, 0))
+
+        await channel.connect(cls=LavalinkVoiceClient)
+
+        if player.current is None and player.queue:
+            if start_time:
+                await player.play(start_time=start_time, pause=state["paused"])
+            else:
+                await player.play(pause=state["paused"])
+
+    async def _restore_queues(self, node: Node):
+        """Rebuild the queues found in the journal after a crash"""
+        restoring, self._journal_state = self._journal_state, {}
+        restored = 0
+
+        for guild_id, state in restoring.items():
+            try:
+                restored += await self._restore_queue(node, guild_id, state)
+            except Exception as e:  # pylint: disable=W0718
+                logger.error(f"Failed to restore queue for guild {guild_id}: {e}")
+
+        logger.info(f"Restored queues of {restored} guilds from the journal")
+
+    async def _restore_queue(self, node: Node, guild_id: int, state: dict) -> bool:
+        """Decode one journaled queue in bulk and start playing it again"""
+        if self.lavalink.player_manager.get(guild_id):
+            return False
+
+        guild = self.bot.get_guild(guild_id)
+        channel = guild.get_channel(state["voice"]) if guild else None
+        if channel is None:
+            self.queue_journal.record(guild_id, "drop")
+            return False
+
+        # The interrupted track restarts first, followed by the queue
+        entries = [entry for entry in [state["now"], *state["queue"]] if entry and entry[0]]
+        tracks = []
+        for start in range(0, len(entries), DECODE_BATCH):
+            batch = entries[start : start + DECODE_BATCH]
+            tracks.extend(await node.decode_tracks([encoded for encoded, _ in batch]))
+        for track, (_, requester) in zip(tracks, entries):
+            track.requester = requester
+
+        if not tracks:
+            self.queue_journal.record(guild_id, "drop")
+            return False
+
+        region = self.node_pool.region_for(channel.rtc_region)
+        player = self.lavalink.player_manager.create(guild_id, node=self.select_node(region))
+        player.store("channel", state["text"])
+        player.queue.extend(tracks)
+
+        await channel.connect(cls=LavalinkVoiceClient)
+        await player.play()
+        return True
+
     def cog_unload(self):
         """Clean up when the cog is unloaded"""
+        if self.node_monitor:
+            self.node_monitor.stop()
+        self.outbox.close()
+        self.live_panels.close()
+        self.voice_lifecycle.stop()
+        self.guild_executor.close()
+        if self.queue_journal.record in MusicPlayer.observers:
+            MusicPlayer.observers.remove(self.queue_journal.record)
+        self.queue_journal.close()
         if self.lavalink:
             # Close lavalink client
             self.lavalink.close()
             self.lavalink._event_hooks.clear()
+        if self.persistent_cache:
+            self.persistent_cache.close()
+        if self.play_history.store:
+            self.play_history.store.close()
+        logger.info(f"Track cache stats: {self.track_cache.stats()}")
+        logger.info(f"Track load coalescing stats: {self.track_loads.stats()}")
+        logger.info(f"Queue journal stats: {self.queue_journal.stats()}")
+        logger.info(f"Queue page cache stats: {self.queue_pages.stats()}")
+        logger.info(f"Lazy playlist stats: {self.lazy_resolver.stats()}")
+        logger.info(f"Progressive enqueue stats: {self.enqueuer.stats()}")
+        logger.info(f"Batch import stats: {self.batch_importer.stats()}")
+        logger.info(f"History stats: {self.play_history.stats()}")
+        logger.info(f"Search session stats: {self.search_sessions.stats()}")
+        logger.info(f"Component routing stats: {self.components.stats()}")
+        logger.info(f"Voice lifecycle stats: {self.voice_lifecycle.stats()}")
+        logger.info(f"Guild executor stats: {self.guild_executor.stats()}")
+        logger.info(f"Admission stats: {self.admission.stats()}")
+        logger.info(f"Playback metrics: {self.metrics.snapshot()}")
         logger.info("Music cog unloaded")
 
     async def cog_slash_command_error(
         self, inter: disnake.ApplicationCommandInteraction, error: Exception
     ):
         """Handle errors from slash commands"""
+        if isinstance(error, commands.CommandInvokeError) and isinstance(
+            error.original, (AdmissionRejected, GuildBusy)
+        ):
+            # Shed load, not a failure
+            embed = disnake.Embed(
+                title="⏳ Busy, try again",
+                description=str(error.original),
+                color=disnake.Color.orange(),
+            )
+            if inter.response.is_done():
+                await inter.edit_original_message(content="", embed=embed)
+            else:
+                await inter.response.send_message(embed=embed, ephemeral=True)
+            logger.info(
+                f"Shed /{inter.application_command.name} in guild {inter.guild_id}: "
+                f"{error.original}"
+            )
+            return
+
         if isinstance(error, commands.CommandInvokeError):
             embed = disnake.Embed(
                 title="❌ An error occurred",
@@ -217,45 +574,37 @@ class MusicCog(commands.Cog):
 
         # Handle guild check
         if not inter.guild:
-            await inter.response.send_message(
-                "This command cannot be used in DMs", ephemeral=True
-            )
+            await self.respond(inter, "This command cannot be used in DMs", ephemeral=True)
             return None
 
         # Handle voice state checks
         if not inter.author.voice or not inter.author.voice.channel:
             if player is not None and player.is_connected:
-                await inter.response.send_message(
-                    "You need to join my voice channel first", ephemeral=True
-                )
+                await self.respond(inter, "You need to join my voice channel first", ephemeral=True)
             else:
-                await inter.response.send_message(
-                    "You need to join a voice channel first", ephemeral=True
-                )
+                await self.respond(inter, "You need to join a voice channel first", ephemeral=True)
             return None
 
         voice_channel = inter.author.voice.channel
 
-        # Create player if it doesn't exist
+        # Create player if it doesn't exist, on the least loaded node near the channel
         if not player:
-            player = self.bot.lavalink.player_manager.create(inter.guild_id)
+            region = self.node_pool.region_for(voice_channel.rtc_region)
+            node = self.select_node(region)
+            player = self.bot.lavalink.player_manager.create(inter.guild_id, node=node)
             player.store("channel", inter.channel.id)
-            logger.info(f"Created player for guild {inter.guild_id}")
+            logger.info(f"Created player for guild {inter.guild_id} on node {player.node.name}")
 
         # Check if the user is in the same voice channel as the bot
         if player.is_connected:
             if player.channel_id != voice_channel.id:
-                await inter.response.send_message(
-                    "You need to be in my voice channel", ephemeral=True
-                )
+                await self.respond(inter, "You need to be in my voice channel", ephemeral=True)
                 return None
         else:
             # Check permissions before connecting
             permissions = voice_channel.permissions_for(inter.guild.me)
             if not permissions.connect or not permissions.speak:
-                await inter.response.send_message(
-                    "I need `CONNECT` and `SPEAK` permissions", ephemeral=True
-                )
+                await self.respond(inter, "I need `CONNECT` and `SPEAK` permissions", ephemeral=True)
                 return None
 
             # Check user limit
@@ -264,9 +613,7 @@ class MusicCog(commands.Cog):
                     len(voice_channel.members) >= voice_channel.user_limit
                     and not inter.guild.me.guild_permissions.move_members
                 ):
-                    await inter.response.send_message(
-                        "Your voice channel is full!", ephemeral=True
-                    )
+                    await self.respond(inter, "Your voice channel is full!", ephemeral=True)
                     return None
 
             # Connect to the channel
@@ -281,6 +628,50 @@ class MusicCog(commands.Cog):
         track_source = track.source.lower() if hasattr(track, "source") else "http"
         return self.source_emojis.get(track_source, "🎵")
 
+    async def load_tracks(self, node: Node, query: str) -> LoadResult:
+        """
+        Load tracks from Lavalink through the resolution cache
+        Every returned track is a private copy, safe to tag with a requester
+        """
+        key = TrackCache.make_key(query)
+        result = self.track_cache.get(key)
+
+        if result is not None:
+            logger.debug(f"Cache hit for {query}")
+            return result
+
+        result = await self.track_loads.do(
+            key, lambda: self._resolve_tracks(node, key, query)
+        )
+        return clone_result(result)
+
+    async def _resolve_tracks(self, node: Node, key, query: str) -> LoadResult:
+        """Resolve a cache miss, shared by every concurrent caller of the same query"""
+        if self.persistent_cache:
+            try:
+                stored = await self.persistent_cache.get(key)
+            except Exception:  # pylint: disable=W0718
+                # A locked or corrupt database only costs the disk tier
+                logger.warning(f"Persistent cache lookup failed for {query}", exc_info=True)
+                stored = None
+            if stored is not None:
+                result, ttl = stored
+                self.track_cache.put(key, result, ttl=ttl)
+                logger.debug(f"Persistent cache hit for {query}")
+                return result
+
+        async with self.admission.slot(request_guild.get()):
+            result = await node.get_tracks(query)
+        self.track_cache.put(key, result)
+        if self.persistent_cache:
+            self.persistent_cache.put(key, result, self.track_cache.ttl_for(result))
+        return result
+
+    async def validate_load(self, node: Node, identifier: str) -> LoadResult:
+        """Load an identifier again, uncached, under the global load limit"""
+        async with self.admission.slot():
+            return await node.get_tracks(identifier)
+
     async def fetch_spotify_tracks(self, spotify_url: str, node: Node) -> list:
         """
         Fetch tracks from Spotify URLs
@@ -292,7 +683,7 @@ class MusicCog(commands.Cog):
             return []
 
         spotify_type = match.group("type")
-        result = await node.get_tracks(spotify_url)
+        result = await self.load_tracks(node, spotify_url)
 
         if result.load_type == LoadType.PLAYLIST:
             logger.info(
@@ -306,7 +697,65 @@ class MusicCog(commands.Cog):
             logger.warning(f"Failed to load Spotify URL: {spotify_url}")
             return []
 
+    def select_node(self, region: Optional[str]) -> Optional[Node]:
+        """
+        Pick a node for a new player, avoiding nodes the health monitor flagged
+        Falls back to any node when none is healthy
+        """
+        unhealthy = self.node_monitor.unhealthy_nodes if self.node_monitor else None
+        return self.node_pool.select_node(
+            self.lavalink, region, exclude=unhealthy
+        ) or self.node_pool.select_node(self.lavalink, region)
+
+    @staticmethod
+    async def respond(inter: disnake.ApplicationCommandInteraction, *args, **kwargs):
+        """Answer an interaction, with a followup once it was deferred"""
+        if inter.response.is_done():
+            return await inter.followup.send(*args, **kwargs)
+        return await inter.response.send_message(*args, **kwargs)
+
+    async def mutate_queue(self, player: lavalink.DefaultPlayer, change: Callable[[], Any]):
+        """
+        Apply a queue change in order with the guild's other actions
+        Never refused by a full mailbox, the requested tracks must not be lost
+        """
+
+        async def apply():
+            change()
+
+        await self.guild_executor.run(player.guild_id, apply, QUEUE)
+
+    async def start_playback(self, player: lavalink.DefaultPlayer):
+        """
+        Start the queue unless something plays, in order with the guild's other actions
+        Never refused by a full mailbox, the tracks are already queued
+        """
+
+        async def start():
+            if not player.is_playing:
+                await player.play()
+
+        await self.guild_executor.run(player.guild_id, start, QUEUE)
+
+    async def resolve_query(self, node: Node, query: str) -> List[AudioTrack]:
+        """
+        Resolve a /play query to the tracks it queues
+        Playlists give all their tracks, anything else only its first track
+        """
+        if URL_RX.match(query):
+            if "spotify.com" in query:
+                return await self.fetch_spotify_tracks(query, node)
+
+            results = await self.load_tracks(node, query)
+            if results.load_type == LoadType.PLAYLIST:
+                return results.tracks
+            return results.tracks[:1]
+
+        results = await self.federated_search.first(node, query)
+        return results.tracks[:1] if results else []
+
     @lavalink.listener(TrackStartEvent)
+    @serialized_event
     async def on_track_start(self, event: TrackStartEvent):
         """Event fired when a track starts playing"""
         guild_id = event.player.guild_id
@@ -320,20 +769,19 @@ class MusicCog(commands.Cog):
         channel = guild.get_channel(channel_id)
         track = event.track
 
+        # Time between the previous track finishing and this one starting
+        ended_at = self._track_ended.pop(guild_id, None)
+        if ended_at is not None:
+            self.metrics.observe("transition_gap_ms", (time.monotonic() - ended_at) * 1000)
+
+        # The head moved, prepare the entries coming up next
+        self.lazy_resolver.schedule(event.player)
+        if self.prefetcher:
+            self.prefetcher.prefetch(event.player)
+
         # Store track in history
-        if guild_id not in self._queue_history:
-            self._queue_history[guild_id] = []
-
-        # Add to history, keep last 10 tracks
-        track_info = {
-            "title": track.title,
-            "author": track.author,
-            "uri": track.uri,
-            "identifier": track.identifier,
-            "source": track.source if hasattr(track, "source") else "unknown",
-        }
-        self._queue_history[guild_id].append(track_info)
-        self._queue_history[guild_id] = self._queue_history[guild_id][-10:]
+        self.play_history.record(guild_id, track)
+        self.voice_lifecycle.track_started(guild_id)
 
         if channel:
             emoji = self.get_platform_emoji(track)
@@ -347,7 +795,7 @@ class MusicCog(commands.Cog):
             embed.add_field(name="Duration", value=self.format_time(track.duration))
 
             # Add requester info if available
-            requester_id = event.player.current.extra.get("requester")
+            requester_id = track.extra.get("requester")
             if requester_id:
                 requester = guild.get_member(requester_id)
                 if requester:
@@ -356,39 +804,130 @@ class MusicCog(commands.Cog):
                         icon_url=requester.display_avatar.url,
                     )
 
-            await channel.send(embed=embed)
+            # A burst of skips edits one message instead of sending one per track
+            self.outbox.send(channel, embed=embed, coalesce="now_playing", edit=True)
             logger.info(f"Now playing in {guild.name}: {track.title} by {track.author}")
 
     @lavalink.listener(TrackEndEvent)
+    @serialized_event
     async def on_track_end(self, event: TrackEndEvent):
         """Event fired when a track ends"""
         if event.reason == "REPLACED":
             return  # Ignore when tracks are replaced (skipped)
 
         guild_id = event.player.guild_id
+
+        # Natural transitions are timed until the next track starts
+        if event.reason == EndReason.FINISHED:
+            self._track_ended[guild_id] = time.monotonic()
         logger.debug(f"Track ended in guild {guild_id}: {event.track.title}")
 
+    @lavalink.listener(NodeReadyEvent)
+    async def on_node_ready(self, event: NodeReadyEvent):
+        """Event fired when a node connection is ready"""
+        if self._resume_state:
+            await self._resume_players(event)
+        if self._journal_state:
+            await self._restore_queues(event.node)
+
+    @lavalink.listener(NodeChangedEvent)
+    async def on_node_changed(self, event: NodeChangedEvent):
+        """Event fired when a player was moved to another node"""
+        logger.info(
+            f"Player for guild {event.player.guild_id} moved from "
+            f"{event.old_node.name} to {event.new_node.name}"
+        )
+
     @lavalink.listener(QueueEndEvent)
+    @serialized_event
     async def on_queue_end(self, event: QueueEndEvent):
         """Event fired when the queue ends"""
         guild_id = event.player.guild_id
         channel_id = event.player.channel_id
         guild = self.bot.get_guild(guild_id)
+        self._track_ended.pop(guild_id, None)
 
         if not guild:
             return
 
         channel = guild.get_channel(channel_id)
+        self.live_panels.remove(guild_id)
+
+        # Keep the connection for a while, the next /play can reuse it
+        linger = self.voice_lifecycle.linger
+        if linger > 0:
+            self.voice_lifecycle.queue_finished(guild_id)
+            if channel:
+                self.outbox.send(
+                    channel,
+                    f"Queue ended, leaving the voice channel in {self.format_time(int(linger * 1000))} "
+                    "unless something is queued.",
+                )
+                logger.info(f"Queue ended in {guild.name}, lingering")
+            return
 
         # Disconnect after queue ends
         if guild.voice_client:
             await guild.voice_client.disconnect(force=True)
+        self.forget_guild(guild_id)
 
         if channel:
-            await channel.send("Queue ended, disconnected from voice channel.")
+            self.outbox.send(channel, "Queue ended, disconnected from voice channel.")
+            self.outbox.forget(channel.id)
             logger.info(f"Queue ended in {guild.name}")
 
+    async def _leave_voice(self, guild_id: int, reason: str):
+        """Leave voice on behalf of the lifecycle policy"""
+        guild = self.bot.get_guild(guild_id)
+        player = self.lavalink.player_manager.get(guild_id)
+        if reason == "linger" and player and player.is_playing:
+            # Something got queued while the leave was waiting its turn
+            return
+        channel = guild.get_channel(player.channel_id) if guild and player else None
+
+        if guild and guild.voice_client:
+            await guild.voice_client.disconnect(force=True)
+        else:
+            await self.lavalink.player_manager.destroy(guild_id)
+        self.forget_guild(guild_id)
+
+        messages = {
+            "linger": "Nothing was queued, disconnected from voice channel.",
+            "idle": "Paused for too long, disconnected from voice channel.",
+            "empty": "Everyone left, disconnected from voice channel.",
+        }
+        if channel:
+            self.outbox.send(channel, messages[reason])
+            self.outbox.forget(channel.id)
+        logger.info(f"Left voice in guild {guild_id} ({reason})")
+
+    def _is_channel_empty(self, player: lavalink.DefaultPlayer) -> bool:
+        """Whether no one but bots is left in the player's voice channel"""
+        guild = self.bot.get_guild(player.guild_id)
+        channel = guild.get_channel(player.channel_id) if guild else None
+        if channel is None:
+            return False
+        return not any(not member.bot for member in channel.members)
+
+    def forget_guild(self, guild_id: int):
+        """Drop the per-guild state kept for a player that is gone"""
+        self.voice_lifecycle.forget(guild_id)
+        self.live_panels.remove(guild_id)
+        self.queue_pages.invalidate(guild_id)
+        self._track_ended.pop(guild_id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: disnake.Guild):
+        """Destroy the player and free everything kept for a guild the bot left"""
+        if self.lavalink and self.lavalink.player_manager.get(guild.id):
+            await self.lavalink.player_manager.destroy(guild.id)
+        self.forget_guild(guild.id)
+        self.play_history.forget(guild.id)
+        self.search_sessions.discard_guild(guild.id)
+        logger.info(f"Removed from guild {guild.name}, freed its state")
+
     @lavalink.listener(TrackExceptionEvent)
+    @serialized_event
     async def on_track_exception(self, event: TrackExceptionEvent):
         """Event fired when a track encounters an exception"""
         guild_id = event.player.guild_id
@@ -406,10 +945,18 @@ class MusicCog(commands.Cog):
                 description=f"An error occurred while playing the track: {event.cause}",
                 color=disnake.Color.red(),
             )
-            await channel.send(embed=error_embed)
+            # Only the latest of a burst of errors is worth showing
+            self.outbox.send(channel, embed=error_embed, coalesce="track_error")
 
             logger.error(f"Track exception in {guild.name}: {event.cause}")
 
+    def remaining_time(self, player: lavalink.DefaultPlayer) -> int:
+        """Time left in the current track, 0 for streams or when idle"""
+        current = player.current
+        if not current or current.is_stream:
+            return 0
+        return max(0, current.duration - player.position)
+
     def format_time(self, ms: int) -> str:
         """Format milliseconds to a time string"""
         seconds = ms // 1000
@@ -422,14 +969,13 @@ class MusicCog(commands.Cog):
             return f"{minutes}:{seconds:02d}"
 
     @commands.slash_command(name="play")
+    @admitted
     async def play(
         self,
         inter: disnake.ApplicationCommandInteraction,
         query: str = commands.Param(description="Song name or URL to play"),
     ):
         """Search and play a song"""
-        await inter.response.defer()
-
         player = await self.ensure_voice(inter)
         if not player:
             return
@@ -451,19 +997,20 @@ class MusicCog(commands.Cog):
                     )
                     return await inter.followup.send(embed=embed)
 
-                # Add tracks to queue
-                for track in tracks:
-                    player.add(track=track, requester=inter.author.id)
-
                 if len(tracks) > 1:
                     emoji = self.get_platform_emoji(tracks[0])
-                    embed = disnake.Embed(
-                        title=f"{emoji} Spotify Playlist Enqueued",
-                        description=f"Added {len(tracks)} tracks from Spotify to the queue",
-                        color=disnake.Color.blurple(),
+                    await self.enqueue_playlist(
+                        inter,
+                        player,
+                        tracks,
+                        f"{emoji} Spotify Playlist Enqueued",
+                        f"Added {{count}} tracks from Spotify to the queue",
                     )
-                    await inter.followup.send(embed=embed)
+                    return
                 else:
+                    await self.mutate_queue(
+                        player, lambda: player.add(track=tracks[0], requester=inter.author.id)
+                    )
                     emoji = self.get_platform_emoji(tracks[0])
                     embed = disnake.Embed(
                         title=f"{emoji} Spotify Track Enqueued",
@@ -473,7 +1020,13 @@ class MusicCog(commands.Cog):
                     await inter.followup.send(embed=embed)
             else:
                 # Handle other URLs
-                results = await player.node.get_tracks(query)
+                video = YOUTUBE_PLAYLIST_VIDEO.match(query)
+                if video:
+                    return await self.play_playlist_video(
+                        inter, player, query, video.group("video")
+                    )
+
+                results = await self.load_tracks(player.node, query)
 
                 if results.load_type == LoadType.EMPTY:
                     embed = disnake.Embed(
@@ -484,20 +1037,20 @@ class MusicCog(commands.Cog):
                     return await inter.followup.send(embed=embed)
                 elif results.load_type == LoadType.PLAYLIST:
                     tracks = results.tracks
-
-                    # Add all tracks from playlist to queue
-                    for track in tracks:
-                        player.add(track=track, requester=inter.author.id)
                     emoji = self.get_platform_emoji(tracks[0])
-                    embed = disnake.Embed(
-                        title=f"{emoji} Playlist Enqueued",
-                        description=f"{results.playlist_info.name} - {len(tracks)} tracks",
-                        color=disnake.Color.blurple(),
+                    await self.enqueue_playlist(
+                        inter,
+                        player,
+                        tracks,
+                        f"{emoji} Playlist Enqueued",
+                        f"{results.playlist_info.name} - {{count}} tracks",
                     )
-                    await inter.followup.send(embed=embed)
+                    return
                 else:
                     track = results.tracks[0]
-                    player.add(track=track, requester=inter.author.id)
+                    await self.mutate_queue(
+                        player, lambda: player.add(track=track, requester=inter.author.id)
+                    )
                     emoji = self.get_platform_emoji(track)
                     embed = disnake.Embed(
                         title=f"{emoji} Track Enqueued",
@@ -511,13 +1064,10 @@ class MusicCog(commands.Cog):
                     await inter.followup.send(embed=embed)
         else:
             # Handle search queries
-            # Yt first
-            results = await player.node.get_tracks(f"ytsearch:{query}")
+            # Yt first, hedged to the other sources when it is slow or empty
+            results = await self.federated_search.first(player.node, query)
 
-            if not results or results.load_type == LoadType.EMPTY or not results.tracks:
-                results = await player.node.get_tracks(f"scsearch:{query}")
-
-            if not results or results.load_type == LoadType.EMPTY or not results.tracks:
+            if not results:
                 embed = disnake.Embed(
                     title="❌ Error",
                     description="Couldn't find any tracks for that query",
@@ -527,7 +1077,9 @@ class MusicCog(commands.Cog):
 
             # Add the first result to the queue
             track = results.tracks[0]
-            player.add(track=track, requester=inter.author.id)
+            await self.mutate_queue(
+                player, lambda: player.add(track=track, requester=inter.author.id)
+            )
 
             emoji = self.get_platform_emoji(track)
             embed = disnake.Embed(
@@ -539,410 +1091,352 @@ class MusicCog(commands.Cog):
             embed.add_field(name="Duration", value=self.format_time(track.duration))
             await inter.followup.send(embed=embed)
 
+        # Resolve mirrored entries near the head ahead of time
+        self.lazy_resolver.schedule(player)
+
         # Play if not already playing
-        if not player.is_playing:
-            await player.play()
+        await self.start_playback(player)
 
-    @commands.slash_command(name="search")
-    async def search(
+    async def enqueue_playlist(
         self,
         inter: disnake.ApplicationCommandInteraction,
-        query: str = commands.Param(description="What song to search for"),
-        platform: str = commands.Param(
-            description="Platform to search on",
-            choices=["YouTube", "SoundCloud", "All"],
-            default="All",
-        ),
+        player: lavalink.DefaultPlayer,
+        tracks: List[AudioTrack],
+        title: str,
+        description: str,
     ):
-        """Search for songs and select one to play"""
-        await inter.response.defer()
-
-        player = await self.ensure_voice(inter)
-        if not player:
-            return
-
-        # Search based on platform
-        tracks = []
-        if platform in ["YouTube", "All"]:
-            results = await player.node.get_tracks(f"ytsearch:{query}")
-            if results and results.tracks:
-                tracks.extend(results.tracks[:5])  # Take top 5 YouTube results
-
-        if platform in ["SoundCloud", "All"] and len(tracks) < 10:
-            results = await player.node.get_tracks(f"scsearch:{query}")
-            if results and results.tracks:
-                tracks.extend(results.tracks[:5])  # Take top 5 SoundCloud results
-
-        if not tracks:
-            embed = disnake.Embed(
-                title="❌ Error",
-                description="Couldn't find any tracks for that query",
-                color=disnake.Color.red(),
-            )
-            return await inter.followup.send(embed=embed)
-
-        # Limit to 10 total results
-        tracks = tracks[:10]
-
-        # Create select menu options
-        options = []
-        for i, track in enumerate(tracks):
-            emoji = self.get_platform_emoji(track)
-            duration = self.format_time(track.duration)
-            source = track.source if hasattr(track, "source") else "unknown"
-
-            # Truncate long titles
-            title = track.title
-            if len(title) > 90:
-                title = title[:87] + "..."
-
-            options.append(
-                disnake.SelectOption(
-                    label=f"{i + 1}. {title[:97]}",
-                    description=f"{track.author} • {duration} • {source.upper()}",
-                    value=str(i),
-                    emoji=emoji,
-                )
-            )
-
-        # Create select menu component
-        select = disnake.ui.Select(
-            placeholder="Select a song to play",
-            options=options,
-            custom_id="search_results",
+        """Start playing a playlist and queue the rest in the background"""
+        total = len(tracks)
+        embed = disnake.Embed(
+            title=title,
+            description=description.replace("{count}", str(total)),
+            color=disnake.Color.blurple(),
         )
+        embed.set_footer(text=f"Adding {total} tracks…")
+        message = await inter.followup.send(embed=embed, wait=True)
 
-        # Store tracks for retrieval when selection is made
-        view = disnake.ui.View(timeout=60)
-        view.add_item(select)
-
-        # Store the tracks temporarily
-        self.bot._search_results = {f"{inter.guild_id}_{inter.author.id}": tracks}
-
-        # When a track is selected
-        async def select_callback(select_inter: disnake.MessageInteraction):
-            if select_inter.author.id != inter.author.id:
-                embed = disnake.Embed(
-                    title="❌ Error",
-                    description="You cannot use this selection menu.",
-                    color=disnake.Color.red(),
-                )
-                return await select_inter.response.send_message(
-                    embed=embed, ephemeral=True
-                )
-
-            # Retrieve tracks from storage
-            result_key = f"{inter.guild_id}_{inter.author.id}"
-            stored_tracks = self.bot._search_results.get(result_key, [])
+        async def on_progress(done: int, total: int):
+            if done < total:
+                embed.set_footer(text=f"Added {done}/{total} tracks…")
+            else:
+                embed.description = description.replace("{count}", str(done))
+                embed.remove_footer()
+            try:
+                await message.edit(embed=embed)
+            except disnake.HTTPException:
+                pass
+
+        # Stop queueing once the player is destroyed or replaced
+        manager = self.lavalink.player_manager
+        self.enqueuer.start(
+            player,
+            tracks,
+            inter.author.id,
+            on_progress=on_progress,
+            alive=lambda: manager.get(player.guild_id) is player,
+            # Resolve mirrored entries once they reach the head of the queue
+            on_batch=lambda: self.lazy_resolver.schedule(player),
+        )
 
-            if not stored_tracks:
-                embed = disnake.Embed(
-                    title="❌ Error",
-                    description="Search results expired. Please search again.",
-                    color=disnake.Color.red(),
-                )
-                return await select_inter.response.send_message(
-                    embed=embed, ephemeral=True
-                )
+    async def play_playlist_video(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        player: lavalink.DefaultPlayer,
+        query: str,
+        video_id: str,
+    ):
+        """Play a video opened from a playlist, then queue the rest of the playlist"""
+        # The single video loads much faster than the playlist, load both at once
+        video_load = asyncio.ensure_future(
+            self.load_tracks(player.node, f"https://www.youtube.com/watch?v={video_id}")
+        )
+        playlist_load = asyncio.ensure_future(self.load_tracks(player.node, query))
 
-            index = int(select_inter.values[0])
-            track = stored_tracks[index]
+        video = await video_load
+        if video.tracks:
+            track = video.tracks[0]
+            await self.mutate_queue(
+                player, lambda: player.add(track=track, requester=inter.author.id)
+            )
+            await self.start_playback(player)
 
-            # Add to queue
-            player = self.bot.lavalink.player_manager.get(select_inter.guild_id)
-            if not player:
+        results = await playlist_load
+        tracks = [
+            track for track in results.tracks
+            if not video.tracks or track.identifier != video.tracks[0].identifier
+        ]
+        if not tracks:
+            if not video.tracks:
                 embed = disnake.Embed(
                     title="❌ Error",
-                    description="Player no longer exists. Please try again.",
+                    description="Couldn't find any tracks for that query",
                     color=disnake.Color.red(),
                 )
-                return await select_inter.response.send_message(
-                    embed=embed, ephemeral=True
-                )
-
-            player.add(track=track, requester=select_inter.author.id)
+                return await inter.followup.send(embed=embed)
 
-            # Create confirmation embed
-            emoji = self.get_platform_emoji(track)
+            track = video.tracks[0]
             embed = disnake.Embed(
-                title=f"{emoji} Track Enqueued",
+                title=f"{self.get_platform_emoji(track)} Track Enqueued",
                 description=f"[{track.title}]({track.uri})",
                 color=disnake.Color.blurple(),
             )
             embed.add_field(name="Artist", value=track.author)
             embed.add_field(name="Duration", value=self.format_time(track.duration))
-            embed.set_footer(
-                text=f"Requested by {select_inter.author.display_name}",
-                icon_url=select_inter.author.display_avatar.url,
-            )
-
-            # Play if not already playing
-            if not player.is_playing:
-                await player.play()
-
-            # Clean up stored results
-            if result_key in self.bot._search_results:
-                del self.bot._search_results[result_key]
-
-            await select_inter.response.edit_message(embed=embed, view=None)
-
-        select.callback = select_callback
+            return await inter.followup.send(embed=embed)
 
-        # Create results embed
-        embed = disnake.Embed(
-            title=f"Search Results for '{query}'",
-            description="Select a track to play",
-            color=disnake.Color.blurple(),
+        name = results.playlist_info.name if results.playlist_info else "Playlist"
+        count = "{count} more tracks" if video.tracks else "{count} tracks"
+        await self.enqueue_playlist(
+            inter,
+            player,
+            tracks,
+            f"{self.get_platform_emoji(tracks[0])} Playlist Enqueued",
+            f"{name} - {count}",
         )
 
-        await inter.followup.send(embed=embed, view=view)
-
-    @commands.slash_command(name="queue")
-    async def queue(
+    @commands.slash_command(name="playmany")
+    @admitted
+    async def playmany(
         self,
         inter: disnake.ApplicationCommandInteraction,
-        page: int = commands.Param(description="Page number to view", default=1, ge=1),
+        queries: str = commands.Param(
+            description="Song names or URLs, separated by ; or | (URLs also by spaces)"
+        ),
     ):
-        """View the current song queue"""
-        player = self.bot.lavalink.player_manager.get(inter.guild_id)
-
-        if not player or not player.queue:
+        """Queue several songs or playlists at once"""
+        entries = split_queries(queries)
+        if not entries:
             embed = disnake.Embed(
                 title="❌ Error",
-                description="No tracks found for that Spotify link",
+                description="No songs or URLs given",
                 color=disnake.Color.red(),
             )
             return await inter.followup.send(embed=embed)
 
-        # Calculate pages
-        items_per_page = 10
-        pages = max(1, (len(player.queue) + items_per_page - 1) // items_per_page)
-
-        if page > pages:
-            page = pages
-
-        # Calculate start and end indices
-        start = (page - 1) * items_per_page
-        end = min(start + items_per_page, len(player.queue))
+        player = await self.ensure_voice(inter)
+        if not player:
+            return
 
-        # Create embed
-        embed = disnake.Embed(title="Current Queue", color=disnake.Color.blurple())
+        results = await self.batch_importer.resolve(player.node, entries)
 
-        # Add current track
-        if player.is_playing:
-            current = player.current
-            self.format_time(current.duration)
-            self.format_time(player.position)
-            emoji = self.get_platform_emoji(current)
+        tracks = [track for result in results for track in result.tracks]
+        for track in tracks:
+            track.requester = inter.author.id
+        # One queue mutation for the whole batch
+        await self.mutate_queue(player, lambda: player.queue.extend(tracks))
 
-            embed.add_field(
-                name="Now Playing",
-                value=f"{emoji} **[{current.title}]({current.uri})**"
-                "`[{current_pos}/{current_duration}]`\n"
-                f"Requested by: <@{current.extra.get('requester', 'Unknown')}>",
-                inline=False,
+        if not tracks:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="Couldn't find any tracks for those queries",
+                color=disnake.Color.red(),
             )
+            return await inter.followup.send(embed=embed)
 
-        # List queue
-        if player.queue:
-            queue_list = []
-            for i, track in enumerate(player.queue[start:end], start=start + 1):
-                emoji = self.get_platform_emoji(track)
-                duration = self.format_time(track.duration)
-                requester = track.extra.get("requester", "Unknown")
-
-                queue_list.append(
-                    f"`{i}.` {emoji} **[{track.title}]({track.uri})** `[{duration}]`\n"
-                    f"┗ Requested by: <@{requester}>"
-                )
-
-            embed.description = "\n\n".join(queue_list)
-
-        # Add pagination info
-        embed.set_footer(
-            text=f"Page {page}/{pages} • {len(player.queue)} songs in queue"
+        found = sum(1 for result in results if not result.error)
+        embed = disnake.Embed(
+            title="📥 Batch Enqueued",
+            description=f"Added {len(tracks)} tracks from {found}/{len(results)} entries",
+            color=disnake.Color.blurple(),
         )
-
-        # Queue stats
-        total_length = sum(t.duration for t in player.queue)
         embed.add_field(
-            name="Queue Info",
-            value=f"**{len(player.queue)}** tracks | "
-            f"`{self.format_time(total_length)}` total length",
-            inline=False,
+            name="Total Duration",
+            value=self.format_time(sum(track.duration for track in tracks if not track.is_stream)),
         )
 
-        # Create pagination controls
-        view = disnake.ui.View(timeout=60)
+        failed = [result for result in results if result.error]
+        if failed:
+            lines = [f"`{result.query[:60]}` - {result.error}" for result in failed[:10]]
+            if len(failed) > 10:
+                lines.append(f"...and {len(failed) - 10} more")
+            embed.add_field(name="Not Added", value="\n".join(lines), inline=False)
 
-        # Previous page button
-        previous_button = disnake.ui.Button(
-            emoji="⬅️", style=disnake.ButtonStyle.gray, disabled=(page == 1)
-        )
+        if len(entries) > len(results):
+            embed.set_footer(text=f"Only the first {len(results)} entries were used")
+        await inter.followup.send(embed=embed)
 
-        # Next page button
-        next_button = disnake.ui.Button(
-            emoji="➡️", style=disnake.ButtonStyle.gray, disabled=(page == pages)
-        )
+        # Resolve mirrored entries near the head ahead of time
+        self.lazy_resolver.schedule(player)
 
-        async def previous_callback(button_inter: disnake.MessageInteraction):
-            if button_inter.author.id != inter.author.id:
-                embed = disnake.Embed(
-                    title="❌ Error",
-                    description="You cannot use theese controls.",
-                    color=disnake.Color.red(),
-                )
-                return await button_inter.response.send_message(
-                    embed=embed, ephemeral=True
-                )
+        await self.start_playback(player)
 
-            nonlocal page
-            page -= 1
-            await self.update_queue_message(button_inter, page, items_per_page)
+    @commands.slash_command(name="search")
+    @admitted
+    async def search(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        query: str = commands.Param(description="What song to search for"),
+        platform: str = commands.Param(
+            description="Platform to search on",
+            choices=["YouTube", "SoundCloud", "All"],
+            default="All",
+        ),
+    ):
+        """Search for songs and select one to play"""
+        player = await self.ensure_voice(inter)
+        if not player:
+            return
 
-        async def next_callback(button_inter: disnake.MessageInteraction):
-            if button_inter.author.id != inter.author.id:
-                embed = disnake.Embed(
-                    title="❌ Error",
-                    description="You cannot use theese controls.",
-                    color=disnake.Color.red(),
-                )
-                return await button_inter.response.send_message(
-                    embed=embed, ephemeral=True
+        # Search every selected platform at once
+        sources = SEARCH_PLATFORMS.get(platform)
+        tracks = await self.federated_search.search(player.node, query, sources)
+
+        if not tracks:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="Couldn't find any tracks for that query",
+                color=disnake.Color.red(),
+            )
+            return await inter.followup.send(embed=embed)
+
+        # Create select menu options
+        options = []
+        for i, track in enumerate(tracks):
+            emoji = self.get_platform_emoji(track)
+            duration = self.format_time(track.duration)
+            source = track.source if hasattr(track, "source") else "unknown"
+
+            # Truncate long titles
+            title = track.title
+            if len(title) > 90:
+                title = title[:87] + "..."
+
+            options.append(
+                disnake.SelectOption(
+                    label=f"{i + 1}. {title[:97]}",
+                    description=f"{track.author} • {duration} • {source.upper()}",
+                    value=str(i),
+                    emoji=emoji,
                 )
+            )
 
-            nonlocal page
-            page += 1
-            await self.update_queue_message(button_inter, page, items_per_page)
+        # One session per search, so concurrent searches never share results
+        self.search_sessions.put((inter.guild_id, inter.author.id, inter.id), tracks)
 
-        previous_button.callback = previous_callback
-        next_button.callback = next_callback
+        # Create select menu component, its custom ID leads back to the session
+        select = disnake.ui.Select(
+            placeholder="Select a song to play",
+            options=options,
+            custom_id=self.components.custom_id("search_pick", inter.author.id, inter.id),
+        )
 
-        view.add_item(previous_button)
-        view.add_item(next_button)
+        # Create results embed
+        embed = disnake.Embed(
+            title=f"Search Results for '{query}'",
+            description="Select a track to play",
+            color=disnake.Color.blurple(),
+        )
 
-        await inter.response.send_message(embed=embed, view=view)
+        await inter.followup.send(embed=embed, components=select)
 
-    async def update_queue_message(
-        self, inter: disnake.MessageInteraction, page: int, items_per_page: int
+    async def _on_search_pick(
+        self, select_inter: disnake.MessageInteraction, author_id: str, search_id: str
     ):
-        """Update the queue message with new page"""
-        player = self.bot.lavalink.player_manager.get(inter.guild_id)
-
-        if not player or not player.queue:
-            return await inter.response.edit_message(
-                content="Queue is now empty", embed=None, view=None
+        """A track was selected from /search results"""
+        if select_inter.author.id != int(author_id):
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="You cannot use this selection menu.",
+                color=disnake.Color.red(),
             )
+            return await select_inter.response.send_message(embed=embed, ephemeral=True)
 
-        # Calculate pages
-        pages = max(1, (len(player.queue) + items_per_page - 1) // items_per_page)
-
-        if page > pages:
-            page = pages
+        # Retrieve tracks from storage
+        result_key = (select_inter.guild_id, select_inter.author.id, int(search_id))
+        stored_tracks = self.search_sessions.get(result_key)
 
-        # Calculate start and end indices
-        start = (page - 1) * items_per_page
-        end = min(start + items_per_page, len(player.queue))
-
-        # Create embed
-        embed = disnake.Embed(title="Current Queue", color=disnake.Color.blurple())
-
-        # Add current track
-        if player.is_playing:
-            current = player.current
-            current_duration = self.format_time(current.duration)
-            current_pos = self.format_time(player.position)
-            emoji = self.get_platform_emoji(current)
-
-            embed.add_field(
-                name="Now Playing",
-                value=f"{emoji} **[{current.title}]"
-                f"({current.uri})** `[{current_pos}/{current_duration}]`\n"
-                f"Requested by: <@{current.extra.get('requester', 'Unknown')}>",
-                inline=False,
+        if not stored_tracks:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="Search results expired. Please search again.",
+                color=disnake.Color.red(),
             )
+            return await select_inter.response.edit_message(embed=embed, components=[])
 
-        # List queue
-        if player.queue:
-            queue_list = []
-            for i, track in enumerate(player.queue[start:end], start=start + 1):
-                emoji = self.get_platform_emoji(track)
-                duration = self.format_time(track.duration)
-                requester = track.extra.get("requester", "Unknown")
-
-                queue_list.append(
-                    f"`{i}.` {emoji} **[{track.title}]({track.uri})** `[{duration}]`\n"
-                    f"┗ Requested by: <@{requester}>"
-                )
+        index = int(select_inter.values[0])
+        track = stored_tracks[index]
 
-            embed.description = "\n\n".join(queue_list)
+        # Add to queue
+        player = self.bot.lavalink.player_manager.get(select_inter.guild_id)
+        if not player:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="Player no longer exists. Please try again.",
+                color=disnake.Color.red(),
+            )
+            return await select_inter.response.send_message(embed=embed, ephemeral=True)
 
-        # Add pagination info
-        embed.set_footer(
-            text=f"Page {page}/{pages} • {len(player.queue)} songs in queue"
+        await self.mutate_queue(
+            player, lambda: player.add(track=track, requester=select_inter.author.id)
         )
 
-        # Queue stats
-        total_length = sum(t.duration for t in player.queue)
-        embed.add_field(
-            name="Queue Info",
-            value=f"**{len(player.queue)}** tracks | "
-            f"`{self.format_time(total_length)}` total length",
-            inline=False,
+        # Create confirmation embed
+        emoji = self.get_platform_emoji(track)
+        embed = disnake.Embed(
+            title=f"{emoji} Track Enqueued",
+            description=f"[{track.title}]({track.uri})",
+            color=disnake.Color.blurple(),
+        )
+        embed.add_field(name="Artist", value=track.author)
+        embed.add_field(name="Duration", value=self.format_time(track.duration))
+        embed.set_footer(
+            text=f"Requested by {select_inter.author.display_name}",
+            icon_url=select_inter.author.display_avatar.url,
         )
 
-        # Update pagination controls
-        view = disnake.ui.View(timeout=60)
+        # Clean up stored results
+        self.search_sessions.discard(result_key)
 
-        # Previous page button
-        previous_button = disnake.ui.Button(
-            emoji="⬅️", style=disnake.ButtonStyle.gray, disabled=(page == 1)
-        )
+        # Answer before waiting behind the guild's other actions
+        await select_inter.response.edit_message(embed=embed, components=[])
 
-        # Next page button
-        next_button = disnake.ui.Button(
-            emoji="➡️", style=disnake.ButtonStyle.gray, disabled=(page == pages)
-        )
+        # Play if not already playing
+        await self.start_playback(player)
 
-        async def previous_callback(button_inter: disnake.MessageInteraction):
-            if button_inter.author.id != inter.author.id:
-                embed = disnake.Embed(
-                    title="❌ Error",
-                    description="You cannot use theese controls.",
-                    color=disnake.Color.red(),
-                )
-                return await button_inter.response.send_message(
-                    embed=embed, ephemeral=True
-                )
+    @commands.Cog.listener("on_message_interaction")
+    async def on_component(self, inter: disnake.MessageInteraction):
+        """Route button presses and menu selections to their handlers"""
+        await self.components.dispatch(inter)
 
-            nonlocal page
-            page -= 1
-            await self.update_queue_message(button_inter, page, items_per_page)
+    @commands.Cog.listener("on_modal_submit")
+    async def on_modal(self, inter: disnake.ModalInteraction):
+        """Route modal submissions to their handlers"""
+        await self.components.dispatch(inter)
 
-        async def next_callback(button_inter: disnake.MessageInteraction):
-            if button_inter.author.id != inter.author.id:
-                embed = disnake.Embed(
-                    title="❌ Error",
-                    description="You cannot use theese controls.",
-                    color=disnake.Color.red(),
-                )
-                return await button_inter.response.send_message(
-                    embed=embed, ephemeral=True
-                )
+    @commands.slash_command(name="queue")
+    async def queue(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        page: int = commands.Param(description="Page number to view", default=1, ge=1),
+        live: bool = commands.Param(
+            description="Keep a live view of what is up next instead of pages", default=False
+        ),
+    ):
+        """View the current song queue"""
+        player = self.bot.lavalink.player_manager.get(inter.guild_id)
 
-            nonlocal page
-            page += 1
-            await self.update_queue_message(button_inter, page, items_per_page)
+        if not player or not player.queue:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="The queue is empty",
+                color=disnake.Color.red(),
+            )
+            return await inter.response.send_message(embed=embed, ephemeral=True)
 
-        previous_button.callback = previous_callback
-        next_button.callback = next_callback
+        if live:
+            embed = self._render_queue_panel(inter.guild_id)
+            await inter.response.send_message(embed=embed)
+            message = await inter.original_response()
+            self.live_panels.add(inter.guild_id, "queue", message, self._render_queue_panel, embed)
+            return
 
-        view.add_item(previous_button)
-        view.add_item(next_button)
+        # Page controls reuse the rendered lines until the queue changes
+        embed, buttons = self.queue_controls.render(player, page, inter.author.id)
 
-        await inter.response.edit_message(embed=embed, view=view)
+        await inter.response.send_message(embed=embed, components=buttons)
 
     @commands.slash_command(name="skip")
+    @serialized
     async def skip(
         self,
         inter: disnake.ApplicationCommandInteraction,
@@ -960,7 +1454,7 @@ class MusicCog(commands.Cog):
                 color=disnake.Color.red(),
             )
 
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Skip current or skip to position
         if index is None:
@@ -972,7 +1466,7 @@ class MusicCog(commands.Cog):
                 description=f"Track Title: **{current.title}**",
                 color=disnake.Color.red(),
             )
-            await inter.response.send_message(embed=embed)
+            await self.respond(inter, embed=embed)
             logger.info(f"Skipped track in {inter.guild.name}: {current.title}")
         else:
             # Skip to position
@@ -982,7 +1476,7 @@ class MusicCog(commands.Cog):
                     description=f"There are only {len(player.queue)} songs in the queue",
                     color=disnake.Color.red(),
                 )
-                return await inter.response.send_message(embed=embed, ephemeral=True)
+                return await self.respond(inter, embed=embed, ephemeral=True)
 
             # Calculate position (0-based)
             pos = index - 1
@@ -991,8 +1485,7 @@ class MusicCog(commands.Cog):
             skipped_to = player.queue[pos]
 
             # Remove tracks before the selected position
-            for _ in range(pos):
-                player.queue.pop(0)
+            del player.queue[:pos]
 
             # Skip current track to start next one
             await player.skip()
@@ -1001,10 +1494,11 @@ class MusicCog(commands.Cog):
                 description=f"Skipped to position **{index}**: **{skipped_to.title}**",
                 color=disnake.Color.red(),
             )
-            await inter.response.send_message(embed=embed)
+            await self.respond(inter, embed=embed)
             logger.info(f"Skipped to position {index} in {inter.guild.name}")
 
     @commands.slash_command(name="stop")
+    @serialized
     async def stop(self, inter: disnake.ApplicationCommandInteraction):
         """Stop playing and clear the queue"""
         player = await self.ensure_voice(inter)
@@ -1019,15 +1513,18 @@ class MusicCog(commands.Cog):
         guild = inter.guild
         if guild.voice_client:
             await guild.voice_client.disconnect(force=True)
+        self.forget_guild(guild.id)
+
         embed = disnake.Embed(
             title="⏹️ Stopped playback",
             description="Stopped playback and cleared the queue",
             color=disnake.Color.red(),
         )
-        await inter.response.send_message(embed=embed)
+        await self.respond(inter, embed=embed)
         logger.info(f"Stopped playback in {inter.guild.name}")
 
     @commands.slash_command(name="pause")
+    @serialized
     async def pause(self, inter: disnake.ApplicationCommandInteraction):
         """Pause the current track"""
         player = self.bot.lavalink.player_manager.get(inter.guild_id)
@@ -1038,7 +1535,7 @@ class MusicCog(commands.Cog):
                 description="Nothing is playing right now",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Check if already paused
         if player.paused:
@@ -1047,7 +1544,7 @@ class MusicCog(commands.Cog):
                 description="Playback is already paused",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Pause playback
         await player.set_pause(True)
@@ -1056,10 +1553,11 @@ class MusicCog(commands.Cog):
             description="Paused playback",
             color=disnake.Color.red(),
         )
-        await inter.response.send_message(embed=embed)
+        await self.respond(inter, embed=embed)
         logger.info(f"Paused playback in {inter.guild.name}")
 
     @commands.slash_command(name="resume")
+    @serialized
     async def resume(self, inter: disnake.ApplicationCommandInteraction):
         """Resume playback"""
         player = self.bot.lavalink.player_manager.get(inter.guild_id)
@@ -1070,7 +1568,7 @@ class MusicCog(commands.Cog):
                 description="Nothing is playing right now",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Check if already playing
         if not player.paused:
@@ -1079,7 +1577,7 @@ class MusicCog(commands.Cog):
                 description="Playback is already paused",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Resume playback
         await player.set_pause(False)
@@ -1088,10 +1586,11 @@ class MusicCog(commands.Cog):
             description="Resumed playback",
             color=disnake.Color.red(),
         )
-        await inter.response.send_message(embed=embed)
+        await self.respond(inter, embed=embed)
         logger.info(f"Resumed playback in {inter.guild.name}")
 
     @commands.slash_command(name="volume")
+    @serialized
     async def volume(
         self,
         inter: disnake.ApplicationCommandInteraction,
@@ -1109,22 +1608,12 @@ class MusicCog(commands.Cog):
         volume_bars = min(10, round(level / 10))
         bar = "🔊 " + "█" * volume_bars + "░" * (10 - volume_bars)
 
-        await inter.response.send_message(f"Volume set to **{level}%**\n{bar}")
+        await self.respond(inter, f"Volume set to **{level}%**\n{bar}")
         logger.info(f"Volume set to {level}% in {inter.guild.name}")
 
-    @commands.slash_command(name="nowplaying")
-    async def nowplaying(self, inter: disnake.ApplicationCommandInteraction):
-        """Show information about the current song"""
-        player = self.bot.lavalink.player_manager.get(inter.guild_id)
-
-        if not player or not player.is_playing:
-            embed = disnake.Embed(
-                title="❌ Error",
-                description="Nothing is playing right now",
-                color=disnake.Color.red(),
-            )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
-
+    def nowplaying_embed(self, player: lavalink.DefaultPlayer) -> disnake.Embed:
+        """Build the Now Playing embed with progress and player status"""
+        guild = self.bot.get_guild(player.guild_id)
         track = player.current
         position = player.position
 
@@ -1161,7 +1650,7 @@ class MusicCog(commands.Cog):
         # Add requester info
         requester_id = track.extra.get("requester")
         if requester_id:
-            requester = inter.guild.get_member(requester_id)
+            requester = guild.get_member(requester_id) if guild else None
             if requester:
                 embed.set_footer(
                     text=f"Requested by {requester.display_name}",
@@ -1184,6 +1673,178 @@ class MusicCog(commands.Cog):
                 name="Player Status", value=" | ".join(player_stats), inline=False
             )
 
+        # Queue stats
+        if player.queue:
+            embed.add_field(
+                name="Up Next",
+                value=f"**{len(player.queue)}** tracks | "
+                f"`{self.format_time(player.queue.duration)}` total length",
+                inline=False,
+            )
+
+        return embed
+
+    def _render_nowplaying_panel(self, guild_id: int) -> Optional[disnake.Embed]:
+        """Live /nowplaying panel, ends once nothing plays"""
+        player = self.lavalink.player_manager.get(guild_id)
+        if not player or not player.is_playing:
+            return None
+        return self.nowplaying_embed(player)
+
+    def _render_queue_panel(self, guild_id: int) -> Optional[disnake.Embed]:
+        """Live /queue panel showing what is up next, ends once the queue is empty"""
+        player = self.lavalink.player_manager.get(guild_id)
+        if not player or not player.queue:
+            return None
+        return self.queue_pages.render(player, 1)[0]
+
+    @commands.slash_command(name="nowplaying")
+    async def nowplaying(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        live: bool = commands.Param(description="Keep the message updated", default=False),
+    ):
+        """Show information about the current song"""
+        player = self.bot.lavalink.player_manager.get(inter.guild_id)
+
+        if not player or not player.is_playing:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="Nothing is playing right now",
+                color=disnake.Color.red(),
+            )
+            return await inter.response.send_message(embed=embed, ephemeral=True)
+
+        embed = self.nowplaying_embed(player)
+        await inter.response.send_message(embed=embed)
+
+        if live:
+            message = await inter.original_response()
+            self.live_panels.add(
+                inter.guild_id, "nowplaying", message, self._render_nowplaying_panel, embed
+            )
+
+    @commands.slash_command(name="stats")
+    async def stats(self, inter: disnake.ApplicationCommandInteraction):
+        """Show playback and cache statistics"""
+        embed = disnake.Embed(title="📈 Bot Stats", color=disnake.Color.blurple())
+
+        players = len(self.lavalink.player_manager.players) if self.lavalink else 0
+        embed.add_field(name="Players", value=f"**{players}**")
+
+        cache = self.track_cache.stats()
+        lookups = cache["hits"] + cache["misses"]
+        hit_rate = cache["hits"] / lookups * 100 if lookups else 0
+        embed.add_field(name="Track Cache", value=f"**{cache['size']}** entries | {hit_rate:.0f}% hits")
+
+        gap = self.metrics.summaries.get("transition_gap_ms")
+        if gap and gap.count:
+            gap_stats = gap.snapshot()
+            embed.add_field(
+                name="Transition Gap",
+                value=f"p50 `{gap_stats['p50']:.0f} ms` | p95 `{gap_stats['p95']:.0f} ms` | "
+                f"max `{gap_stats['max']:.0f} ms` ({gap_stats['count']} transitions)",
+                inline=False,
+            )
+
+        counters = self.metrics.counters
+        lazy = self.lazy_resolver.stats()
+        embed.add_field(
+            name="Prefetch",
+            value=f"**{counters.get('prefetch_valid', 0)}** checked | "
+            f"**{counters.get('prefetch_replaced', 0)}** replaced | "
+            f"**{counters.get('prefetch_removed', 0)}** removed | "
+            f"**{lazy['resolved']}** mirrored",
+            inline=False,
+        )
+
+        # How far the local position estimate was off when the node reported back
+        drifts = [
+            abs(player.clock.last_drift)
+            for player in (self.lavalink.player_manager.players.values() if self.lavalink else ())
+            if player.clock.updates
+        ]
+        if drifts:
+            embed.add_field(
+                name="Position Drift",
+                value=f"avg `{sum(drifts) / len(drifts):.0f} ms` | max `{max(drifts):.0f} ms`",
+                inline=False,
+            )
+
+        executor = self.guild_executor.stats()
+        wait = self.metrics.summaries.get("guild_wait_ms")
+        embed.add_field(
+            name="Guild Actions",
+            value=f"**{executor['pending']}** pending in {executor['busy_guilds']} guilds | "
+            f"wait p95 `{wait.percentile(0.95) if wait else 0:.0f} ms` | "
+            f"**{counters.get('guild_jobs_rejected', 0)}** rejected",
+            inline=False,
+        )
+
+        admission = self.admission.stats()
+        admission_wait = self.metrics.summaries.get("admission_wait_ms")
+        shed = sum(
+            counters.get(f"admission_rejected_{reason}", 0)
+            for reason in ("rate", "full", "timeout")
+        )
+        embed.add_field(
+            name="Track Loads",
+            value=f"**{admission['inflight']}** running | **{admission['waiting']}** waiting | "
+            f"wait p95 `{admission_wait.percentile(0.95) if admission_wait else 0:.0f} ms` | "
+            f"**{shed}** rejected",
+            inline=False,
+        )
+
+        outbox = self.outbox.stats()
+        embed.add_field(
+            name="Outbound Messages",
+            value=f"**{outbox['depth']}** queued in {outbox['channels']} channels | "
+            f"**{counters.get('outbound_sent', 0)}** sent | "
+            f"**{counters.get('outbound_edited', 0)}** edited | "
+            f"**{counters.get('outbound_coalesced', 0)}** coalesced",
+            inline=False,
+        )
+
+        await inter.response.send_message(embed=embed, ephemeral=True)
+
+    @commands.slash_command(name="queuestats")
+    async def queuestats(self, inter: disnake.ApplicationCommandInteraction):
+        """Show statistics about the current queue"""
+        player = self.bot.lavalink.player_manager.get(inter.guild_id)
+
+        if not player or not player.queue:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="The queue is empty",
+                color=disnake.Color.red(),
+            )
+            return await inter.response.send_message(embed=embed, ephemeral=True)
+
+        queue = player.queue
+        embed = disnake.Embed(title="📊 Queue Stats", color=disnake.Color.blurple())
+
+        embed.add_field(name="Tracks", value=f"**{len(queue)}**")
+        embed.add_field(name="Total Length", value=f"`{self.format_time(queue.duration)}`")
+        embed.add_field(
+            name="Queue Ends In",
+            value=f"`{self.format_time(self.remaining_time(player) + queue.duration)}`",
+        )
+        if queue.streams:
+            embed.add_field(name="Streams", value=f"**{queue.streams}** (not counted in length)")
+
+        # Top requesters and sources
+        requesters = [
+            f"<@{requester}>: **{count}**" if requester else f"Unknown: **{count}**"
+            for requester, count in queue.requesters.most_common(5)
+        ]
+        embed.add_field(name="Top Requesters", value="\n".join(requesters), inline=False)
+
+        sources = [
+            f"{self.source_emojis.get(source.lower(), '🎵')} {source}: **{count}**"
+            for source, count in queue.sources.most_common()
+        ]
+        embed.add_field(name="Sources", value="\n".join(sources), inline=False)
+
         await inter.response.send_message(embed=embed)
 
     """
@@ -1207,23 +1868,25 @@ class MusicCog(commands.Cog):
     """
 
     @commands.slash_command(name="shuffle")
+    @serialized
     async def shuffle(self, inter: disnake.ApplicationCommandInteraction):
         """Shuffle the current queue"""
         player = self.bot.lavalink.player_manager.get(inter.guild_id)
         if not player:
             return
 
-        random.shuffle(player.queue)
+        player.queue.shuffle()
         emoji = "🔀"
         embed = disnake.Embed(
             title=f"{emoji} Queue Shuffled ",
             description="Queue has been shuffled randomically",
             color=disnake.Color.blurple(),
         )
-        await inter.response.send_message(embed=embed)
+        await self.respond(inter, embed=embed)
         logger.info(f"Queue shuffled in {inter.guild.name}")
 
     @commands.slash_command(name="playnext")
+    @serialized
     async def playnext(
         self,
         inter: disnake.ApplicationCommandInteraction,
@@ -1238,7 +1901,7 @@ class MusicCog(commands.Cog):
                 description="The queue is empty",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Check if valid index
         if index > len(player.queue):
@@ -1247,16 +1910,13 @@ class MusicCog(commands.Cog):
                 description=f"There are only {len(player.queue)} songs in the queue",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Adjust for 0-based indexing
         index = index - 1
 
-        # Get the track to play next
-        track = player.queue.pop(index)
-
-        # Insert the track at the top of the queue
-        player.queue.insert(0, track)
+        # Move the track to the top of the queue
+        track = player.queue.move(index, 0)
 
         # Skip the current track to play the selected one
         await player.skip()
@@ -1265,11 +1925,12 @@ class MusicCog(commands.Cog):
             description=f"Playing **{track.title}** next",
             color=disnake.Color.blurple(),
         )
-        await inter.response.send_message(embed=embed, ephemeral=False)
+        await self.respond(inter, embed=embed, ephemeral=False)
 
         logger.info(f"Playing next track in {inter.guild.name}: {track.title}")
 
     @commands.slash_command(name="repeat")
+    @serialized
     async def repeat(
         self,
         inter: disnake.ApplicationCommandInteraction,
@@ -1291,19 +1952,20 @@ class MusicCog(commands.Cog):
             player.repeat = False
 
             player.set_loop(0)  # Lavalink repeat mode off
-            await inter.response.send_message(embed=embed)
+            await self.respond(inter, embed=embed)
         elif mode == "one":
             player.repeat = True
             player.set_loop(1)  # Lavalink repeat single track
-            await inter.response.send_message(embed=embed)
+            await self.respond(inter, embed=embed)
         else:  # mode == "all"
             player.repeat = True
             player.set_loop(2)  # Lavalink repeat queue
-            await inter.response.send_message(embed=embed)
+            await self.respond(inter, embed=embed)
 
         logger.info(f"Repeat mode set to {mode} in {inter.guild.name}")
 
     @commands.slash_command(name="remove")
+    @serialized
     async def remove(
         self,
         inter: disnake.ApplicationCommandInteraction,
@@ -1318,7 +1980,7 @@ class MusicCog(commands.Cog):
                 description="The queue is empty",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Check if valid index
         if index > len(player.queue):
@@ -1327,7 +1989,7 @@ class MusicCog(commands.Cog):
                 description=f"There are only {len(player.queue)} songs in the queue",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Adjust for 0-based indexing
         index = index - 1
@@ -1342,11 +2004,90 @@ class MusicCog(commands.Cog):
             description=f"Removed **{removed.title}** from the queue",
             color=disnake.Color.blurple(),
         )
-        await inter.response.send_message(embed=embed, ephemeral=False)
+        await self.respond(inter, embed=embed, ephemeral=False)
 
         logger.info(f"Removed track from queue in {inter.guild.name}: {removed.title}")
 
+    @commands.slash_command(name="move")
+    @serialized
+    async def move(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        source: int = commands.Param(description="Position of the track to move", ge=1),
+        destination: int = commands.Param(description="New position of the track", ge=1),
+    ):
+        """Move a track to another position in the queue"""
+        player = self.bot.lavalink.player_manager.get(inter.guild_id)
+
+        if not player or not player.queue:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="The queue is empty",
+                color=disnake.Color.red(),
+            )
+            return await self.respond(inter, embed=embed, ephemeral=True)
+
+        # Check if valid positions
+        if max(source, destination) > len(player.queue):
+            embed = disnake.Embed(
+                title="❌ Error",
+                description=f"There are only {len(player.queue)} songs in the queue",
+                color=disnake.Color.red(),
+            )
+            return await self.respond(inter, embed=embed, ephemeral=True)
+
+        # Adjust for 0-based indexing
+        track = player.queue.move(source - 1, destination - 1)
+        embed = disnake.Embed(
+            title="↕️ Song moved",
+            description=f"Moved **{track.title}** to position **{destination}**",
+            color=disnake.Color.blurple(),
+        )
+        await self.respond(inter, embed=embed)
+
+        logger.info(f"Moved track in {inter.guild.name} from {source} to {destination}")
+
+    @commands.slash_command(name="removerange")
+    @serialized
+    async def removerange(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        start: int = commands.Param(description="First position to remove", ge=1),
+        end: int = commands.Param(description="Last position to remove", ge=1),
+    ):
+        """Remove a range of tracks from the queue"""
+        player = self.bot.lavalink.player_manager.get(inter.guild_id)
+
+        if not player or not player.queue:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="The queue is empty",
+                color=disnake.Color.red(),
+            )
+            return await self.respond(inter, embed=embed, ephemeral=True)
+
+        # Check if valid range
+        if start > end or start > len(player.queue):
+            embed = disnake.Embed(
+                title="❌ Error",
+                description=f"Invalid range, there are {len(player.queue)} songs in the queue",
+                color=disnake.Color.red(),
+            )
+            return await self.respond(inter, embed=embed, ephemeral=True)
+
+        # Positions are inclusive and 1-based
+        removed = player.queue.remove_range(start - 1, end)
+        embed = disnake.Embed(
+            title="❌ Songs removed",
+            description=f"Removed **{removed}** songs from the queue",
+            color=disnake.Color.blurple(),
+        )
+        await self.respond(inter, embed=embed)
+
+        logger.info(f"Removed {removed} tracks from queue in {inter.guild.name}")
+
     @commands.slash_command(name="clear")
+    @serialized
     async def clear(self, inter: disnake.ApplicationCommandInteraction):
         """Clear the queue but keep current song"""
         player = self.bot.lavalink.player_manager.get(inter.guild_id)
@@ -1357,7 +2098,7 @@ class MusicCog(commands.Cog):
                 description="The queue is already empty",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Store queue length for confirmation
         queue_length = len(player.queue)
@@ -1369,10 +2110,11 @@ class MusicCog(commands.Cog):
             description=f"Cleared {queue_length} songs from the queue",
             color=disnake.Color.blurple(),
         )
-        await inter.response.send_message(embed=embed)
+        await self.respond(inter, embed=embed)
         logger.info(f"Cleared queue in {inter.guild.name}")
 
     @commands.slash_command(name="seek")
+    @serialized
     async def seek(
         self,
         inter: disnake.ApplicationCommandInteraction,
@@ -1387,7 +2129,7 @@ class MusicCog(commands.Cog):
                 description="Nothing is playing right now",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Parse time input
         seconds = 0
@@ -1409,7 +2151,7 @@ class MusicCog(commands.Cog):
                 color=disnake.Color.red(),
             )
 
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Convert to milliseconds
         ms = seconds * 1000
@@ -1422,10 +2164,10 @@ class MusicCog(commands.Cog):
                 color=disnake.Color.red(),
             )
 
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         if player.current.duration > 0 and ms > player.current.duration:
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Perform seek
         await player.seek(ms)
@@ -1434,10 +2176,11 @@ class MusicCog(commands.Cog):
             description=f"Seeked to **{self.format_time(ms)}**",
             color=disnake.Color.blurple(),
         )
-        await inter.response.send_message(embed=embed)
+        await self.respond(inter, embed=embed)
         logger.info(f"Seeked to {self.format_time(ms)} in {inter.guild.name}")
 
     @commands.slash_command(name="disconnect")
+    @serialized
     async def disconnect(self, inter: disnake.ApplicationCommandInteraction):
         """Disconnect from voice channel"""
         player = self.bot.lavalink.player_manager.get(inter.guild_id)
@@ -1448,7 +2191,7 @@ class MusicCog(commands.Cog):
                 description="Im not connected to a voice channel",
                 color=disnake.Color.red(),
             )
-            return await inter.response.send_message(embed=embed, ephemeral=True)
+            return await self.respond(inter, embed=embed, ephemeral=True)
 
         # Clear queue and stop playback
         player.queue.clear()
@@ -1458,6 +2201,7 @@ class MusicCog(commands.Cog):
         guild = inter.guild
         if guild.voice_client:
             await guild.voice_client.disconnect(force=True)
+        self.forget_guild(guild.id)
 
         embed = disnake.Embed(
             title="👋 Bye Bye!",
@@ -1465,15 +2209,23 @@ class MusicCog(commands.Cog):
             color=disnake.Color.blurple(),
         )
 
-        await inter.response.send_message(embed=embed)
+        await self.respond(inter, embed=embed)
         logger.info(f"Disconnected from voice in {inter.guild.name}")
 
     @commands.slash_command(name="history")
-    async def history(self, inter: disnake.ApplicationCommandInteraction):
+    async def history(
+        self,
+        inter: disnake.ApplicationCommandInteraction,
+        page: int = commands.Param(description="Page to show", default=1, ge=1),
+    ):
         """Show recently played tracks"""
         guild_id = inter.guild_id
+        per_page = 10
+
+        records, total = await self.play_history.page(guild_id, page - 1, per_page)
+        pages = max(1, (total + per_page - 1) // per_page)
 
-        if guild_id not in self._queue_history or not self._queue_history[guild_id]:
+        if not total:
             embed = disnake.Embed(
                 title="❌ Error",
                 description="No queue history available",
@@ -1481,6 +2233,14 @@ class MusicCog(commands.Cog):
             )
             return await inter.response.send_message(embed=embed, ephemeral=True)
 
+        if not records:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description=f"Page must be between 1 and {pages}",
+                color=disnake.Color.red(),
+            )
+            return await inter.response.send_message(embed=embed, ephemeral=True)
+
         # Create embed with history
         embed = disnake.Embed(
             title="Recently Played Tracks", color=disnake.Color.blurple()
@@ -1488,21 +2248,19 @@ class MusicCog(commands.Cog):
 
         # List tracks in reverse order (most recent first)
         history_list = []
-        for i, track in enumerate(reversed(self._queue_history[guild_id]), start=1):
-            title = track.get("title", "Unknown")
-            author = track.get("author", "Unknown")
-            uri = track.get("uri", "")
-            source = track.get("source", "unknown")
+        for i, record in enumerate(records, start=(page - 1) * per_page + 1):
+            emoji = self.source_emojis.get(record.source.lower(), "🎵")
+            played = f"<t:{int(record.played_at)}:R>"
 
-            emoji = self.source_emojis.get(source.lower(), "🎵")
-
-            if uri:
-                history_list.append(f"`{i}.` {emoji} **[{title}]({uri})** by {author}")
+            if record.uri:
+                history_list.append(
+                    f"`{i}.` {emoji} **[{record.title}]({record.uri})** by {record.author} • {played}"
+                )
             else:
-                history_list.append(f"`{i}.` {emoji} **{title}** by {author}")
+                history_list.append(f"`{i}.` {emoji} **{record.title}** by {record.author} • {played}")
 
         embed.description = "\n".join(history_list)
-        embed.set_footer(text=f"Total: {len(history_list)} tracks")
+        embed.set_footer(text=f"Page {page}/{pages} • Total: {total} tracks")
 
         await inter.response.send_message(embed=embed)
 
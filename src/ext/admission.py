@@ -0,0 +1,224 @@
+import asyncio
+import functools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.metrics import Metrics  # pylint: disable=E0401
+from ext.rate_limit import TokenBucket  # pylint: disable=E0401
+
+logger = get_logger("AdmissionController")
+
+# User rate limit buckets kept before full ones are dropped
+MAX_IDLE_BUCKETS = 4096
+
+BUSY_MESSAGE = "The music service is busy right now, please try again in a moment"
+
+# Guild of the command being handled, inherited by the tasks it starts
+request_guild: ContextVar[Optional[int]] = ContextVar("request_guild", default=None)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class GuildSlots:
+    """Concurrency limit of one guild and how many requests use it"""
+
+    __slots__ = ("semaphore", "users")
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0
+
+
+class AdmissionController:
+    """
+    Decides which track loads run, wait or get shed
+
+    A command first takes a token from its user's bucket, allowing
+    `user_rate` commands per `user_per` seconds. Every node load it makes
+    then waits for a slot of its guild, at most `per_guild` at a time, and
+    a global slot, at most `max_inflight` at a time. Loads outside of a
+    command only take a global slot. At most `max_waiting` loads wait at
+    once, each for at most `wait_timeout` seconds. Anything over these
+    limits is rejected with AdmissionRejected.
+    """
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        max_inflight: int = 16,
+        per_guild: int = 2,
+        user_rate: int = 5,
+        user_per: float = 10.0,
+        max_waiting: int = 64,
+        wait_timeout: float = 5.0,
+    ):
+        self.metrics = metrics
+        self.per_guild = per_guild
+        self.user_rate = user_rate
+        self.user_per = user_per
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+
+        self._global = asyncio.Semaphore(max_inflight)
+        self._guilds: Dict[int, GuildSlots] = {}
+        self._users: Dict[int, TokenBucket] = {}
+        self.inflight = 0
+        self.waiting = 0
+
+    @classmethod
+    def from_config(cls, metrics: Metrics, config: Dict) -> "AdmissionController":
+        """
+        Build a controller from the "admission" section of the config file
+
+        Args:
+            metrics: Where to report waits and rejections
+            config: The admission configuration section
+
+        Returns:
+            A configured AdmissionController
+        """
+        return cls(
+            metrics,
+            max_inflight=config.get("max_inflight", 16),
+            per_guild=config.get("per_guild", 2),
+            user_rate=config.get("user_rate", 5),
+            user_per=config.get("user_per", 10.0),
+            max_waiting=config.get("max_waiting", 64),
+            wait_timeout=config.get("wait_timeout", 5.0),
+        )
+
+    def _reject(self, reason: str, message: str) -> AdmissionRejected:
+        self.metrics.increment(f"admission_rejected_{reason}")
+        return AdmissionRejected(reason, message)
+
+    def _user_bucket(self, user_id: int) -> TokenBucket:
+        bucket = self._users.get(user_id)
+        if bucket is None:
+            if len(self._users) >= MAX_IDLE_BUCKETS:
+                # A full bucket behaves exactly like a new one
+                for idle in [uid for uid, b in self._users.items() if b.is_full()]:
+                    del self._users[idle]
+            bucket = self._users[user_id] = TokenBucket(self.user_rate, self.user_per)
+        return bucket
+
+    def check_rate(self, user_id: int) -> None:
+        """
+        Take a token from a user's bucket
+
+        Args:
+            user_id: The requesting user
+
+        Raises:
+            AdmissionRejected: The user is over their rate
+        """
+        bucket = self._user_bucket(user_id)
+        if not bucket.try_acquire():
+            raise self._reject(
+                "rate",
+                f"You are sending requests too fast, try again in {bucket.delay():.0f}s",
+            )
+
+    @asynccontextmanager
+    async def slot(self, guild_id: Optional[int] = None) -> AsyncIterator[None]:
+        """
+        Hold a global loading slot, and one of the guild when given
+
+        Args:
+            guild_id: The guild the load is made for
+
+        Raises:
+            AdmissionRejected: Too many requests are waiting, or no slot freed in time
+        """
+        if self.waiting >= self.max_waiting:
+            raise self._reject("full", BUSY_MESSAGE)
+
+        slots = None
+        if guild_id is not None:
+            slots = self._guilds.get(guild_id)
+            if slots is None:
+                slots = self._guilds[guild_id] = GuildSlots(self.per_guild)
+            slots.users += 1
+
+        self.waiting += 1
+        self._report()
+        queued_at = time.monotonic()
+        acquired = []
+        try:
+            try:
+                await asyncio.wait_for(self._acquire(slots, acquired), self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise self._reject("timeout", BUSY_MESSAGE)  # pylint: disable=W0707
+            finally:
+                self.waiting -= 1
+
+            self.metrics.observe("admission_wait_ms", (time.monotonic() - queued_at) * 1000)
+            self.metrics.increment("admission_admitted")
+            self.inflight += 1
+            self._report()
+            try:
+                yield
+            finally:
+                self.inflight -= 1
+        finally:
+            for semaphore in acquired:
+                semaphore.release()
+            if slots is not None:
+                slots.users -= 1
+                if not slots.users:
+                    del self._guilds[guild_id]
+            self._report()
+
+    async def _acquire(self, slots: Optional[GuildSlots], acquired: list) -> None:
+        # The guild slot first, so one busy guild cannot hold global slots while it waits
+        if slots is not None:
+            await slots.semaphore.acquire()
+            acquired.append(slots.semaphore)
+        await self._global.acquire()
+        acquired.append(self._global)
+
+    def _report(self) -> None:
+        self.metrics.set("admission_inflight", self.inflight)
+        self.metrics.set("admission_waiting", self.waiting)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get admission state
+
+        Returns:
+            Dictionary with in-flight and waiting requests and active guilds
+        """
+        return {"inflight": self.inflight, "waiting": self.waiting, "guilds": len(self._guilds)}
+
+
+def admitted(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Rate limit a cog slash command that loads tracks
+
+    The cog needs an `admission` attribute. The interaction is deferred
+    here after the rate check, so the command must not defer it again.
+    The command's guild is set in request_guild, so its node loads take
+    that guild's slots. The signature is kept, so the command options are
+    still built from the wrapped function.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, inter, *args, **kwargs):
+        if inter.guild_id is not None:
+            self.admission.check_rate(inter.author.id)
+        await inter.response.defer()
+        token = request_guild.set(inter.guild_id)
+        try:
+            return await func(self, inter, *args, **kwargs)
+        finally:
+            request_guild.reset(token)
+
+    return wrapper
@@ -0,0 +1,136 @@
+import asyncio
+import re
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from lavalink import AudioTrack, Node  # pylint: disable=E0401
+
+from ext.admission import AdmissionRejected  # pylint: disable=E0401
+from ext.logger import get_logger  # pylint: disable=E0401
+
+logger = get_logger("BatchImporter")
+
+# Lines, semicolons and pipes separate entries, URLs may also be separated by spaces
+SEPARATOR_RX = re.compile(r"[\n;|]+")
+URL_SPLIT_RX = re.compile(r"\s+(?=https?://)")
+
+Resolver = Callable[[Node, str], Awaitable[List[AudioTrack]]]
+
+
+class ImportResult(NamedTuple):
+    """What one entry of a batch resolved to"""
+
+    query: str
+    tracks: List[AudioTrack]
+    error: Optional[str] = None
+
+
+def split_queries(text: str) -> List[str]:
+    """
+    Split a pasted batch into its entries
+
+    Args:
+        text: URLs and search queries, one per line or separated by ; or |
+
+    Returns:
+        The non-empty entries in input order
+    """
+    queries = []
+    for part in SEPARATOR_RX.split(text):
+        for query in URL_SPLIT_RX.split(part.strip()):
+            query = query.strip().strip("<>")
+            if query:
+                queries.append(query)
+    return queries
+
+
+class BatchImporter:
+    """
+    Resolves many queries at once under a concurrency cap
+
+    Every entry goes through the same resolver as /play, at most
+    `concurrency` at a time, and the results keep the input order.
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver,
+        concurrency: int = 4,
+        max_queries: int = 25,
+        timeout: float = 15.0,
+    ):
+        self.resolver = resolver
+        self.concurrency = concurrency
+        self.max_queries = max_queries
+        self.timeout = timeout
+
+        self.batches = 0
+        self.resolved = 0
+        self.failed = 0
+
+    @classmethod
+    def from_config(cls, resolver: Resolver, config: Dict) -> "BatchImporter":
+        """
+        Build an importer from the "batch_import" section of the config file
+
+        Args:
+            resolver: Coroutine resolving one query to the tracks to queue
+            config: The batch import configuration section
+
+        Returns:
+            A configured BatchImporter
+        """
+        return cls(
+            resolver,
+            concurrency=config.get("concurrency", 4),
+            max_queries=config.get("max_queries", 25),
+            timeout=config.get("timeout", 15.0),
+        )
+
+    async def resolve(self, node: Node, queries: List[str]) -> List[ImportResult]:
+        """
+        Resolve every query
+
+        Args:
+            node: The node to load on
+            queries: The queries, at most max_queries are used
+
+        Returns:
+            One result per query, in input order
+        """
+        self.batches += 1
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def resolve_one(query: str) -> ImportResult:
+            async with semaphore:
+                try:
+                    tracks = await asyncio.wait_for(self.resolver(node, query), self.timeout)
+                except asyncio.TimeoutError:
+                    return ImportResult(query, [], "timed out")
+                except AdmissionRejected:
+                    return ImportResult(query, [], "busy, try again")
+                except Exception as e:  # pylint: disable=W0718
+                    logger.warning(f"Failed to resolve {query}: {e}")
+                    return ImportResult(query, [], "failed to load")
+
+            if not tracks:
+                return ImportResult(query, [], "nothing found")
+            return ImportResult(query, tracks)
+
+        results = await asyncio.gather(
+            *(resolve_one(query) for query in queries[: self.max_queries])
+        )
+        for result in results:
+            if result.error:
+                self.failed += 1
+            else:
+                self.resolved += 1
+        return list(results)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get import counters
+
+        Returns:
+            Dictionary with batch, resolved and failed counts
+        """
+        return {"batches": self.batches, "resolved": self.resolved, "failed": self.failed}
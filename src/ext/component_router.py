@@ -0,0 +1,116 @@
+from typing import Awaitable, Callable, Dict, List, Union
+
+import disnake  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+
+logger = get_logger("ComponentRouter")
+
+# Discord limit for custom IDs
+MAX_CUSTOM_ID = 100
+
+ComponentInteraction = Union[disnake.MessageInteraction, disnake.ModalInteraction]
+# Called with the interaction and the state fields of its custom ID
+Handler = Callable[..., Awaitable[None]]
+
+
+class ComponentRouter:
+    """
+    Dispatches component interactions by their custom ID
+
+    A custom ID is "<namespace>:<action>:<state>:...", holding everything
+    the handler needs, so no per-message view or closure has to stay alive
+    and the components keep working after a restart. State fields are
+    passed to the handler as strings.
+    """
+
+    SEPARATOR = ":"
+
+    def __init__(self, namespace: str = "mb"):
+        self.namespace = namespace
+        self._routes: Dict[str, Handler] = {}
+
+        self.dispatched = 0
+        self.unknown = 0
+        self.failed = 0
+
+    def route(self, action: str, handler: Handler) -> None:
+        """
+        Register the handler of an action
+
+        Args:
+            action: The action name, must not contain the separator
+            handler: Coroutine called with the interaction and the state fields
+        """
+        if self.SEPARATOR in action:
+            raise ValueError(f"Action {action!r} must not contain {self.SEPARATOR!r}")
+        self._routes[action] = handler
+
+    def custom_id(self, action: str, *state: object) -> str:
+        """
+        Build the custom ID of a component
+
+        Args:
+            action: A registered action
+            *state: State fields for the handler
+
+        Returns:
+            The custom ID
+        """
+        custom_id = self.SEPARATOR.join([self.namespace, action, *map(str, state)])
+        if len(custom_id) > MAX_CUSTOM_ID:
+            raise ValueError(f"Custom ID for {action} is longer than {MAX_CUSTOM_ID} characters")
+        return custom_id
+
+    def parse(self, custom_id: str) -> List[str]:
+        """
+        Split a custom ID into its action and state fields
+
+        Args:
+            custom_id: The custom ID of a component
+
+        Returns:
+            The action followed by its state, empty for foreign custom IDs
+        """
+        namespace, _, rest = custom_id.partition(self.SEPARATOR)
+        if namespace != self.namespace or not rest:
+            return []
+        return rest.split(self.SEPARATOR)
+
+    async def dispatch(self, inter: ComponentInteraction) -> bool:
+        """
+        Run the handler of an interaction
+
+        Args:
+            inter: A component or modal interaction
+
+        Returns:
+            False if the custom ID does not belong to this router
+        """
+        fields = self.parse(inter.data.custom_id)
+        if not fields:
+            return False
+
+        handler = self._routes.get(fields[0])
+        if handler is None:
+            # Component of a removed or renamed action
+            self.unknown += 1
+            logger.debug(f"No route for {inter.data.custom_id}")
+            return False
+
+        self.dispatched += 1
+        try:
+            await handler(inter, *fields[1:])
+        except Exception:  # pylint: disable=W0718
+            self.failed += 1
+            logger.error(f"Component handler for {inter.data.custom_id} failed", exc_info=True)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get dispatch counters
+
+        Returns:
+            Dictionary with dispatched, unknown and failed counts
+        """
+        return {"dispatched": self.dispatched, "unknown": self.unknown, "failed": self.failed}
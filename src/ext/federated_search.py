@@ -0,0 +1,200 @@
+import asyncio
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from lavalink import AudioTrack, LoadResult, Node  # pylint: disable=E0401
+
+from ext.admission import AdmissionRejected  # pylint: disable=E0401
+from ext.logger import get_logger  # pylint: disable=E0401
+
+logger = get_logger("FederatedSearch")
+
+# Bracketed suffixes like "(Official Video)" that differ between uploads
+BRACKETS_RX = re.compile(r"[(\[][^)\]]*[)\]]")
+# Anything that is not a letter or a digit
+NON_WORD_RX = re.compile(r"[\W_]+")
+
+# Durations within this many seconds count as the same recording
+DURATION_BUCKET = 3
+
+Loader = Callable[[Node, str], Awaitable[LoadResult]]
+
+
+def dedupe_key(track: AudioTrack) -> Tuple[str, str, int]:
+    """
+    Build the identity used to merge results from different sources
+
+    Args:
+        track: The track to identify
+
+    Returns:
+        A (title, author, duration bucket) tuple
+    """
+    title = NON_WORD_RX.sub(" ", BRACKETS_RX.sub("", track.title)).strip().casefold()
+    author = NON_WORD_RX.sub(" ", track.author).strip().casefold()
+    return title, author, round(track.duration / 1000 / DURATION_BUCKET)
+
+
+class FederatedSearch:
+    """
+    Queries several Lavalink search sources at once under a deadline
+    """
+
+    def __init__(
+        self,
+        loader: Loader,
+        sources: Sequence[str] = ("ytsearch", "scsearch"),
+        deadline: float = 4.0,
+        hedge_delay: float = 1.5,
+        per_source: int = 5,
+        max_results: int = 10,
+    ):
+        self.loader = loader
+        self.sources = list(sources)
+        self.deadline = deadline
+        self.hedge_delay = hedge_delay
+        self.per_source = per_source
+        self.max_results = max_results
+
+    @classmethod
+    def from_config(cls, loader: Loader, config: Dict) -> "FederatedSearch":
+        """
+        Build a search engine from the "search" section of the config file
+
+        Args:
+            loader: Coroutine loading a Lavalink identifier on a node
+            config: The search configuration section
+
+        Returns:
+            A configured FederatedSearch
+        """
+        return cls(
+            loader,
+            sources=config.get("sources", ["ytsearch", "scsearch"]),
+            deadline=config.get("deadline", 4.0),
+            hedge_delay=config.get("hedge_delay", 1.5),
+            per_source=config.get("per_source", 5),
+            max_results=config.get("max_results", 10),
+        )
+
+    async def _load(self, node: Node, prefix: str, query: str) -> Optional[LoadResult]:
+        try:
+            return await self.loader(node, f"{prefix}:{query}")
+        except (asyncio.CancelledError, AdmissionRejected):
+            raise
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning(f"{prefix} search failed for '{query}': {e}")
+            return None
+
+    def _start(self, node: Node, query: str, sources: Sequence[str]) -> Dict[asyncio.Task, str]:
+        return {
+            asyncio.ensure_future(self._load(node, prefix, query)): prefix
+            for prefix in sources
+        }
+
+    async def search(
+        self, node: Node, query: str, sources: Optional[Sequence[str]] = None
+    ) -> List[AudioTrack]:
+        """
+        Search every source in parallel and merge what arrives before the deadline
+
+        Args:
+            node: The node to search on
+            query: What to search for
+            sources: Search prefixes to use, defaults to every enabled source
+
+        Returns:
+            Deduplicated tracks in source priority order
+
+        Raises:
+            AdmissionRejected: Nothing was found and a source was shed
+        """
+        sources = list(sources or self.sources)
+        tasks = self._start(node, query, sources)
+
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            late = ", ".join(tasks[task] for task in pending)
+            logger.debug(f"Search deadline hit for '{query}', dropped {late}")
+
+        # A shed source only fails the search when nothing else was found
+        shed = next((task.exception() for task in done if task.exception()), None)
+        by_source = {tasks[task]: task.result() for task in done if not task.exception()}
+
+        merged = []
+        seen = set()
+        for prefix in sources:
+            result = by_source.get(prefix)
+            if not result or not result.tracks:
+                continue
+
+            for track in result.tracks[: self.per_source]:
+                key = dedupe_key(track)
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append(track)
+
+        if not merged and shed:
+            raise shed
+        return merged[: self.max_results]
+
+    async def first(
+        self, node: Node, query: str, sources: Optional[Sequence[str]] = None
+    ) -> Optional[LoadResult]:
+        """
+        Get the first non-empty result, hedging to the next sources when slow
+
+        The first source starts alone. The others start once it has failed,
+        came back empty or has not answered within hedge_delay.
+
+        Args:
+            node: The node to search on
+            query: What to search for
+            sources: Search prefixes in priority order
+
+        Returns:
+            The first result with tracks, or None if nothing arrived in time
+
+        Raises:
+            AdmissionRejected: Nothing was found and a source was shed
+        """
+        sources = list(sources or self.sources)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+
+        tasks = self._start(node, query, sources[:1])
+        hedged = len(sources) == 1
+        shed = None
+
+        try:
+            while tasks:
+                timeout = deadline - loop.time()
+                if not hedged:
+                    timeout = min(timeout, self.hedge_delay)
+                if timeout <= 0:
+                    break
+
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in sorted(done, key=lambda t: sources.index(tasks[t])):
+                    if task.exception():
+                        shed = task.exception()
+                    elif task.result() and task.result().tracks:
+                        return task.result()
+                    del tasks[task]
+
+                if not hedged:
+                    hedged = True
+                    tasks.update(self._start(node, query, sources[1:]))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if shed:
+            raise shed
+        return None
@@ -0,0 +1,309 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, NamedTuple
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.metrics import Metrics, Summary  # pylint: disable=E0401
+
+logger = get_logger("GuildExecutor")
+
+Job = Callable[[], Awaitable[Any]]
+
+# Overload policies for a full mailbox
+REJECT = "reject"
+DROP_OLDEST = "drop_oldest"
+QUEUE = "queue"
+
+# Guilds whose statistics are kept after their mailbox went idle
+MAX_GUILD_STATS = 1024
+
+
+class GuildBusy(Exception):
+    """Raised when a guild's mailbox is full"""
+
+    def __init__(self, guild_id: int):
+        super().__init__(
+            "Too many music actions are pending in this server, please try again in a moment"
+        )
+        self.guild_id = guild_id
+
+
+class PendingJob(NamedTuple):
+    """A job waiting in a guild's mailbox"""
+
+    job: Job
+    future: asyncio.Future
+    queued_at: float
+    droppable: bool
+
+
+class GuildStats:
+    """Mailbox statistics of one guild"""
+
+    __slots__ = ("depth", "max_depth", "wait", "rejected", "dropped")
+
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+        self.wait = Summary(window=128)
+        self.rejected = 0
+        self.dropped = 0
+
+
+class GuildExecutor:
+    """
+    Runs the work of each guild in order, and different guilds in parallel
+
+    Every guild has a mailbox of at most `mailbox_size` pending jobs and a
+    worker that exists only while the mailbox is not empty. When a mailbox
+    is full, the overload policy of a new job decides what happens. REJECT
+    refuses it with GuildBusy. DROP_OLDEST drops the oldest pending
+    DROP_OLDEST job to make room, or refuses the new job when there is
+    none, so it never drops work of another policy. QUEUE always queues,
+    beyond the mailbox size, for work that must not be lost.
+    """
+
+    def __init__(self, metrics: Metrics, mailbox_size: int = 32, job_timeout: float = 30.0):
+        self.metrics = metrics
+        self.mailbox_size = mailbox_size
+        self.job_timeout = job_timeout
+
+        self._mailboxes: Dict[int, Deque[PendingJob]] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self._stats: "OrderedDict[int, GuildStats]" = OrderedDict()
+
+    @classmethod
+    def from_config(cls, metrics: Metrics, config: Dict) -> "GuildExecutor":
+        """
+        Build an executor from the "guild_executor" section of the config file
+
+        Args:
+            metrics: Where to report waits and overloads
+            config: The guild executor configuration section
+
+        Returns:
+            A configured GuildExecutor
+        """
+        return cls(
+            metrics,
+            mailbox_size=config.get("mailbox_size", 32),
+            job_timeout=config.get("job_timeout", 30.0),
+        )
+
+    def _guild_stats(self, guild_id: int) -> GuildStats:
+        stats = self._stats.get(guild_id)
+        if stats is None:
+            stats = self._stats[guild_id] = GuildStats()
+            while len(self._stats) > MAX_GUILD_STATS:
+                self._stats.popitem(last=False)
+        self._stats.move_to_end(guild_id)
+        return stats
+
+    def submit(self, guild_id: int, job: Job, policy: str = REJECT) -> asyncio.Future:
+        """
+        Queue a job behind the guild's pending work
+
+        Args:
+            guild_id: The guild the job belongs to
+            job: Creates the coroutine to run
+            policy: What to do when the mailbox is full, REJECT, DROP_OLDEST or QUEUE
+
+        Returns:
+            Future of the job's result
+
+        Raises:
+            GuildBusy: The mailbox is full and the job could not be queued
+        """
+        mailbox = self._mailboxes.get(guild_id)
+        if mailbox is None:
+            mailbox = self._mailboxes[guild_id] = deque()
+        stats = self._guild_stats(guild_id)
+
+        if len(mailbox) >= self.mailbox_size and policy != QUEUE:
+            oldest = None
+            if policy == DROP_OLDEST:
+                oldest = next((pending for pending in mailbox if pending.droppable), None)
+            if oldest is None:
+                stats.rejected += 1
+                self.metrics.increment("guild_jobs_rejected")
+                raise GuildBusy(guild_id)
+
+            mailbox.remove(oldest)
+            oldest.future.cancel()
+            stats.dropped += 1
+            self.metrics.increment("guild_jobs_dropped")
+
+        future = asyncio.get_running_loop().create_future()
+        mailbox.append(PendingJob(job, future, time.monotonic(), policy == DROP_OLDEST))
+        stats.depth = len(mailbox)
+        stats.max_depth = max(stats.max_depth, stats.depth)
+
+        if guild_id not in self._workers:
+            self._workers[guild_id] = asyncio.ensure_future(self._drain(guild_id))
+        return future
+
+    def post(self, guild_id: int, job: Job, policy: str = DROP_OLDEST) -> None:
+        """
+        Queue a job without waiting for it, logging its failure
+
+        Args:
+            guild_id: The guild the job belongs to
+            job: Creates the coroutine to run
+            policy: What to do when the mailbox is full
+        """
+        try:
+            future = self.submit(guild_id, job, policy)
+        except GuildBusy:
+            logger.warning(f"Dropped a job in guild {guild_id}, its mailbox is full")
+            return
+        future.add_done_callback(functools.partial(self._log_failure, guild_id))
+
+    @staticmethod
+    def _log_failure(guild_id: int, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Job in guild {guild_id} failed", exc_info=future.exception())
+
+    async def run(self, guild_id: int, job: Job, policy: str = REJECT) -> Any:
+        """
+        Run a job in the guild's order and wait for its result
+
+        Args:
+            guild_id: The guild the job belongs to
+            job: Creates the coroutine to run
+            policy: What to do when the mailbox is full
+
+        Returns:
+            Whatever the job returns
+
+        Raises:
+            GuildBusy: The guild's mailbox is full
+        """
+        return await self.submit(guild_id, job, policy)
+
+    def is_idle(self, guild_id: int) -> bool:
+        """
+        Check whether a job of the guild would start right away
+
+        Args:
+            guild_id: The guild
+
+        Returns:
+            True if nothing of the guild is running or pending
+        """
+        return guild_id not in self._workers
+
+    async def _drain(self, guild_id: int) -> None:
+        mailbox = self._mailboxes[guild_id]
+        stats = self._guild_stats(guild_id)
+        try:
+            while mailbox:
+                job, future, queued_at, _ = mailbox.popleft()
+                stats.depth = len(mailbox)
+                if future.done():
+                    continue
+
+                waited = (time.monotonic() - queued_at) * 1000
+                stats.wait.observe(waited)
+                self.metrics.observe("guild_wait_ms", waited)
+
+                try:
+                    result = await asyncio.wait_for(job(), self.job_timeout)
+                except asyncio.TimeoutError:
+                    # A stuck job must not hold up the rest of the guild
+                    logger.warning(f"Job in guild {guild_id} timed out after {self.job_timeout}s")
+                    self.metrics.increment("guild_jobs_timed_out")
+                    if not future.done():
+                        future.set_exception(asyncio.TimeoutError())
+                except Exception as e:  # pylint: disable=W0718
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._workers.pop(guild_id, None)
+            if self._mailboxes.get(guild_id) is mailbox:
+                del self._mailboxes[guild_id]
+                for pending in mailbox:
+                    pending.future.cancel()
+
+    def close(self) -> None:
+        """Cancel every worker and pending job"""
+        for worker in list(self._workers.values()):
+            worker.cancel()
+        for mailbox in self._mailboxes.values():
+            for pending in mailbox:
+                pending.future.cancel()
+        self._mailboxes.clear()
+
+    def guild_stats(self, guild_id: int) -> Dict[str, float]:
+        """
+        Get the mailbox statistics of a guild
+
+        Args:
+            guild_id: The guild
+
+        Returns:
+            Dictionary with depth, max depth, wait summary, rejected and dropped counts
+        """
+        stats = self._stats.get(guild_id) or GuildStats()
+        return {
+            "depth": stats.depth,
+            "max_depth": stats.max_depth,
+            "wait_ms": stats.wait.snapshot(),
+            "rejected": stats.rejected,
+            "dropped": stats.dropped,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get executor-wide counters
+
+        Returns:
+            Dictionary with busy guilds and pending jobs
+        """
+        return {
+            "busy_guilds": len(self._workers),
+            "pending": sum(len(mailbox) for mailbox in self._mailboxes.values()),
+        }
+
+
+def serialized(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Run a cog slash command through the cog's guild executor
+
+    The cog needs a `guild_executor` attribute. When other work of the
+    guild runs first, the interaction is deferred so it does not expire
+    while waiting, and the command must answer with a followup. The
+    signature is kept, so the command options are still built from the
+    wrapped function.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, inter, *args, **kwargs):
+        if inter.guild_id is None:
+            return await func(self, inter, *args, **kwargs)
+        if not self.guild_executor.is_idle(inter.guild_id):
+            await inter.response.defer()
+        return await self.guild_executor.run(
+            inter.guild_id, lambda: func(self, inter, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+def serialized_event(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Queue a cog's Lavalink event listener in the event player's guild
+
+    The listener returns at once, so a slow handler never delays the
+    events of other guilds. Events of one guild are handled in order.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, event):
+        self.guild_executor.post(event.player.guild_id, lambda: func(self, event))
+
+    return wrapper
@@ -0,0 +1,318 @@
+from itertools import chain, islice
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+
+def build_tree(values: List[int]) -> List[int]:
+    """
+    Build a 1-based Fenwick tree in O(n)
+
+    Args:
+        values: The values to index
+
+    Returns:
+        The tree, index 0 is unused
+    """
+    size = len(values)
+    tree = [0] + values
+    for i in range(1, size + 1):
+        parent = i + (i & -i)
+        if parent <= size:
+            tree[parent] += tree[i]
+    return tree
+
+
+def tree_add(tree: List[int], index: int, delta: int) -> None:
+    """
+    Add delta to the 0-based index of a Fenwick tree
+
+    Args:
+        tree: The tree built by build_tree
+        index: The 0-based position to change
+        delta: The amount to add
+    """
+    i = index + 1
+    while i < len(tree):
+        tree[i] += delta
+        i += i & -i
+
+
+def tree_prefix(tree: List[int], count: int) -> int:
+    """
+    Sum the first count values of a Fenwick tree
+
+    Args:
+        tree: The tree built by build_tree
+        count: How many values to sum
+
+    Returns:
+        The prefix sum
+    """
+    total = 0
+    while count > 0:
+        total += tree[count]
+        count -= count & -count
+    return total
+
+
+class IndexedList(Generic[T]):
+    """
+    Positional sequence stored as a list of chunks with a Fenwick index
+
+    Items live in chunks of roughly `load` items. A Fenwick tree over the
+    chunk sizes finds the chunk holding any position in O(log n), so
+    lookups, inserts and single deletes only shift items inside one chunk
+    instead of the whole sequence. Range deletes drop whole chunks at once.
+    The tree is rebuilt in O(number of chunks) when chunks split or vanish.
+
+    With a weight function, a second tree over per-chunk weight sums keeps
+    the total weight in O(1) and any prefix weight in O(log n + load).
+    """
+
+    def __init__(
+        self,
+        values: Iterable[T] = (),
+        load: int = 256,
+        weight: Optional[Callable[[T], int]] = None,
+    ):
+        self._load = load
+        self._weight = weight
+        self._chunks: List[List[T]] = []
+        self._chunk_weights: List[int] = []
+        self._tree: List[int] = [0]
+        self._weight_tree: List[int] = [0]
+        self._len = 0
+        self.total_weight = 0
+        self.reset(values)
+
+    def reset(self, values: Iterable[T]) -> None:
+        """
+        Replace the whole content
+
+        Args:
+            values: The new items, in order
+        """
+        values = list(values)
+        self._chunks = [values[i : i + self._load] for i in range(0, len(values), self._load)]
+        self._len = len(values)
+        self._chunk_weights = [self._weigh(chunk) for chunk in self._chunks]
+        self.total_weight = sum(self._chunk_weights)
+        self._rebuild()
+
+    def _weigh(self, values: Iterable[T]) -> int:
+        if self._weight is None:
+            return 0
+        return sum(map(self._weight, values))
+
+    def _rebuild(self) -> None:
+        self._tree = build_tree([len(chunk) for chunk in self._chunks])
+        if self._weight is not None:
+            self._weight_tree = build_tree(list(self._chunk_weights))
+
+    def _update(self, chunk_index: int, delta: int, weight: int = 0) -> None:
+        tree_add(self._tree, chunk_index, delta)
+        if weight:
+            tree_add(self._weight_tree, chunk_index, weight)
+            self._chunk_weights[chunk_index] += weight
+            self.total_weight += weight
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        # Descend the tree to the last chunk starting at or before index
+        position = 0
+        remaining = index
+        step = 1 << (len(self._chunks).bit_length() - 1) if self._chunks else 0
+        while step:
+            following = position + step
+            if following < len(self._tree) and self._tree[following] <= remaining:
+                position = following
+                remaining -= self._tree[following]
+            step >>= 1
+        return position, remaining
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[T]:
+        return chain.from_iterable(self._chunks)
+
+    def iter_from(self, start: int) -> Iterator[T]:
+        """
+        Iterate from a position without walking the items before it
+
+        Args:
+            start: The first position to yield
+
+        Returns:
+            Iterator over the items from start to the end
+        """
+        if start >= self._len:
+            return iter(())
+
+        chunk_index, offset = self._locate(max(0, start))
+        first = islice(self._chunks[chunk_index], offset, None)
+        return chain(first, chain.from_iterable(self._chunks[chunk_index + 1 :]))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return list(self)[index]
+            return list(islice(self.iter_from(start), max(0, stop - start)))
+
+        chunk_index, offset = self._locate(self._normalize(index))
+        return self._chunks[chunk_index][offset]
+
+    def __setitem__(self, index: int, value: T) -> None:
+        chunk_index, offset = self._locate(self._normalize(index))
+        chunk = self._chunks[chunk_index]
+        weight = self._weigh([value]) - self._weigh([chunk[offset]])
+        chunk[offset] = value
+        self._update(chunk_index, 0, weight)
+
+    def prefix_weight(self, index: int) -> int:
+        """
+        Sum the weights of every item before a position
+
+        Args:
+            index: The position, clamped to the sequence
+
+        Returns:
+            The total weight of the items in [0, index)
+        """
+        index = max(0, min(index, self._len))
+        if index == self._len:
+            return self.total_weight
+
+        chunk_index, offset = self._locate(index)
+        before = tree_prefix(self._weight_tree, chunk_index)
+        return before + self._weigh(self._chunks[chunk_index][:offset])
+
+    def insert(self, index: int, value: T) -> None:
+        """
+        Insert one item, clamping the index like list.insert
+
+        Args:
+            index: Position of the new item
+            value: The item
+        """
+        self.insert_many(index, [value])
+
+    def insert_many(self, index: int, values: Iterable[T]) -> None:
+        """
+        Insert several items at one position
+
+        Args:
+            index: Position of the first new item
+            values: The items, in order
+        """
+        values = list(values)
+        if not values:
+            return
+
+        if index < 0:
+            index = max(0, index + self._len)
+        index = min(index, self._len)
+
+        if not self._chunks:
+            self.reset(values)
+            return
+
+        if index == self._len:
+            chunk_index = len(self._chunks) - 1
+            offset = len(self._chunks[chunk_index])
+        else:
+            chunk_index, offset = self._locate(index)
+
+        chunk = self._chunks[chunk_index]
+        chunk[offset:offset] = values
+        self._len += len(values)
+        weight = self._weigh(values)
+
+        if len(chunk) <= 2 * self._load:
+            self._update(chunk_index, len(values), weight)
+            return
+
+        pieces = [chunk[i : i + self._load] for i in range(0, len(chunk), self._load)]
+        self._chunks[chunk_index : chunk_index + 1] = pieces
+        self._chunk_weights[chunk_index : chunk_index + 1] = [self._weigh(piece) for piece in pieces]
+        self.total_weight += weight
+        self._rebuild()
+
+    def pop(self, index: int = -1) -> T:
+        """
+        Remove and return one item
+
+        Args:
+            index: Position of the item
+
+        Returns:
+            The removed item
+        """
+        chunk_index, offset = self._locate(self._normalize(index))
+        chunk = self._chunks[chunk_index]
+        value = chunk.pop(offset)
+        self._len -= 1
+
+        if chunk:
+            self._update(chunk_index, -1, -self._weigh([value]))
+        else:
+            self.total_weight -= self._chunk_weights.pop(chunk_index)
+            del self._chunks[chunk_index]
+            self._rebuild()
+        return value
+
+    def delete_range(self, start: int, stop: int) -> List[T]:
+        """
+        Remove every item in [start, stop)
+
+        Args:
+            start: First position to remove
+            stop: Position after the last one to remove
+
+        Returns:
+            The removed items, in order
+        """
+        start, stop, _ = slice(start, stop).indices(self._len)
+        if start >= stop:
+            return []
+
+        chunk_index, offset = self._locate(start)
+        remaining = stop - start
+        removed: List[T] = []
+
+        while remaining:
+            chunk = self._chunks[chunk_index]
+            take = min(remaining, len(chunk) - offset)
+            taken = chunk[offset : offset + take]
+            removed.extend(taken)
+            del chunk[offset : offset + take]
+            remaining -= take
+
+            weight = self._weigh(taken)
+            self.total_weight -= weight
+            if chunk:
+                self._chunk_weights[chunk_index] -= weight
+                chunk_index += 1
+            else:
+                del self._chunks[chunk_index]
+                del self._chunk_weights[chunk_index]
+            offset = 0
+
+        self._len -= len(removed)
+        self._rebuild()
+        return removed
+
+    def clear(self) -> None:
+        """Remove every item"""
+        self.reset(())
+
+    def __repr__(self) -> str:
+        return f"<IndexedList items={self._len} chunks={len(self._chunks)}>"
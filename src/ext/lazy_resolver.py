@@ -0,0 +1,205 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+import lavalink  # pylint: disable=E0401
+from lavalink import AudioTrack, LoadResult, Node  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.queue_entry import Stored  # pylint: disable=E0401
+
+logger = get_logger("LazyResolver")
+
+Loader = Callable[[Node, str], Awaitable[LoadResult]]
+
+
+class LazyResolver:
+    """
+    Resolves mirrored playlist entries just before they reach the queue head
+
+    LavaSrc returns Spotify (and similar) playlists as metadata-only
+    tracks that the node mirrors to a playable source when each one starts.
+    These entries stay as they are in the queue. Once an entry comes within
+    `window` positions of the head, it is resolved ahead of time through
+    the mirror providers, using the same syntax as LavaSrc, and replaced by
+    the playable track. An entry without any match is removed from the
+    queue, so it never stalls playback. Resolutions run in the background
+    under a shared concurrency limit.
+    """
+
+    def __init__(
+        self,
+        loader: Loader,
+        enabled: bool = True,
+        sources: Sequence[str] = ("spotify", "applemusic", "deezer", "yandexmusic"),
+        providers: Sequence[str] = ('ytsearch:"%ISRC%"', "ytsearch:%QUERY%"),
+        window: int = 3,
+        concurrency: int = 4,
+        timeout: float = 10.0,
+    ):
+        self.loader = loader
+        self.enabled = enabled
+        self.sources = set(sources)
+        self.providers = list(providers)
+        self.window = window
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._inflight: Dict[Stored, asyncio.Task] = {}
+
+        self.resolved = 0
+        self.failed = 0
+
+    @classmethod
+    def from_config(cls, loader: Loader, config: Dict) -> "LazyResolver":
+        """
+        Build a resolver from the "lazy_playlists" section of the config file
+
+        Args:
+            loader: Coroutine loading a Lavalink identifier on a node
+            config: The lazy playlists configuration section
+
+        Returns:
+            A configured LazyResolver
+        """
+        return cls(
+            loader,
+            enabled=config.get("enabled", True),
+            sources=config.get("sources", ["spotify", "applemusic", "deezer", "yandexmusic"]),
+            providers=config.get("providers", ['ytsearch:"%ISRC%"', "ytsearch:%QUERY%"]),
+            window=config.get("window", 3),
+            concurrency=config.get("concurrency", 4),
+            timeout=config.get("timeout", 10.0),
+        )
+
+    def is_pending(self, entry: Stored) -> bool:
+        """
+        Check whether an entry still needs to be mirrored
+
+        Args:
+            entry: A stored queue entry
+
+        Returns:
+            True for tracks of a mirrored source
+        """
+        return entry.source_name in self.sources
+
+    def schedule(
+        self, player: lavalink.DefaultPlayer, window: Optional[int] = None, force: bool = False
+    ) -> int:
+        """
+        Start resolving the pending entries near the head of a queue
+
+        Args:
+            player: The player owning the queue
+            window: How many entries from the head to look at
+            force: Resolve even when lazy playlists are disabled
+
+        Returns:
+            Number of resolutions started
+        """
+        if not (self.enabled or force):
+            return 0
+
+        window = window or self.window
+        started = 0
+        for position, entry in enumerate(player.queue.entries()):
+            if position >= window:
+                break
+            if entry in self._inflight or not self.is_pending(entry):
+                continue
+
+            self._inflight[entry] = asyncio.ensure_future(self._resolve(player, entry, window))
+            started += 1
+        return started
+
+    async def find(
+        self, node: Node, entry: Stored, exclude: Optional[str] = None
+    ) -> Optional[AudioTrack]:
+        """
+        Look the entry up through every mirror provider in order
+
+        Args:
+            node: The node to search on
+            entry: The entry to mirror
+            exclude: Identifier of a track that must not be returned
+
+        Returns:
+            The first matching playable track, or None
+        """
+        query = f"{entry.title} {entry.author}"
+        for provider in self.providers:
+            if "%ISRC%" in provider:
+                if not entry.isrc:
+                    continue
+                provider = provider.replace("%ISRC%", entry.isrc)
+            identifier = provider.replace("%QUERY%", query)
+
+            try:
+                result = await asyncio.wait_for(self.loader(node, identifier), self.timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # pylint: disable=W0718
+                logger.debug(f"Mirror lookup {identifier} failed: {e}")
+                continue
+
+            for track in result.tracks:
+                if track.identifier != exclude:
+                    return track
+        return None
+
+    @staticmethod
+    def position_of(player: lavalink.DefaultPlayer, entry: Stored, limit: int) -> Optional[int]:
+        """
+        Find where an entry currently is near the head of the queue
+
+        Args:
+            player: The player owning the queue
+            entry: The entry to look for
+            limit: How many positions to search
+
+        Returns:
+            The position, or None if the entry moved away or left the queue
+        """
+        for position, stored in enumerate(player.queue.entries()):
+            if position >= limit:
+                break
+            if stored is entry:
+                return position
+        return None
+
+    async def _resolve(self, player: lavalink.DefaultPlayer, entry: Stored, window: int) -> None:
+        try:
+            async with self._semaphore:
+                # Skip entries that were played or removed while waiting
+                if self.position_of(player, entry, window * 2) is None:
+                    return
+                track = await self.find(player.node, entry)
+
+            # The queue may have changed during the lookup
+            position = self.position_of(player, entry, window * 2)
+            if position is None:
+                return
+
+            if track is None:
+                self.failed += 1
+                del player.queue[position]
+                logger.info(f"Skipped '{entry.title}' in guild {player.guild_id}, no playable match")
+                # The next entry moved into the window
+                self.schedule(player, window)
+                return
+
+            track.requester = entry.requester
+            player.queue[position] = track
+            self.resolved += 1
+        except Exception:  # pylint: disable=W0718
+            logger.error(f"Failed to resolve '{entry.title}' in guild {player.guild_id}", exc_info=True)
+        finally:
+            self._inflight.pop(entry, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get resolution counters
+
+        Returns:
+            Dictionary with in-flight, resolved and failed counts
+        """
+        return {"inflight": len(self._inflight), "resolved": self.resolved, "failed": self.failed}
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import disnake  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.metrics import Metrics  # pylint: disable=E0401
+
+logger = get_logger("LivePanels")
+
+# Builds a panel's embed for a guild, None once there is nothing left to show
+Renderer = Callable[[int], Optional[disnake.Embed]]
+
+# Guild ID and panel kind
+PanelKey = Tuple[int, str]
+
+
+class Panel:
+    """A message kept up to date"""
+
+    __slots__ = ("message", "render", "content", "expires_at")
+
+    def __init__(self, message: disnake.Message, render: Renderer, expires_at: float):
+        self.message = message
+        self.render = render
+        self.content: Optional[dict] = None
+        self.expires_at = expires_at
+
+
+class LivePanels:
+    """
+    Messages that edit themselves in place, driven by one shared ticker
+
+    Each guild has at most one panel per kind. A single task refreshes
+    every panel once per tick, skipping edits whose content did not change.
+    Edits are capped at `edit_rate` per second across all panels. The tick
+    interval grows while panels need more edits than that budget, and
+    shrinks back to `interval` when there is headroom. Panels stop after
+    `max_age` seconds or when their renderer returns None.
+    """
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        interval: float = 5.0,
+        max_interval: float = 30.0,
+        edit_rate: float = 10.0,
+        max_age: float = 1800.0,
+    ):
+        self.metrics = metrics
+        self.base_interval = interval
+        self.interval = interval
+        self.max_interval = max_interval
+        self.edit_rate = edit_rate
+        self.max_age = max_age
+
+        self._panels: "OrderedDict[PanelKey, Panel]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, metrics: Metrics, config: Dict) -> "LivePanels":
+        """
+        Build panels from the "live_panels" section of the config file
+
+        Args:
+            metrics: Where to count edits
+            config: The live panels configuration section
+
+        Returns:
+            A configured LivePanels
+        """
+        return cls(
+            metrics,
+            interval=config.get("interval", 5.0),
+            max_interval=config.get("max_interval", 30.0),
+            edit_rate=config.get("edit_rate", 10.0),
+            max_age=config.get("max_age", 1800.0),
+        )
+
+    def add(
+        self,
+        guild_id: int,
+        kind: str,
+        message: disnake.Message,
+        render: Renderer,
+        embed: Optional[disnake.Embed] = None,
+    ) -> None:
+        """
+        Keep a message up to date, replacing the guild's previous panel of that kind
+
+        Args:
+            guild_id: The guild the panel shows
+            kind: The panel kind, such as "nowplaying"
+            message: The message to edit
+            render: Builds the embed for the guild
+            embed: The embed the message was sent with
+        """
+        key = (guild_id, kind)
+        panel = Panel(message, render, time.monotonic() + self.max_age)
+        if embed is not None:
+            panel.content = embed.to_dict()
+
+        self._panels.pop(key, None)
+        self._panels[key] = panel
+        self.metrics.set("live_panels", len(self._panels))
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._tick_loop())
+
+    def remove(self, guild_id: int) -> None:
+        """
+        Stop every panel of a guild
+
+        Args:
+            guild_id: The guild
+        """
+        for key in [key for key in self._panels if key[0] == guild_id]:
+            del self._panels[key]
+        self.metrics.set("live_panels", len(self._panels))
+
+    async def _tick_loop(self) -> None:
+        try:
+            while self._panels:
+                await asyncio.sleep(self.interval)
+                await self.tick()
+        finally:
+            self._task = None
+
+    async def tick(self) -> None:
+        """Refresh the panels whose content changed, within the edit budget"""
+        now = time.monotonic()
+        budget = max(1, int(self.edit_rate * self.interval))
+        edits = []
+        changed = 0
+
+        for key, panel in list(self._panels.items()):
+            embed = None
+            if panel.expires_at > now:
+                try:
+                    embed = panel.render(key[0])
+                except Exception:  # pylint: disable=W0718
+                    logger.error(f"Failed to render the {key[1]} panel of guild {key[0]}", exc_info=True)
+
+            if embed is None:
+                # The panel ended, leave its last state on the message
+                del self._panels[key]
+                continue
+
+            content = embed.to_dict()
+            if content == panel.content:
+                self.metrics.increment("live_panel_unchanged")
+                continue
+
+            changed += 1
+            if len(edits) < budget:
+                edits.append(self._edit(key, panel, embed, content))
+
+        if edits:
+            await asyncio.gather(*edits)
+        self._adapt(changed, budget)
+        self.metrics.set("live_panels", len(self._panels))
+
+    async def _edit(self, key: PanelKey, panel: Panel, embed: disnake.Embed, content: dict) -> None:
+        try:
+            await panel.message.edit(embed=embed)
+            panel.content = content
+            self.metrics.increment("live_panel_edits")
+        except disnake.NotFound:
+            # The message was deleted
+            if self._panels.get(key) is panel:
+                del self._panels[key]
+        except disnake.HTTPException as e:
+            self.metrics.increment("live_panel_failures")
+            logger.debug(f"Failed to edit the {key[1]} panel of guild {key[0]}: {e}")
+            return
+
+        # Panels that were just edited go last, so every panel gets its turn
+        if self._panels.get(key) is panel:
+            self._panels.move_to_end(key)
+
+    def _adapt(self, changed: int, budget: int) -> None:
+        if changed > budget:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+        elif changed < budget / 2:
+            self.interval = max(self.base_interval, self.interval / 1.5)
+        self.metrics.set("live_panel_interval", self.interval)
+
+    def close(self) -> None:
+        """Stop every panel"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._panels.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get panel state
+
+        Returns:
+            Dictionary with the panel count and the current interval
+        """
+        return {"panels": len(self._panels), "interval": self.interval}
@@ -0,0 +1,252 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import disnake  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.metrics import Metrics  # pylint: disable=E0401
+from ext.rate_limit import TokenBucket  # pylint: disable=E0401
+
+logger = get_logger("MessageScheduler")
+
+# Rate limit buckets kept before idle ones are dropped
+MAX_IDLE_BUCKETS = 1024
+
+
+class Outgoing:
+    """A message waiting to be sent"""
+
+    __slots__ = ("content", "embed", "coalesce", "edit", "queued_at")
+
+    def __init__(
+        self,
+        content: Optional[str],
+        embed: Optional[disnake.Embed],
+        coalesce: Optional[str],
+        edit: bool,
+    ):
+        self.content = content
+        self.embed = embed
+        self.coalesce = coalesce
+        self.edit = edit
+        self.queued_at = time.monotonic()
+
+
+class MessageScheduler:
+    """
+    Sends bot-initiated messages through per-channel queues
+
+    Every channel has its own queue and worker, so a busy channel never
+    delays the others. A message with a coalesce key replaces the pending
+    message with the same key instead of queueing behind it. An editable
+    message, such as Now Playing, edits the previous one with the same key
+    while that is still the latest message in the channel. Sends and edits
+    take tokens from per-channel buckets for their route and from one
+    global bucket, staying below Discord's rate limits.
+    """
+
+    def __init__(
+        self,
+        metrics: Metrics,
+        max_pending: int = 20,
+        channel_rate: int = 5,
+        channel_per: float = 5.0,
+        global_rate: int = 40,
+        global_per: float = 1.0,
+    ):
+        self.metrics = metrics
+        self.max_pending = max_pending
+        self.channel_rate = channel_rate
+        self.channel_per = channel_per
+        self.global_bucket = TokenBucket(global_rate, global_per)
+
+        self._queues: Dict[int, Deque[Outgoing]] = {}
+        self._channels: Dict[int, disnake.abc.Messageable] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        # (route, channel ID) -> bucket, routes are "send" and "edit"
+        self._buckets: Dict[Tuple[str, int], TokenBucket] = {}
+        # (channel ID, coalesce key) -> last message sent with that key
+        self._last: Dict[Tuple[int, str], disnake.Message] = {}
+        self._depth = 0
+
+    @classmethod
+    def from_config(cls, metrics: Metrics, config: Dict) -> "MessageScheduler":
+        """
+        Build a scheduler from the "outbound" section of the config file
+
+        Args:
+            metrics: Where to report queue depths and outcomes
+            config: The outbound configuration section
+
+        Returns:
+            A configured MessageScheduler
+        """
+        return cls(
+            metrics,
+            max_pending=config.get("max_pending", 20),
+            channel_rate=config.get("channel_rate", 5),
+            channel_per=config.get("channel_per", 5.0),
+            global_rate=config.get("global_rate", 40),
+            global_per=config.get("global_per", 1.0),
+        )
+
+    def send(
+        self,
+        channel: disnake.abc.Messageable,
+        content: Optional[str] = None,
+        embed: Optional[disnake.Embed] = None,
+        coalesce: Optional[str] = None,
+        edit: bool = False,
+    ) -> None:
+        """
+        Queue a message
+
+        Args:
+            channel: Where to send it
+            content: The message text
+            embed: The message embed
+            coalesce: Key of messages this one supersedes
+            edit: Edit the last message with the same key when it is still the latest
+        """
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = deque()
+        self._channels[channel.id] = channel
+
+        message = Outgoing(content, embed, coalesce, edit)
+        if coalesce:
+            for index, pending in enumerate(queue):
+                if pending.coalesce == coalesce:
+                    # Keep the place in line, the older content is outdated
+                    message.queued_at = pending.queued_at
+                    queue[index] = message
+                    self.metrics.increment("outbound_coalesced")
+                    return
+
+        if len(queue) >= self.max_pending:
+            self.metrics.increment("outbound_dropped")
+            if len(queue) == 1 and channel.id in self._workers:
+                # The worker may be waiting to send the head, keep it
+                return
+            # Never the head a worker may be waiting on
+            del queue[1 if channel.id in self._workers else 0]
+            self._depth -= 1
+
+        queue.append(message)
+        self._depth += 1
+        self._report_depth()
+
+        if channel.id not in self._workers:
+            self._workers[channel.id] = asyncio.ensure_future(self._drain(channel.id))
+
+    def _bucket(self, route: str, channel_id: int) -> TokenBucket:
+        bucket = self._buckets.get((route, channel_id))
+        if bucket is None:
+            if len(self._buckets) >= MAX_IDLE_BUCKETS:
+                self._prune_buckets()
+            bucket = self._buckets[(route, channel_id)] = TokenBucket(
+                self.channel_rate, self.channel_per
+            )
+        return bucket
+
+    async def _drain(self, channel_id: int) -> None:
+        queue = self._queues[channel_id]
+        try:
+            while queue:
+                paid = "edit" if self._edit_target(channel_id, queue[0]) else "send"
+                await self._bucket(paid, channel_id).acquire()
+                await self.global_bucket.acquire()
+
+                # Coalescing may have replaced the head while waiting, and the
+                # edit target may have changed, so look it up for what is sent
+                message = queue.popleft()
+                self._depth -= 1
+                self._report_depth()
+                target = self._edit_target(channel_id, message)
+                if ("edit" if target else "send") != paid:
+                    await self._bucket("edit" if target else "send", channel_id).acquire()
+                    target = self._edit_target(channel_id, message)
+
+                self.metrics.observe(
+                    "outbound_wait_ms", (time.monotonic() - message.queued_at) * 1000
+                )
+                await self._deliver(channel_id, message, target)
+        finally:
+            self._workers.pop(channel_id, None)
+            if self._queues.get(channel_id) is queue:
+                del self._queues[channel_id]
+                self._depth -= len(queue)
+                self._report_depth()
+
+    def _prune_buckets(self) -> None:
+        # A full bucket behaves exactly like a new one
+        for key in [key for key, bucket in self._buckets.items() if bucket.is_full()]:
+            del self._buckets[key]
+
+    def _edit_target(self, channel_id: int, message: Outgoing) -> Optional[disnake.Message]:
+        if not (message.edit and message.coalesce):
+            return None
+
+        last = self._last.get((channel_id, message.coalesce))
+        channel = self._channels.get(channel_id)
+        if last is None or getattr(channel, "last_message_id", None) != last.id:
+            return None
+        return last
+
+    async def _deliver(
+        self, channel_id: int, message: Outgoing, target: Optional[disnake.Message]
+    ) -> None:
+        channel = self._channels[channel_id]
+        try:
+            if target is not None:
+                try:
+                    await target.edit(content=message.content, embed=message.embed)
+                    self.metrics.increment("outbound_edited")
+                    return
+                except disnake.NotFound:
+                    pass
+
+            sent = await channel.send(content=message.content, embed=message.embed)
+            self.metrics.increment("outbound_sent")
+            if message.coalesce:
+                self._last[(channel_id, message.coalesce)] = sent
+        except disnake.HTTPException as e:
+            self.metrics.increment("outbound_failed")
+            logger.warning(f"Failed to send a message to channel {channel_id}: {e}")
+        except Exception:  # pylint: disable=W0718
+            self.metrics.increment("outbound_failed")
+            logger.error(f"Failed to send a message to channel {channel_id}", exc_info=True)
+
+    def _report_depth(self) -> None:
+        self.metrics.set("outbound_depth", self._depth)
+        self.metrics.set("outbound_channels", len(self._queues))
+
+    def forget(self, channel_id: int) -> None:
+        """
+        Drop the messages kept for editing in a channel
+
+        Args:
+            channel_id: The channel
+        """
+        for key in [key for key in self._last if key[0] == channel_id]:
+            del self._last[key]
+
+    def close(self) -> None:
+        """Stop sending, dropping what is still queued"""
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
+        self._last.clear()
+        self._depth = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get queue sizes
+
+        Returns:
+            Dictionary with the number of queued messages and busy channels
+        """
+        return {"depth": self._depth, "channels": len(self._queues)}
@@ -0,0 +1,119 @@
+from collections import deque
+from typing import Deque, Dict, Union
+
+Number = Union[int, float]
+
+
+class Summary:
+    """
+    Rolling summary of observed values
+
+    Count, total and maximum cover every observation. Percentiles are taken
+    over the most recent `window` observations.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: Number) -> None:
+        """
+        Record one observation
+
+        Args:
+            value: The observed value
+        """
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Get a percentile of the recent observations
+
+        Args:
+            fraction: The percentile as a fraction, 0.95 for p95
+
+        Returns:
+            The value, 0 when nothing was observed
+        """
+        if not self._samples:
+            return 0.0
+
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get the summary values
+
+        Returns:
+            Dictionary with count, mean, p50, p95 and max
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """
+    Named counters, gauges and summaries shared by the bot components
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Number] = {}
+        self.summaries: Dict[str, Summary] = {}
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Increase a counter
+
+        Args:
+            name: The counter name
+            amount: How much to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name: str, value: Number) -> None:
+        """
+        Set a gauge to its current value
+
+        Args:
+            name: The gauge name
+            value: The current value
+        """
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: Number) -> None:
+        """
+        Add an observation to a summary
+
+        Args:
+            name: The summary name
+            value: The observed value
+        """
+        summary = self.summaries.get(name)
+        if summary is None:
+            summary = self.summaries[name] = Summary()
+        summary.observe(value)
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get every metric
+
+        Returns:
+            Dictionary of counters, gauges and summary snapshots by name
+        """
+        return {
+            **self.counters,
+            **self.gauges,
+            **{name: summary.snapshot() for name, summary in self.summaries.items()},
+        }
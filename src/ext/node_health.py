@@ -0,0 +1,277 @@
+import asyncio
+from typing import Dict, List, Set
+
+import lavalink  # pylint: disable=E0401
+from lavalink import Node  # pylint: disable=E0401
+from lavalink.errors import ClientError, RequestError  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.node_pool import NodePool, PoolNodeManager  # pylint: disable=E0401
+
+logger = get_logger("NodeHealthMonitor")
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+DEAD = "dead"
+
+
+class NodeHealthMonitor:
+    """
+    Watches Lavalink nodes and moves players off dead or degraded ones
+
+    Players are migrated one at a time at a bounded rate, and each one is
+    placed on the least loaded healthy node at the moment it moves, so a
+    failover spreads across the surviving nodes instead of landing on one.
+    Lavalink.py's change_node restores the current track, position, volume,
+    pause state and filters; the queue lives on the player and moves with it.
+    """
+
+    def __init__(
+        self,
+        client: lavalink.Client,
+        pool: NodePool,
+        interval: float = 10.0,
+        degraded_checks: int = 3,
+        max_frame_loss: float = 0.05,
+        max_system_load: float = 0.95,
+        max_rest_latency: float = 2000,
+        migrations_per_second: float = 5.0,
+    ):
+        self.client = client
+        self.pool = pool
+        self.interval = interval
+        self.degraded_checks = degraded_checks
+        self.max_frame_loss = max_frame_loss
+        self.max_system_load = max_system_load
+        self.max_rest_latency = max_rest_latency
+        self.migration_delay = 1 / migrations_per_second
+
+        self.status: Dict[str, str] = {}
+        self._strikes: Dict[str, int] = {}
+        self._pending: "asyncio.Queue[int]" = asyncio.Queue()
+        self._queued: Set[int] = set()
+        self._node_ready = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+        self.migrated = 0
+        self.failed_migrations = 0
+
+    @classmethod
+    def from_config(cls, client: lavalink.Client, pool: NodePool, config: Dict) -> "NodeHealthMonitor":
+        """
+        Build a monitor from the "failover" section of the config file
+
+        Args:
+            client: The Lavalink client owning the nodes
+            pool: The node pool used to pick target nodes
+            config: The failover configuration section
+
+        Returns:
+            A configured NodeHealthMonitor
+        """
+        return cls(
+            client,
+            pool,
+            interval=config.get("interval", 10.0),
+            degraded_checks=config.get("degraded_checks", 3),
+            max_frame_loss=config.get("max_frame_loss", 0.05),
+            max_system_load=config.get("max_system_load", 0.95),
+            max_rest_latency=config.get("max_rest_latency", 2000),
+            migrations_per_second=config.get("migrations_per_second", 5.0),
+        )
+
+    def start(self) -> None:
+        """Attach to the node manager and start the health and migration loops"""
+        if isinstance(self.client.node_manager, PoolNodeManager):
+            self.client.node_manager.monitor = self
+
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._check_loop()), loop.create_task(self._migrate_loop())]
+        logger.info("Node health monitor started")
+
+    def stop(self) -> None:
+        """Detach from the node manager and cancel the loops"""
+        if isinstance(self.client.node_manager, PoolNodeManager):
+            self.client.node_manager.monitor = None
+
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    @property
+    def unhealthy_nodes(self) -> List[Node]:
+        """Nodes players must be moved away from"""
+        return [node for node in self.client.nodes if self.status.get(node.name, HEALTHY) != HEALTHY]
+
+    async def node_down(self, node: Node) -> None:
+        """
+        Handle a node losing its websocket connection
+
+        Args:
+            node: The node that went down
+        """
+        self.status[node.name] = DEAD
+        logger.warning(f"Node {node.name} is down, migrating {len(node.players)} players")
+
+        for player in node.players:
+            try:
+                await player.node_unavailable()
+            except Exception:  # pylint: disable=W0718
+                logger.error(f"Failed to freeze player {player.guild_id}", exc_info=True)
+            self._enqueue(player.guild_id)
+
+    async def node_up(self, node: Node) -> None:
+        """
+        Handle a node (re)connecting
+
+        Args:
+            node: The node that became ready
+        """
+        self.status[node.name] = HEALTHY
+        self._strikes[node.name] = 0
+        self._node_ready.set()
+        logger.info(f"Node {node.name} is ready")
+
+        # Players left behind while no node was available can move now
+        for player in node.players:
+            if player.guild_id not in self._queued:
+                self._enqueue(player.guild_id)
+
+    def _enqueue(self, guild_id: int) -> None:
+        if guild_id not in self._queued:
+            self._queued.add(guild_id)
+            self._pending.put_nowait(guild_id)
+
+    def _is_degraded(self, node: Node, latency: float) -> bool:
+        stats = node.stats
+        if stats.is_fake:
+            return latency < 0 or latency > self.max_rest_latency
+
+        frames = stats.frames_sent + stats.frames_nulled + stats.frames_deficit
+        frame_loss = (stats.frames_nulled + stats.frames_deficit) / frames if frames else 0
+
+        return (
+            frame_loss > self.max_frame_loss
+            or stats.system_load > self.max_system_load
+            or latency < 0
+            or latency > self.max_rest_latency
+        )
+
+    async def check(self) -> None:
+        """Classify every node and queue players of unhealthy nodes for migration"""
+        for node in self.client.nodes:
+            if not node.available:
+                if self.status.get(node.name) != DEAD:
+                    await self.node_down(node)
+                continue
+
+            try:
+                latency = await asyncio.wait_for(
+                    node.get_rest_latency(), self.max_rest_latency / 1000
+                )
+            except asyncio.TimeoutError:
+                # A hanging node must not stall the checks of the others
+                latency = -1
+            if self._is_degraded(node, latency):
+                self._strikes[node.name] = self._strikes.get(node.name, 0) + 1
+            else:
+                self._strikes[node.name] = 0
+
+            previous = self.status.get(node.name, HEALTHY)
+            if self._strikes[node.name] >= self.degraded_checks:
+                self.status[node.name] = DEGRADED
+                if previous != DEGRADED:
+                    logger.warning(
+                        f"Node {node.name} is degraded (latency {latency:.0f} ms, "
+                        f"load {node.stats.system_load:.2f}), migrating {len(node.players)} players"
+                    )
+                for player in node.players:
+                    self._enqueue(player.guild_id)
+            elif self._strikes[node.name] == 0 and previous != HEALTHY:
+                self.status[node.name] = HEALTHY
+                self._node_ready.set()
+                logger.info(f"Node {node.name} recovered")
+
+    async def _check_loop(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:  # pylint: disable=W0718
+                logger.error("Node health check failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    async def _migrate_loop(self) -> None:
+        while True:
+            guild_id = await self._pending.get()
+            self._queued.discard(guild_id)
+
+            try:
+                moved = await self.migrate(guild_id)
+            except Exception:  # pylint: disable=W0718
+                logger.error(f"Migration of guild {guild_id} failed", exc_info=True)
+                moved = True
+
+            if not moved:
+                # Nothing to move to right now, wait for a node to come back
+                self._enqueue(guild_id)
+                self._node_ready.clear()
+                try:
+                    await asyncio.wait_for(self._node_ready.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await asyncio.sleep(self.migration_delay)
+
+    async def migrate(self, guild_id: int) -> bool:
+        """
+        Move one player to the best healthy node
+
+        Args:
+            guild_id: The guild whose player should move
+
+        Returns:
+            False if the player still needs a new node, True otherwise
+        """
+        player = self.client.player_manager.get(guild_id)
+        if player is None:
+            return True
+
+        old_node = player.node
+        unhealthy = self.unhealthy_nodes
+        if old_node not in unhealthy and old_node.available:
+            # The node recovered or already accepted the player again
+            if player._internal_pause:
+                await player.change_node(old_node)
+            return True
+
+        region = old_node.region if old_node else None
+        target = self.pool.select_node(self.client, region, exclude=unhealthy)
+        if target is None:
+            logger.warning(f"No healthy node available for guild {guild_id}")
+            return False
+
+        try:
+            await player.change_node(target)
+        except (ClientError, RequestError):
+            self.failed_migrations += 1
+            logger.error(f"Failed to move guild {guild_id} from {old_node.name} to {target.name}", exc_info=True)
+            return False
+
+        self.migrated += 1
+        logger.info(f"Moved guild {guild_id} from node {old_node.name} to {target.name}")
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get node states and migration counters
+
+        Returns:
+            Dictionary with node statuses, pending, migrated and failed counts
+        """
+        return {
+            "nodes": dict(self.status),
+            "pending": self._pending.qsize(),
+            "migrated": self.migrated,
+            "failed": self.failed_migrations,
+        }
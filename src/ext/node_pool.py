@@ -0,0 +1,208 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import lavalink  # pylint: disable=E0401
+from lavalink import Node, NodeManager  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+
+logger = get_logger("NodePool")
+
+# Used when the config file does not list any node
+DEFAULT_NODE = {
+    "name": "default-node",
+    "host": "localhost",
+    "port": 8080,
+    "password": "youshallnotpass",
+    "region": "us",
+}
+
+# Discord RTC regions handled by each node region tag
+DEFAULT_REGIONS = {
+    "us": ("us-central", "us-east", "us-south", "us-west", "brazil"),
+    "eu": ("rotterdam", "russia", "europe"),
+    "asia": ("hongkong", "india", "japan", "singapore", "southafrica", "sydney"),
+}
+
+
+class PoolNodeManager(NodeManager):
+    """
+    Node manager that hands node failures to a health monitor
+
+    Lavalink.py moves every player of a dead node to a single node at once.
+    When a monitor is attached, it is told about the failure instead and
+    migrates the players itself, spread out and throttled.
+    """
+
+    __slots__ = ("monitor",)
+
+    def __init__(self, client, regions, connect_back: bool):
+        super().__init__(client, regions, connect_back)
+        self.monitor = None
+
+    async def _handle_node_disconnect(self, node: Node):
+        if self.monitor is None:
+            await super()._handle_node_disconnect(node)
+            return
+
+        await self.monitor.node_down(node)
+
+    async def _handle_node_ready(self, node: Node):
+        if self.monitor is None:
+            await super()._handle_node_ready(node)
+            return
+
+        await self.monitor.node_up(node)
+
+
+class NodePool:
+    """
+    Config-driven set of Lavalink nodes with load- and region-aware placement
+    """
+
+    def __init__(
+        self,
+        nodes: List[Dict[str, Any]],
+        regions: Optional[Dict[str, Tuple[str, ...]]] = None,
+        default_region: Optional[str] = None,
+    ):
+        self.nodes = nodes or [DEFAULT_NODE]
+        self.regions = regions or DEFAULT_REGIONS
+        self.default_region = default_region
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "NodePool":
+        """
+        Build a pool from the "lavalink" section of the config file
+
+        Args:
+            config: The lavalink configuration section
+
+        Returns:
+            A configured NodePool
+        """
+        regions = config.get("regions")
+        if regions:
+            regions = {key: tuple(value) for key, value in regions.items()}
+
+        return cls(
+            config.get("nodes", []),
+            regions=regions,
+            default_region=config.get("default_region"),
+        )
+
+    def create_client(
+        self, user_id: int, session_ids: Optional[Dict[str, str]] = None, **kwargs
+    ) -> lavalink.Client:
+        """
+        Create a Lavalink client connected to every configured node
+
+        Args:
+            user_id: The bot user ID
+            session_ids: Lavalink session to resume, by node name
+            **kwargs: Extra arguments for lavalink.Client
+
+        Returns:
+            The Lavalink client
+        """
+        client = lavalink.Client(user_id, regions=self.regions, **kwargs)
+        client.node_manager = PoolNodeManager(client, self.regions, False)
+        session_ids = session_ids or {}
+
+        for node in self.nodes:
+            region = node.get("region", "us")
+            name = node.get("name") or f"{region}-{node['host']}:{node['port']}"
+            client.add_node(
+                host=node["host"],
+                port=node["port"],
+                password=node["password"],
+                region=region,
+                name=name,
+                ssl=node.get("ssl", False),
+                session_id=session_ids.get(name),
+                tags={"max_players": node.get("max_players", 0)},
+            )
+            logger.info(f"Added node {name} ({node['host']}:{node['port']}, region {region})")
+
+        return client
+
+    def region_for(self, rtc_region: Optional[str]) -> Optional[str]:
+        """
+        Map a Discord voice channel region to a node region tag
+
+        Args:
+            rtc_region: The channel's rtc_region, None for automatic
+
+        Returns:
+            The node region tag, or the default region when unknown
+        """
+        if rtc_region:
+            rtc_region = str(rtc_region).replace("vip-", "")
+            for key, rtc_regions in self.regions.items():
+                if rtc_region.startswith(rtc_regions):
+                    return key
+
+        return self.default_region
+
+    @staticmethod
+    def load(node: Node) -> float:
+        """
+        Score how loaded a node is, lower is better
+
+        The server-side penalty covers CPU and frame stats. Player counts come
+        from the local player manager, since node stats only refresh once a
+        minute and would let a burst of new players pile onto one node.
+
+        Args:
+            node: The node to score
+
+        Returns:
+            The load score
+        """
+        penalty = node.stats.penalty
+        players = max(node.stats.playing_players, len(node.players))
+        return penalty.total - penalty.player_penalty + players
+
+    @staticmethod
+    def has_capacity(node: Node) -> bool:
+        """
+        Check the node against its configured player limit
+
+        Args:
+            node: The node to check
+
+        Returns:
+            True when the node can take another player
+        """
+        max_players = node.tags.get("max_players", 0)
+        return not max_players or len(node.players) < max_players
+
+    def select_node(
+        self,
+        client: lavalink.Client,
+        region: Optional[str] = None,
+        exclude: Optional[List[Node]] = None,
+    ) -> Optional[Node]:
+        """
+        Pick the least loaded available node, preferring the given region
+
+        Args:
+            client: The Lavalink client owning the nodes
+            region: Node region tag to prefer
+            exclude: Nodes that must not be picked
+
+        Returns:
+            The chosen node, or None if no node is available
+        """
+        exclude = exclude or []
+        candidates = [
+            node
+            for node in client.node_manager.available_nodes
+            if node not in exclude and self.has_capacity(node)
+        ]
+
+        regional = [node for node in candidates if node.region == region]
+        nodes = regional or candidates
+        if not nodes:
+            return None
+
+        return min(nodes, key=self.load)
@@ -0,0 +1,278 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from lavalink import LoadResult, LoadType  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.sqlite_store import SqliteStore  # pylint: disable=E0401
+from ext.track_cache import CacheKey, TrackCache  # pylint: disable=E0401
+from ext.utils import Utils  # pylint: disable=E0401
+
+logger = get_logger("PersistentTrackCache")
+
+# Separates the parts of a cache key in the database
+KEY_SEPARATOR = "\x1f"
+
+# How many writes happen between two size checks
+EVICTION_INTERVAL = 64
+
+# How many hit entries are buffered before they are written on their own
+HIT_BATCH = 64
+
+UPDATE_HITS = (
+    "UPDATE track_cache SET hits = hits + ?, last_access = MAX(last_access, ?) WHERE key = ?"
+)
+
+
+def serialize_result(result: LoadResult) -> str:
+    """
+    Encode a load result as JSON, keeping the encoded track strings
+
+    Args:
+        result: The result to encode
+
+    Returns:
+        JSON payload understood by deserialize_result
+    """
+    return json.dumps(
+        {
+            "loadType": result.load_type.value,
+            "playlistInfo": {
+                "name": result.playlist_info.name,
+                "selectedTrack": result.playlist_info.selected_track,
+            },
+            "pluginInfo": result.plugin_info,
+            "tracks": [track.raw for track in result.tracks],
+        },
+        separators=(",", ":"),
+    )
+
+
+def deserialize_result(payload: str) -> LoadResult:
+    """
+    Rebuild a load result from serialize_result output
+
+    Args:
+        payload: The JSON payload
+
+    Returns:
+        The decoded LoadResult
+    """
+    data = json.loads(payload)
+    load_type = data["loadType"]
+    tracks = data["tracks"]
+
+    if load_type == LoadType.TRACK.value:
+        body: Any = tracks[0]
+    elif load_type == LoadType.PLAYLIST.value:
+        body = {
+            "info": data["playlistInfo"],
+            "pluginInfo": data["pluginInfo"],
+            "tracks": tracks,
+        }
+    else:
+        body = tracks
+
+    return LoadResult.from_dict({"loadType": load_type, "data": body})
+
+
+class PersistentTrackCache(SqliteStore):
+    """
+    Disk-backed second tier for the track resolution cache
+
+    Lookups only read. Hit counts and access times are buffered in memory
+    and written with the next stored result, or once HIT_BATCH entries
+    are pending, so a lookup never takes the database write lock.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS track_cache (
+        key TEXT PRIMARY KEY,
+        load_type TEXT NOT NULL,
+        track_count INTEGER NOT NULL,
+        payload TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS track_cache_last_access ON track_cache (last_access);
+    CREATE INDEX IF NOT EXISTS track_cache_hits ON track_cache (hits);
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 64 * 1024 * 1024, warm_entries: int = 512):
+        super().__init__(path)
+        self.max_bytes = max_bytes
+        self.warm_entries = warm_entries
+        self._writes = 0
+        # Encoded key -> (hits, last access) not written yet
+        self._hits: Dict[str, Tuple[int, float]] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "PersistentTrackCache":
+        """
+        Build a cache from the "persistent_cache" section of the config file
+
+        Args:
+            config: The persistent cache configuration section
+
+        Returns:
+            A configured PersistentTrackCache
+        """
+        return cls(
+            Utils.resolve_path(config.get("path", "data/track_cache.db")),
+            max_bytes=config.get("max_bytes", 64 * 1024 * 1024),
+            warm_entries=config.get("warm_entries", 512),
+        )
+
+    @staticmethod
+    def _encode_key(key: CacheKey) -> str:
+        return KEY_SEPARATOR.join(key)
+
+    @staticmethod
+    def _decode_key(key: str) -> CacheKey:
+        source, prefix, query = key.split(KEY_SEPARATOR, 2)
+        return source, prefix, query
+
+    async def get(self, key: CacheKey) -> Optional[Tuple[LoadResult, float]]:
+        """
+        Look up a stored result
+
+        Args:
+            key: Key built by TrackCache.make_key
+
+        Returns:
+            The result and its remaining TTL in seconds, or None on a miss
+        """
+        encoded = self._encode_key(key)
+        now = time.time()
+        row = await self.run(self._get, encoded, now)
+        if row is None:
+            return None
+
+        hits, _ = self._hits.get(encoded, (0, now))
+        self._hits[encoded] = (hits + 1, now)
+        if len(self._hits) >= HIT_BATCH:
+            self.submit(self._write_hits, self._take_hits())
+
+        payload, expires_at = row
+        return deserialize_result(payload), expires_at - time.time()
+
+    @staticmethod
+    def _get(conn: sqlite3.Connection, key: str, now: float):
+        return conn.execute(
+            "SELECT payload, expires_at FROM track_cache WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+
+    def _take_hits(self) -> List[Tuple[int, float, str]]:
+        hits, self._hits = self._hits, {}
+        return [(count, last_access, key) for key, (count, last_access) in hits.items()]
+
+    @staticmethod
+    def _write_hits(conn: sqlite3.Connection, hits: List[Tuple[int, float, str]]) -> None:
+        conn.executemany(UPDATE_HITS, hits)
+        conn.commit()
+
+    def put(self, key: CacheKey, result: LoadResult, ttl: float) -> None:
+        """
+        Store a result in the background
+
+        Args:
+            key: Key built by TrackCache.make_key
+            result: The result returned by Lavalink
+            ttl: How long the result stays valid, in seconds
+        """
+        if ttl <= 0 or not result.tracks:
+            return
+
+        self.submit(
+            self._put,
+            self._encode_key(key),
+            result.load_type.value,
+            len(result.tracks),
+            serialize_result(result),
+            time.time(),
+            ttl,
+            self._take_hits(),
+        )
+
+    def _put(self, conn: sqlite3.Connection, key, load_type, track_count, payload, now, ttl, hits):
+        # Buffered hits go in the same transaction as the new row
+        if hits:
+            conn.executemany(UPDATE_HITS, hits)
+        conn.execute(
+            "INSERT INTO track_cache "
+            "(key, load_type, track_count, payload, size, created_at, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET load_type = excluded.load_type, "
+            "track_count = excluded.track_count, payload = excluded.payload, "
+            "size = excluded.size, created_at = excluded.created_at, "
+            "expires_at = excluded.expires_at, last_access = excluded.last_access",
+            (key, load_type, track_count, payload, len(payload), now, now + ttl, now),
+        )
+        conn.commit()
+
+        self._writes += 1
+        if self._writes % EVICTION_INTERVAL == 0:
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """Drop expired rows, then least recently used rows until under 90% of max_bytes"""
+        removed = conn.execute("DELETE FROM track_cache WHERE expires_at <= ?", (now,)).rowcount
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM track_cache").fetchone()[0]
+        if total > self.max_bytes:
+            target = total - int(self.max_bytes * 0.9)
+            victims = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM track_cache ORDER BY last_access"
+            ):
+                victims.append((key,))
+                target -= size
+                if target <= 0:
+                    break
+
+            conn.executemany("DELETE FROM track_cache WHERE key = ?", victims)
+            removed += len(victims)
+
+        conn.commit()
+        if removed:
+            logger.debug(f"Evicted {removed} persistent cache entries")
+        return removed
+
+    async def warm(self, cache: TrackCache) -> int:
+        """
+        Load the most requested entries into the in-memory cache
+
+        Args:
+            cache: The in-memory cache to fill
+
+        Returns:
+            Number of entries loaded
+        """
+        now = time.time()
+        rows = await self.run(self._hottest, now)
+
+        for key, payload, expires_at in reversed(rows):
+            cache.put(self._decode_key(key), deserialize_result(payload), ttl=expires_at - now)
+
+        return len(rows)
+
+    def _hottest(self, conn: sqlite3.Connection, now: float):
+        self._evict(conn, now)
+        return conn.execute(
+            "SELECT key, payload, expires_at FROM track_cache "
+            "WHERE expires_at > ? ORDER BY hits DESC, last_access DESC LIMIT ?",
+            (now, self.warm_entries),
+        ).fetchall()
+
+    def close(self) -> None:
+        """Write the buffered hits, then close the database"""
+        if self._hits:
+            self.submit(self._write_hits, self._take_hits())
+        super().close()
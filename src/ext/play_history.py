@@ -0,0 +1,288 @@
+import asyncio
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from lavalink import AudioTrack  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.sqlite_store import SqliteStore  # pylint: disable=E0401
+from ext.utils import Utils  # pylint: disable=E0401
+
+logger = get_logger("PlayHistory")
+
+# How many flushes happen between two retention cleanups
+PRUNE_INTERVAL = 720
+
+
+class PlayRecord(NamedTuple):
+    """One played track"""
+
+    played_at: float
+    title: str
+    author: str
+    uri: Optional[str]
+    identifier: str
+    source: str
+    requester: int
+
+    @classmethod
+    def from_track(cls, track: AudioTrack) -> "PlayRecord":
+        """
+        Record a track that started playing now
+
+        Args:
+            track: The started track
+
+        Returns:
+            The record
+        """
+        return cls(
+            time.time(),
+            track.title,
+            track.author,
+            track.uri,
+            track.identifier,
+            track.source_name or "unknown",
+            track.requester or 0,
+        )
+
+
+class HistoryStore(SqliteStore):
+    """
+    Play history of every guild, on disk
+
+    Records are buffered and written in batches every `flush_interval`
+    seconds or once `batch_size` are pending. Plays older than
+    `retention_days` are deleted now and then.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS play_history (
+        id INTEGER PRIMARY KEY,
+        guild_id INTEGER NOT NULL,
+        played_at REAL NOT NULL,
+        title TEXT NOT NULL,
+        author TEXT NOT NULL,
+        uri TEXT,
+        identifier TEXT NOT NULL,
+        source TEXT NOT NULL,
+        requester INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS play_history_guild_time ON play_history (guild_id, played_at);
+    CREATE INDEX IF NOT EXISTS play_history_time ON play_history (played_at);
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = 5.0,
+        batch_size: int = 200,
+        retention_days: float = 90,
+    ):
+        super().__init__(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+
+        self._pending: List[Tuple] = []
+        self._task: Optional[asyncio.Task] = None
+        self._flushes = 0
+        self.written = 0
+
+    async def start(self) -> None:
+        """Open the database and start the flush loop"""
+        await self.open()
+        self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def add(self, guild_id: int, record: PlayRecord) -> None:
+        """
+        Buffer a record for the next write
+
+        Args:
+            guild_id: The guild the track played in
+            record: The play
+        """
+        self._pending.append((guild_id, *record))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records in the background"""
+        self._flushes += 1
+        prune = self._flushes % PRUNE_INTERVAL == 0
+        if not self._pending and not prune:
+            return
+
+        rows, self._pending = self._pending, []
+        self.submit(self._insert, rows, prune)
+
+    def _insert(self, conn: sqlite3.Connection, rows: List[Tuple], prune: bool) -> None:
+        conn.executemany(
+            "INSERT INTO play_history "
+            "(guild_id, played_at, title, author, uri, identifier, source, requester) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        if prune:
+            cutoff = time.time() - self.retention_days * 86400
+            removed = conn.execute(
+                "DELETE FROM play_history WHERE played_at < ?", (cutoff,)
+            ).rowcount
+            if removed:
+                logger.debug(f"Pruned {removed} history records")
+        conn.commit()
+        self.written += len(rows)
+
+    async def page(self, guild_id: int, offset: int, limit: int) -> Tuple[List[PlayRecord], int]:
+        """
+        Read a page of a guild's plays, most recent first
+
+        Args:
+            guild_id: The guild
+            offset: How many of the most recent plays to skip
+            limit: How many plays to return
+
+        Returns:
+            The records and the guild's total number of plays
+        """
+        # Buffered plays must be visible, the single writer thread runs them first
+        self.flush()
+        return await self.run(self._page, guild_id, offset, limit)
+
+    @staticmethod
+    def _page(conn: sqlite3.Connection, guild_id: int, offset: int, limit: int):
+        total = conn.execute(
+            "SELECT COUNT(*) FROM play_history WHERE guild_id = ?", (guild_id,)
+        ).fetchone()[0]
+        rows = conn.execute(
+            "SELECT played_at, title, author, uri, identifier, source, requester "
+            "FROM play_history WHERE guild_id = ? ORDER BY played_at DESC, id DESC LIMIT ? OFFSET ?",
+            (guild_id, limit, offset),
+        ).fetchall()
+        return [PlayRecord(*row) for row in rows], total
+
+    def close(self) -> None:
+        """Write what is still buffered and close the database"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._pending:
+            self.submit(self._insert, self._pending, False)
+            self._pending = []
+        super().close()
+
+
+class PlayHistory:
+    """
+    Recently played tracks per guild
+
+    The last `size` plays of each guild are kept in a ring buffer. When a
+    store is given, every play is also written behind to it, so older plays
+    can be paged through after restarts.
+    """
+
+    def __init__(self, size: int = 50, store: Optional[HistoryStore] = None):
+        self.size = size
+        self.store = store
+        self._recent: Dict[int, Deque[PlayRecord]] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "PlayHistory":
+        """
+        Build a history from the "history" section of the config file
+
+        Args:
+            config: The history configuration section
+
+        Returns:
+            A configured PlayHistory
+        """
+        store = None
+        if config.get("persistent", True):
+            store = HistoryStore(
+                Utils.resolve_path(config.get("path", "data/history.db")),
+                flush_interval=config.get("flush_interval", 5.0),
+                batch_size=config.get("batch_size", 200),
+                retention_days=config.get("retention_days", 90),
+            )
+        return cls(size=config.get("recent", 50), store=store)
+
+    def record(self, guild_id: int, track: AudioTrack) -> None:
+        """
+        Record a track that started playing
+
+        Args:
+            guild_id: The guild it plays in
+            track: The track
+        """
+        recent = self._recent.get(guild_id)
+        if recent is None:
+            recent = self._recent[guild_id] = deque(maxlen=self.size)
+
+        record = PlayRecord.from_track(track)
+        recent.append(record)
+        if self.store:
+            self.store.add(guild_id, record)
+
+    def forget(self, guild_id: int) -> None:
+        """
+        Drop the plays of a guild kept in memory, stored plays are kept
+
+        Args:
+            guild_id: The guild
+        """
+        self._recent.pop(guild_id, None)
+
+    def recent(self, guild_id: int) -> List[PlayRecord]:
+        """
+        Get the plays kept in memory, most recent first
+
+        Args:
+            guild_id: The guild
+
+        Returns:
+            Up to size records
+        """
+        return list(reversed(self._recent.get(guild_id, ())))
+
+    async def page(
+        self, guild_id: int, page: int, per_page: int = 10
+    ) -> Tuple[List[PlayRecord], int]:
+        """
+        Get a page of plays, most recent first
+
+        Args:
+            guild_id: The guild
+            page: Zero-based page number
+            per_page: Plays per page
+
+        Returns:
+            The records and the total number of plays
+        """
+        offset = page * per_page
+        if self.store:
+            return await self.store.page(guild_id, offset, per_page)
+
+        recent = self.recent(guild_id)
+        return recent[offset : offset + per_page], len(recent)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get history counters
+
+        Returns:
+            Dictionary with the number of guilds, plays in memory and plays written
+        """
+        return {
+            "guilds": len(self._recent),
+            "recent": sum(len(recent) for recent in self._recent.values()),
+            "written": self.store.written if self.store else 0,
+        }
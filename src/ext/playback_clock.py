@@ -0,0 +1,100 @@
+import time
+from typing import Dict
+
+
+class PlaybackClock:
+    """
+    Estimates the playback position between Lavalink player updates
+
+    The position is extrapolated from the last known position with a
+    monotonic clock, scaled by the timescale playback rate and frozen while
+    paused. Local changes (play, seek, pause, timescale) re-anchor it at
+    once instead of waiting for the node, and every player update from the
+    node re-anchors it to the reported position, correcting any drift.
+    """
+
+    def __init__(self):
+        self._position = 0.0
+        self._anchored_at = time.monotonic()
+        self.paused = False
+        self.rate = 1.0
+
+        self.updates = 0
+        self.last_drift = 0.0
+        self.max_drift = 0.0
+
+    @property
+    def position(self) -> float:
+        """Estimated position in milliseconds"""
+        if self.paused:
+            return self._position
+        return self._position + (time.monotonic() - self._anchored_at) * 1000 * self.rate
+
+    def _anchor(self, position: float) -> None:
+        self._position = max(0.0, position)
+        self._anchored_at = time.monotonic()
+
+    def start(self, position: int = 0) -> None:
+        """
+        Start a new track
+
+        Args:
+            position: Where the track starts, in milliseconds
+        """
+        self._anchor(position)
+
+    def seek(self, position: int) -> None:
+        """
+        Jump to a position
+
+        Args:
+            position: The new position, in milliseconds
+        """
+        self._anchor(position)
+
+    def set_paused(self, paused: bool) -> None:
+        """
+        Pause or resume the clock
+
+        Args:
+            paused: Whether playback is paused
+        """
+        self._anchor(self.position)
+        self.paused = paused
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change how fast the position advances
+
+        Args:
+            rate: Track milliseconds per real millisecond, speed times rate of the timescale filter
+        """
+        self._anchor(self.position)
+        self.rate = rate
+
+    def sync(self, position: int) -> float:
+        """
+        Re-anchor to a position reported by the node
+
+        Args:
+            position: The reported position, in milliseconds
+
+        Returns:
+            The drift between the estimate and the report, in milliseconds
+        """
+        drift = position - self.position
+        self._anchor(position)
+
+        self.updates += 1
+        self.last_drift = drift
+        self.max_drift = max(self.max_drift, abs(drift))
+        return drift
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get drift statistics
+
+        Returns:
+            Dictionary with the update count, last drift and largest drift in milliseconds
+        """
+        return {"updates": self.updates, "last_drift": self.last_drift, "max_drift": self.max_drift}
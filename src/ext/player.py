@@ -0,0 +1,109 @@
+from typing import Any, Callable, List
+
+import lavalink  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.playback_clock import PlaybackClock  # pylint: disable=E0401
+from ext.track_queue import TrackQueue  # pylint: disable=E0401
+
+logger = get_logger("MusicPlayer")
+
+# Called with the guild ID, the operation name and its arguments
+PlayerObserver = Callable[..., None]
+
+
+class MusicPlayer(lavalink.DefaultPlayer):
+    """
+    Lavalink player whose queue and playback state can be observed
+
+    Besides the TrackQueue mutations, observers receive:
+
+        now(track) when a track is sent to the node, None when stopped
+        bind(voice_channel_id, text_channel_id) when the voice channel changes
+        drop() when the player is created or destroyed
+
+    The playback position is estimated locally by a PlaybackClock, so it
+    stays accurate between player updates from the node.
+    """
+
+    # Shared by every player, registered once by the music cog
+    observers: List[PlayerObserver] = []
+
+    def __init__(self, guild_id: int, node: lavalink.Node):
+        super().__init__(guild_id, node)
+        self.queue = TrackQueue(self.notify)
+        self.clock = PlaybackClock()
+        # A new player starts from an empty state
+        self.notify("drop")
+
+    def notify(self, op: str, *args: Any) -> None:
+        """
+        Report a change of this player to every observer
+
+        Args:
+            op: The operation name
+            *args: The operation arguments
+        """
+        for observer in self.observers:
+            try:
+                observer(self.guild_id, op, *args)
+            except Exception:  # pylint: disable=W0718
+                logger.error(f"Player observer failed on {op} for guild {self.guild_id}", exc_info=True)
+
+    @property
+    def position(self) -> int:
+        if not self.is_playing:
+            return 0
+        return min(int(self.clock.position), self.current.duration)
+
+    async def play_track(self, track, *args, **kwargs):
+        response = await super().play_track(track, *args, **kwargs)
+        start_time = kwargs.get("start_time", args[0] if args else 0)
+        pause = kwargs.get("pause", args[4] if len(args) > 4 else None)
+        # Unset arguments are a sentinel object, not a number or a bool
+        self.clock.start(start_time if isinstance(start_time, int) else 0)
+        self.clock.set_paused(pause if isinstance(pause, bool) else self.paused)
+        self.notify("now", track)
+        return response
+
+    async def seek(self, position: int):
+        await super().seek(position)
+        self.clock.seek(position)
+
+    async def set_pause(self, pause: bool):
+        await super().set_pause(pause)
+        self.clock.set_paused(pause)
+
+    async def update_state(self, state: dict):
+        await super().update_state(state)
+        if self._internal_pause:
+            return
+        self.clock.sync(state.get("position", 0))
+
+    async def node_unavailable(self):
+        await super().node_unavailable()
+        # Playback halts until the player is moved to another node
+        self.clock.set_paused(True)
+
+    async def change_node(self, node: lavalink.Node):
+        await super().change_node(node)
+        self.clock.set_paused(self.paused)
+
+    async def _apply_filters(self):
+        await super()._apply_filters()
+        timescale = self.filters.get("timescale")
+        values = timescale.values if timescale else {}
+        self.clock.set_rate(values.get("speed", 1.0) * values.get("rate", 1.0))
+
+    async def stop(self):
+        await super().stop()
+        self.notify("now", None)
+
+    def cleanup(self):
+        super().cleanup()
+        self.notify("drop")
+
+    async def _voice_state_update(self, data):
+        await super()._voice_state_update(data)
+        if self.channel_id:
+            self.notify("bind", self.channel_id, self.fetch("channel"))
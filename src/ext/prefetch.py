@@ -0,0 +1,149 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict
+
+import lavalink  # pylint: disable=E0401
+from lavalink import LoadResult, LoadType, Node  # pylint: disable=E0401
+
+from ext.admission import AdmissionRejected  # pylint: disable=E0401
+from ext.lazy_resolver import LazyResolver  # pylint: disable=E0401
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.metrics import Metrics  # pylint: disable=E0401
+from ext.queue_entry import Stored  # pylint: disable=E0401
+
+logger = get_logger("TrackPrefetcher")
+
+Loader = Callable[[Node, str], Awaitable[LoadResult]]
+
+# Load types meaning the track can still be loaded on the node
+PLAYABLE = (LoadType.TRACK.value, LoadType.SEARCH.value, LoadType.PLAYLIST.value)
+
+
+class TrackPrefetcher:
+    """
+    Prepares the next queue entries while the current track plays
+
+    On every track start, the next `depth` entries are checked. Mirrored
+    entries are resolved through the lazy resolver. Other entries are
+    loaded again on the player's node to catch tracks that were removed or
+    are blocked in the node's region, and such entries are replaced by the
+    best search match, or removed when there is none. Tracks checked within
+    `revalidate_after` seconds are not checked again.
+    """
+
+    def __init__(
+        self,
+        resolver: LazyResolver,
+        validator: Loader,
+        metrics: Metrics,
+        depth: int = 2,
+        timeout: float = 5.0,
+        revalidate_after: float = 600.0,
+    ):
+        self.resolver = resolver
+        self.validator = validator
+        self.metrics = metrics
+        self.depth = depth
+        self.timeout = timeout
+        self.revalidate_after = revalidate_after
+
+        self._checked: Dict[str, float] = {}
+        self._inflight: Dict[Stored, asyncio.Task] = {}
+
+    @classmethod
+    def from_config(
+        cls, resolver: LazyResolver, validator: Loader, metrics: Metrics, config: Dict
+    ) -> "TrackPrefetcher":
+        """
+        Build a prefetcher from the "prefetch" section of the config file
+
+        Args:
+            resolver: Resolver for mirrored entries and replacements
+            validator: Coroutine loading an identifier on a node, uncached
+            metrics: Where to count prefetch outcomes
+            config: The prefetch configuration section
+
+        Returns:
+            A configured TrackPrefetcher
+        """
+        return cls(
+            resolver,
+            validator,
+            metrics,
+            depth=config.get("depth", 2),
+            timeout=config.get("timeout", 5.0),
+            revalidate_after=config.get("revalidate_after", 600.0),
+        )
+
+    def _needs_check(self, entry: Stored) -> bool:
+        if entry.is_stream or not entry.uri or entry in self._inflight:
+            return False
+
+        checked_at = self._checked.get(entry.uri)
+        return checked_at is None or time.monotonic() - checked_at > self.revalidate_after
+
+    def prefetch(self, player: lavalink.DefaultPlayer) -> None:
+        """
+        Start preparing the entries coming up next
+
+        Args:
+            player: The player whose track just started
+        """
+        self.resolver.schedule(player, self.depth, force=True)
+
+        for position, entry in enumerate(player.queue.entries()):
+            if position >= self.depth:
+                break
+            if self.resolver.is_pending(entry) or not self._needs_check(entry):
+                continue
+
+            self._inflight[entry] = asyncio.ensure_future(self._validate(player, entry))
+
+    async def _validate(self, player: lavalink.DefaultPlayer, entry: Stored) -> None:
+        try:
+            try:
+                result = await asyncio.wait_for(
+                    self.validator(player.node, entry.uri), self.timeout
+                )
+            except asyncio.TimeoutError:
+                # A slow node says nothing about the track
+                self.metrics.increment("prefetch_timeouts")
+                return
+            except AdmissionRejected:
+                # Shed while the node is busy, checked again on a later start
+                self.metrics.increment("prefetch_shed")
+                return
+
+            if result.load_type.value in PLAYABLE and result.tracks:
+                self._checked[entry.uri] = time.monotonic()
+                self.metrics.increment("prefetch_valid")
+                self._forget_old_checks()
+                return
+
+            cause = result.error.message if result.error else "no longer available"
+            logger.info(f"'{entry.title}' in guild {player.guild_id} is not playable: {cause}")
+            replacement = await self.resolver.find(player.node, entry, exclude=entry.identifier)
+
+            position = self.resolver.position_of(player, entry, self.depth * 2)
+            if position is None:
+                return
+
+            if replacement is None:
+                del player.queue[position]
+                self.metrics.increment("prefetch_removed")
+                return
+
+            replacement.requester = entry.requester
+            player.queue[position] = replacement
+            self.metrics.increment("prefetch_replaced")
+        except Exception:  # pylint: disable=W0718
+            logger.error(f"Failed to prefetch '{entry.title}' in guild {player.guild_id}", exc_info=True)
+        finally:
+            self._inflight.pop(entry, None)
+
+    def _forget_old_checks(self) -> None:
+        if len(self._checked) < 4096:
+            return
+
+        cutoff = time.monotonic() - self.revalidate_after
+        self._checked = {uri: at for uri, at in self._checked.items() if at > cutoff}
@@ -0,0 +1,169 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import lavalink  # pylint: disable=E0401
+from lavalink import AudioTrack  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+
+logger = get_logger("ProgressiveEnqueue")
+
+# Called with the number of tracks queued so far and the total
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+# Applies a queue change in order with the guild's other actions
+Mutate = Callable[[lavalink.DefaultPlayer, Callable[[], Any]], Awaitable[None]]
+
+# Starts the queue unless something plays
+Starter = Callable[[lavalink.DefaultPlayer], Awaitable[None]]
+
+
+class ProgressiveEnqueue:
+    """
+    Queues large track lists without delaying playback
+
+    The first track is queued and started right away. The rest is appended
+    in background batches of `batch_size`, one queue mutation each, with
+    the event loop free between batches. Mutations and the start go
+    through `mutate` and `start_playback`, so they stay in order with the
+    guild's commands. Progress is reported at most once
+    per `progress_interval` seconds and once when done.
+    """
+
+    def __init__(
+        self,
+        mutate: Mutate,
+        start_playback: Starter,
+        batch_size: int = 100,
+        progress_interval: float = 2.0,
+    ):
+        self.mutate = mutate
+        self.start_playback = start_playback
+        self.batch_size = max(1, batch_size)
+        self.progress_interval = progress_interval
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.runs = 0
+        self.queued = 0
+        self.aborted = 0
+
+    @classmethod
+    def from_config(
+        cls, mutate: Mutate, start_playback: Starter, config: Dict
+    ) -> "ProgressiveEnqueue":
+        """
+        Build an enqueuer from the "progressive_enqueue" section of the config file
+
+        Args:
+            mutate: Coroutine applying a queue change in the player's guild
+            start_playback: Coroutine starting the player's queue
+            config: The progressive enqueue configuration section
+
+        Returns:
+            A configured ProgressiveEnqueue
+        """
+        return cls(
+            mutate,
+            start_playback,
+            batch_size=config.get("batch_size", 100),
+            progress_interval=config.get("progress_interval", 2.0),
+        )
+
+    async def run(
+        self,
+        player: lavalink.DefaultPlayer,
+        tracks: List[AudioTrack],
+        requester: int,
+        on_progress: Optional[ProgressCallback] = None,
+        alive: Callable[[], bool] = lambda: True,
+        on_batch: Optional[Callable[[], Any]] = None,
+    ) -> int:
+        """
+        Queue every track, starting playback after the first one
+
+        Args:
+            player: The player to queue on
+            tracks: The tracks, in order
+            requester: The ID of the user who requested them
+            on_progress: Called with the queued and total track counts
+            alive: Returns False once the player is gone, stopping the run
+            on_batch: Called after each batch is queued
+
+        Returns:
+            Number of tracks queued
+        """
+        self.runs += 1
+        loop = asyncio.get_running_loop()
+        total = len(tracks)
+        done = 0
+        reported_at = loop.time()
+
+        # A single track first, so playback does not wait for the batches
+        bounds = [(0, 1)] + [
+            (start, min(total, start + self.batch_size))
+            for start in range(1, total, self.batch_size)
+        ]
+        for start, stop in bounds:
+            if start >= total:
+                break
+            if start and not alive():
+                self.aborted += 1
+                logger.info(
+                    f"Stopped queueing in guild {player.guild_id} after {done}/{total} tracks"
+                )
+                break
+
+            batch = tracks[start:stop]
+            for track in batch:
+                track.requester = requester
+            await self.mutate(player, functools.partial(player.queue.extend, batch))
+            done += len(batch)
+            self.queued += len(batch)
+
+            if start == 0:
+                await self.start_playback(player)
+            if on_batch:
+                on_batch()
+
+            if on_progress and stop < total and loop.time() - reported_at >= self.progress_interval:
+                reported_at = loop.time()
+                await on_progress(done, total)
+
+            # Let playback, commands and other guilds run between batches
+            await asyncio.sleep(0)
+
+        if on_progress:
+            await on_progress(done, total)
+        return done
+
+    def start(self, *args, **kwargs) -> asyncio.Task:
+        """
+        Run in the background, see run for the arguments
+
+        Returns:
+            The task queueing the tracks
+        """
+        task = asyncio.ensure_future(self.run(*args, **kwargs))
+        self._tasks.add(task)
+        task.add_done_callback(self._finish)
+        return task
+
+    def _finish(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error("Background enqueue failed", exc_info=task.exception())
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get enqueue counters
+
+        Returns:
+            Dictionary with active, run, queued and aborted counts
+        """
+        return {
+            "active": len(self._tasks),
+            "runs": self.runs,
+            "queued": self.queued,
+            "aborted": self.aborted,
+        }
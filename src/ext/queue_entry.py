@@ -0,0 +1,128 @@
+import sys
+from typing import Any, Dict, Optional, Union
+
+from lavalink import AudioTrack  # pylint: disable=E0401
+
+
+def intern(value: Optional[str]) -> Optional[str]:
+    """Share one copy of strings repeated across queues"""
+    return sys.intern(value) if value else value
+
+
+class QueueEntry:
+    """
+    Compact record of a queued track
+
+    An AudioTrack keeps the raw Lavalink dict, its info dict, an instance
+    dict and an extra dict per track. A queue entry keeps the same fields
+    in slots, with source, author and title interned, and builds the
+    AudioTrack again only when the track is played or displayed. The
+    attribute names match AudioTrack, so queue aggregates can read both.
+    """
+
+    __slots__ = (
+        "track",
+        "identifier",
+        "title",
+        "author",
+        "uri",
+        "duration",
+        "is_stream",
+        "is_seekable",
+        "source_name",
+        "artwork_url",
+        "isrc",
+        "requester",
+        "rare",
+    )
+
+    def __init__(self, track: AudioTrack):
+        self.track: Optional[str] = track.track
+        self.identifier: str = track.identifier
+        self.title: str = intern(track.title)
+        self.author: str = intern(track.author)
+        self.uri: str = track.uri
+        self.duration: int = track.duration
+        self.is_stream: bool = track.is_stream
+        self.is_seekable: bool = track.is_seekable
+        self.source_name: str = intern(track.source_name)
+        self.artwork_url: Optional[str] = track.artwork_url
+        self.isrc: Optional[str] = track.isrc
+        self.requester: int = track.requester
+
+        # Plugin data and extra keys are rare, only allocate when present
+        extra = {key: value for key, value in track.extra.items() if key != "requester"}
+        rare = {
+            "pluginInfo": track.plugin_info,
+            "userData": track.user_data,
+            "extra": extra,
+        }
+        self.rare: Optional[Dict[str, Any]] = (
+            {key: value for key, value in rare.items() if value} or None
+        )
+
+    def to_track(self) -> AudioTrack:
+        """
+        Build the full AudioTrack
+
+        Returns:
+            A new AudioTrack equal to the one this entry was made from
+        """
+        rare = self.rare or {}
+        data = {
+            "encoded": self.track,
+            "info": {
+                "identifier": self.identifier,
+                "isSeekable": self.is_seekable,
+                "author": self.author,
+                "length": self.duration,
+                "isStream": self.is_stream,
+                "position": 0,
+                "title": self.title,
+                "uri": self.uri,
+                "artworkUrl": self.artwork_url,
+                "isrc": self.isrc,
+                "sourceName": self.source_name,
+            },
+            "pluginInfo": rare.get("pluginInfo", {}),
+            "userData": rare.get("userData", {}),
+        }
+        return AudioTrack(data, self.requester, **rare.get("extra", {}))
+
+    def __repr__(self) -> str:
+        return f"<QueueEntry title={self.title!r} identifier={self.identifier}>"
+
+
+# What a queue stores, tracks that are not plain AudioTracks are kept as is
+Stored = Union[QueueEntry, AudioTrack]
+
+
+def compact(track: AudioTrack) -> Stored:
+    """
+    Convert a track to what the queue stores
+
+    Args:
+        track: The queued track
+
+    Returns:
+        A QueueEntry, or the track itself for custom track classes
+        such as DeferredAudioTrack that must keep their behavior
+    """
+    if type(track) is AudioTrack:  # pylint: disable=C0123
+        return QueueEntry(track)
+    return track
+
+
+def materialize(stored: Stored) -> AudioTrack:
+    """
+    Get a full track back from what the queue stores
+
+    Args:
+        stored: The stored entry
+
+    Returns:
+        The track
+    """
+    if isinstance(stored, QueueEntry):
+        return stored.to_track()
+    return stored
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import lavalink  # pylint: disable=E0401
+from lavalink import AudioTrack  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.utils import Utils  # pylint: disable=E0401
+
+logger = get_logger("QueueJournal")
+
+# [encoded track, requester ID]
+Entry = List[Any]
+
+# (guild ID, operation name, arguments), serialized by the writer thread
+Record = Tuple[int, str, List[Any]]
+
+
+def to_entry(track: Optional[AudioTrack]) -> Optional[Entry]:
+    """
+    Convert a track to its compact journal form
+
+    Args:
+        track: The track to convert
+
+    Returns:
+        The [encoded, requester] pair, or None for no track
+    """
+    if track is None:
+        return None
+    return [track.track, track.requester]
+
+
+def new_state() -> Dict[str, Any]:
+    """Empty journal state of one guild"""
+    return {"voice": None, "text": None, "now": None, "queue": []}
+
+
+class QueueJournal:
+    """
+    Append-only journal of every guild's queue
+
+    Player mutations are appended as JSON lines holding encoded tracks.
+    Records are buffered and serialized and written by a single background
+    thread once per flush interval. After enough records the file is
+    compacted, replacing it with one snapshot line per guild, taken from
+    the live players rather than from a copy of every queue. On boot the
+    journal is replayed to rebuild each queue, whose tracks are then
+    restored with bulk decoding instead of searching.
+    """
+
+    def __init__(
+        self,
+        relative_path: str = "data/queue_journal.jsonl",
+        flush_interval: float = 1.0,
+        compact_after: int = 10000,
+    ):
+        self.path = Utils.resolve_path(relative_path)
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+
+        # Guilds with journaled state, and loaded states not restored yet
+        self._active: Set[int] = set()
+        self._restoring: Dict[int, List[Any]] = {}
+        self._players: Callable[[], Iterable[lavalink.DefaultPlayer]] = lambda: ()
+        self._buffer: List[Record] = []
+        self._since_compaction = 0
+        self._file = None
+        self._task: Optional[asyncio.Task] = None
+        # One worker keeps appends and compactions in submission order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="queue-journal")
+
+        self.records = 0
+        self.compactions = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "QueueJournal":
+        """
+        Build a journal from the "queue_journal" section of the config file
+
+        Args:
+            config: The queue journal configuration section
+
+        Returns:
+            A configured QueueJournal
+        """
+        return cls(
+            relative_path=config.get("path", "data/queue_journal.jsonl"),
+            flush_interval=config.get("flush_interval", 1.0),
+            compact_after=config.get("compact_after", 10000),
+        )
+
+    @staticmethod
+    def _apply(guilds: Dict[int, Dict[str, Any]], guild_id: int, op: str, args: List[Any]) -> None:
+        if op == "drop":
+            guilds.pop(guild_id, None)
+            return
+
+        state = guilds.setdefault(guild_id, new_state())
+        queue = state["queue"]
+
+        if op == "snap":
+            state["voice"], state["text"], state["now"], state["queue"] = args
+        elif op == "add":
+            index, entries = args
+            queue[index:index] = entries
+        elif op == "remove":
+            index, count = args
+            del queue[index : index + count]
+        elif op == "set":
+            queue[args[0]] = args[1]
+        elif op == "clear":
+            queue.clear()
+        elif op == "shuffle":
+            random.Random(args[0]).shuffle(queue)
+        elif op == "move":
+            queue.insert(args[1], queue.pop(args[0]))
+        elif op == "now":
+            state["now"] = args[0]
+        elif op == "bind":
+            state["voice"], state["text"] = args
+
+    def record(self, guild_id: int, op: str, *args: Any) -> None:
+        """
+        Journal one player operation, used as a MusicPlayer observer
+
+        Args:
+            guild_id: The guild of the player
+            op: The operation name
+            *args: The operation arguments, tracks are stored encoded
+        """
+        if op == "drop":
+            if guild_id not in self._active:
+                return
+            self._active.discard(guild_id)
+        else:
+            self._active.add(guild_id)
+        # The live player supersedes the loaded state
+        self._restoring.pop(guild_id, None)
+
+        if op == "add":
+            args = (args[0], [to_entry(track) for track in args[1]])
+        elif op in ("set", "now"):
+            args = args[:-1] + (to_entry(args[-1]),)
+
+        self._buffer.append((guild_id, op, list(args)))
+        self.records += 1
+        self._since_compaction += 1
+
+    def load(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Replay the journal file
+
+        A line cut short by a crash is skipped, every complete record before
+        it is kept. The loaded states stay in the snapshots until their
+        guild has a player again.
+
+        Returns:
+            The rebuilt state of every guild with something to restore
+        """
+        guilds: Dict[int, Dict[str, Any]] = {}
+        skipped = 0
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                        self._apply(guilds, record["g"], record["op"], record["a"])
+                    except (ValueError, KeyError, IndexError, TypeError):
+                        skipped += 1
+        except FileNotFoundError:
+            return {}
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} unreadable records in {self.path}")
+
+        guilds = {
+            guild_id: state
+            for guild_id, state in guilds.items()
+            if state["voice"] and (state["now"] or state["queue"])
+        }
+        self._restoring = {
+            guild_id: [state["voice"], state["text"], state["now"], state["queue"]]
+            for guild_id, state in guilds.items()
+        }
+        self._active = set(guilds)
+        logger.info(f"Loaded queues of {len(guilds)} guilds from the journal")
+        return {guild_id: dict(state, queue=list(state["queue"])) for guild_id, state in guilds.items()}
+
+    def _snapshot(self) -> List[Record]:
+        # Only references are taken here, the writer thread serializes them
+        states = dict(self._restoring)
+        for player in self._players():
+            if player.guild_id in self._active:
+                states[player.guild_id] = [
+                    player.channel_id,
+                    player.fetch("channel"),
+                    to_entry(player.current),
+                    [[entry.track, entry.requester] for entry in player.queue.entries()],
+                ]
+        return [(guild_id, "snap", args) for guild_id, args in states.items()]
+
+    @staticmethod
+    def _serialize(records: List[Record]) -> str:
+        return "".join(
+            json.dumps({"g": guild_id, "op": op, "a": args}, separators=(",", ":")) + "\n"
+            for guild_id, op, args in records
+        )
+
+    def _write(self, records: List[Record]) -> None:
+        if self._file is None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")  # pylint: disable=R1732
+
+        self._file.write(self._serialize(records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _compact(self, records: List[Record]) -> None:
+        temp = self.path.with_suffix(".tmp")
+        os.makedirs(self.path.parent, exist_ok=True)
+        with open(temp, "w", encoding="utf-8") as file:
+            file.write(self._serialize(records))
+            file.flush()
+            os.fsync(file.fileno())
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        os.replace(temp, self.path)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def flush(self) -> None:
+        """Hand buffered records to the writer thread, compacting when due"""
+        loop = asyncio.get_running_loop()
+
+        if self._since_compaction >= self.compact_after:
+            # The snapshot already contains every buffered record
+            self._buffer = []
+            self._since_compaction = 0
+            self.compactions += 1
+            loop.run_in_executor(self._executor, self._compact, self._snapshot())
+            return
+
+        if self._buffer:
+            records, self._buffer = self._buffer, []
+            loop.run_in_executor(self._executor, self._write, records)
+
+    async def start(self, players: Callable[[], Iterable[lavalink.DefaultPlayer]]) -> None:
+        """
+        Rewrite the loaded state as a snapshot and start the flush loop
+
+        Args:
+            players: Returns every current player, snapshots are taken from them
+        """
+        self._players = players
+        self._buffer = []
+        self._since_compaction = 0
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._compact, self._snapshot())
+        self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=W0718
+                logger.error("Failed to flush the queue journal", exc_info=True)
+
+    def close(self) -> None:
+        """Write what is still buffered and stop the writer"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        if self._buffer:
+            self._executor.submit(self._write, self._buffer)
+            self._buffer = []
+        self._executor.submit(self._close_file)
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get journal counters
+
+        Returns:
+            Dictionary with guild, record, buffered and compaction counts
+        """
+        return {
+            "guilds": len(self._active),
+            "records": self.records,
+            "buffered": len(self._buffer),
+            "compactions": self.compactions,
+        }
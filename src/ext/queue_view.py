@@ -0,0 +1,306 @@
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import disnake  # pylint: disable=E0401
+import lavalink  # pylint: disable=E0401
+
+from ext.component_router import ComponentRouter  # pylint: disable=E0401
+from ext.track_queue import TrackQueue, playable_duration  # pylint: disable=E0401
+
+# Rendered queue line and the time from the queue head until it starts
+Line = Tuple[str, int]
+
+
+class QueuePages:
+    """
+    Renders /queue pages, rendering only the visible page
+
+    The lines of each page are cached per guild together with the queue
+    version they were rendered from, and reused until the queue mutates.
+    Only the parts that move with playback (now playing and start times)
+    are filled in on every render.
+    """
+
+    def __init__(
+        self,
+        format_time: Callable[[int], str],
+        emoji_for: Callable[[lavalink.AudioTrack], str],
+        per_page: int = 10,
+        max_guilds: int = 256,
+        max_pages: int = 32,
+    ):
+        self.format_time = format_time
+        self.emoji_for = emoji_for
+        self.per_page = per_page
+        self.max_guilds = max_guilds
+        self.max_pages = max_pages
+
+        # guild ID -> (queue version, page -> lines)
+        self._cache: "OrderedDict[int, Tuple[int, Dict[int, List[Line]]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def page_count(self, queue: TrackQueue) -> int:
+        """
+        Get the number of pages of a queue
+
+        Args:
+            queue: The queue to page through
+
+        Returns:
+            The page count, at least 1
+        """
+        return max(1, (len(queue) + self.per_page - 1) // self.per_page)
+
+    def _render_lines(self, queue: TrackQueue, page: int) -> List[Line]:
+        start = (page - 1) * self.per_page
+        offset = queue.start_time(start)
+        lines = []
+
+        for i, track in enumerate(queue[start : start + self.per_page], start=start + 1):
+            emoji = self.emoji_for(track)
+            duration = self.format_time(track.duration)
+            requester = track.extra.get("requester", "Unknown")
+
+            lines.append(
+                (
+                    f"`{i}.` {emoji} **[{track.title}]({track.uri})** `[{duration}]`\n"
+                    f"┗ Requested by: <@{requester}>",
+                    offset,
+                )
+            )
+            offset += playable_duration(track)
+
+        return lines
+
+    def lines(self, guild_id: int, queue: TrackQueue, page: int) -> List[Line]:
+        """
+        Get the lines of a page, rendering them only when the queue changed
+
+        Args:
+            guild_id: The guild owning the queue
+            queue: The queue to render
+            page: The 1-based page number
+
+        Returns:
+            The page lines with their start offsets
+        """
+        cached = self._cache.get(guild_id)
+        if cached is None or cached[0] != queue.version:
+            cached = (queue.version, {})
+            self._cache[guild_id] = cached
+        self._cache.move_to_end(guild_id)
+
+        while len(self._cache) > self.max_guilds:
+            self._cache.popitem(last=False)
+
+        pages = cached[1]
+        lines = pages.get(page)
+        if lines is not None:
+            self.hits += 1
+            return lines
+
+        self.misses += 1
+        if len(pages) >= self.max_pages:
+            pages.clear()
+        lines = pages[page] = self._render_lines(queue, page)
+        return lines
+
+    def render(self, player: lavalink.DefaultPlayer, page: int) -> Tuple[disnake.Embed, int, int]:
+        """
+        Build the embed of one queue page
+
+        Args:
+            player: The player whose queue is shown
+            page: The requested page, clamped to the existing pages
+
+        Returns:
+            The embed, the page shown and the page count
+        """
+        queue = player.queue
+        pages = self.page_count(queue)
+        page = max(1, min(page, pages))
+
+        embed = disnake.Embed(title="Current Queue", color=disnake.Color.blurple())
+
+        # Add current track
+        current = player.current
+        remaining = 0
+        if current:
+            current_duration = self.format_time(current.duration)
+            current_pos = self.format_time(player.position)
+            if not current.is_stream:
+                remaining = max(0, current.duration - player.position)
+
+            embed.add_field(
+                name="Now Playing",
+                value=f"{self.emoji_for(current)} **[{current.title}]"
+                f"({current.uri})** `[{current_pos}/{current_duration}]`\n"
+                f"Requested by: <@{current.extra.get('requester', 'Unknown')}>",
+                inline=False,
+            )
+
+        # List the visible page only
+        embed.description = "\n\n".join(
+            f"{line} • starts in `{self.format_time(remaining + offset)}`"
+            for line, offset in self.lines(player.guild_id, queue, page)
+        )
+
+        # Add pagination info
+        embed.set_footer(text=f"Page {page}/{pages} • {len(queue)} songs in queue")
+
+        # Queue stats
+        embed.add_field(
+            name="Queue Info",
+            value=f"**{len(queue)}** tracks | `{self.format_time(queue.duration)}` total length",
+            inline=False,
+        )
+
+        return embed, page, pages
+
+    def invalidate(self, guild_id: int) -> None:
+        """
+        Forget the rendered pages of a guild
+
+        Args:
+            guild_id: The guild to forget
+        """
+        self._cache.pop(guild_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get page cache counters
+
+        Returns:
+            Dictionary with cached guild, hit and miss counts
+        """
+        return {"guilds": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+class QueueControls:
+    """
+    Page controls of /queue messages
+
+    The target page and the user allowed to press them are encoded in the
+    custom IDs of the buttons, the router dispatches every press here.
+    """
+
+    def __init__(
+        self,
+        renderer: QueuePages,
+        router: ComponentRouter,
+        get_player: Callable[[int], Optional[lavalink.DefaultPlayer]],
+    ):
+        self.renderer = renderer
+        self.router = router
+        self.get_player = get_player
+
+        router.route("queue_page", self._on_page)
+        router.route("queue_jump", self._on_jump)
+        router.route("queue_goto", self._on_goto)
+
+    def render(
+        self, player: lavalink.DefaultPlayer, page: int, author_id: int
+    ) -> Tuple[disnake.Embed, List[disnake.ui.Button]]:
+        """
+        Render a page and the buttons to move from it
+
+        Args:
+            player: The player whose queue is shown
+            page: The requested page
+            author_id: The user allowed to use the buttons
+
+        Returns:
+            The page embed and its buttons
+        """
+        embed, page, pages = self.renderer.render(player, page)
+
+        def button(
+            name: str, emoji: str, action: str, target: int, disabled: bool
+        ) -> disnake.ui.Button:
+            return disnake.ui.Button(
+                emoji=emoji,
+                style=disnake.ButtonStyle.gray,
+                # Buttons may target the same page, the name keeps their IDs unique
+                custom_id=self.router.custom_id(action, author_id, target, name),
+                disabled=disabled,
+            )
+
+        buttons = [
+            button("first", "⏮️", "queue_page", 1, page == 1),
+            button("previous", "⬅️", "queue_page", page - 1, page == 1),
+            button("jump", "🔢", "queue_jump", page, pages == 1),
+            button("next", "➡️", "queue_page", page + 1, page == pages),
+            button("last", "⏭️", "queue_page", pages, page == pages),
+        ]
+        return embed, buttons
+
+    async def show(self, inter: disnake.Interaction, page: int) -> None:
+        """
+        Edit the queue message to show a page
+
+        Args:
+            inter: The component or modal interaction
+            page: The requested page
+        """
+        player = self.get_player(inter.guild_id)
+
+        if not player or not player.queue:
+            return await inter.response.edit_message(
+                content="Queue is now empty", embed=None, components=[]
+            )
+
+        embed, buttons = self.render(player, page, inter.author.id)
+        await inter.response.edit_message(embed=embed, components=buttons)
+
+    @staticmethod
+    async def _allowed(inter: disnake.Interaction, author_id: str) -> bool:
+        if inter.author.id == int(author_id):
+            return True
+
+        embed = disnake.Embed(
+            title="❌ Error",
+            description="You cannot use these controls.",
+            color=disnake.Color.red(),
+        )
+        await inter.response.send_message(embed=embed, ephemeral=True)
+        return False
+
+    async def _on_page(self, inter: disnake.MessageInteraction, author_id: str, page: str, _name):
+        if await self._allowed(inter, author_id):
+            await self.show(inter, int(page))
+
+    async def _on_jump(self, inter: disnake.MessageInteraction, author_id: str, page: str, _name):
+        if not await self._allowed(inter, author_id):
+            return
+
+        player = self.get_player(inter.guild_id)
+        pages = self.renderer.page_count(player.queue) if player else 1
+        await inter.response.send_modal(
+            title="Jump to page",
+            custom_id=self.router.custom_id("queue_goto", author_id),
+            components=[
+                disnake.ui.TextInput(
+                    label=f"Page (1-{pages})",
+                    custom_id="page",
+                    placeholder=page,
+                    max_length=6,
+                )
+            ],
+        )
+
+    async def _on_goto(self, inter: disnake.ModalInteraction, author_id: str):
+        if not await self._allowed(inter, author_id):
+            return
+
+        try:
+            page = int(inter.text_values["page"])
+        except ValueError:
+            embed = disnake.Embed(
+                title="❌ Error",
+                description="Please enter a page number.",
+                color=disnake.Color.red(),
+            )
+            return await inter.response.send_message(embed=embed, ephemeral=True)
+
+        await self.show(inter, page)
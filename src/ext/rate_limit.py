@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Allows `rate` operations per `per` seconds, with bursts up to `rate`
+    """
+
+    def __init__(self, rate: float, per: float):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token if one is available
+
+        Returns:
+            True if a token was taken
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def is_full(self) -> bool:
+        """
+        Check whether the bucket has refilled completely
+
+        Returns:
+            True if a full burst is available
+        """
+        self._refill()
+        return self.tokens >= self.rate
+
+    def delay(self) -> float:
+        """
+        Get how long until a token is available
+
+        Returns:
+            Seconds to wait, 0 when a token is available now
+        """
+        self._refill()
+        return max(0.0, (1 - self.tokens) * self.per / self.rate)
+
+    async def acquire(self) -> None:
+        """Wait for a token and take it"""
+        while not self.try_acquire():
+            await asyncio.sleep(self.delay())
@@ -0,0 +1,139 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from lavalink import AudioTrack  # pylint: disable=E0401
+
+# Guild, user and the interaction that started the search
+SessionKey = Tuple[int, int, int]
+
+
+class SearchSession(NamedTuple):
+    tracks: List[AudioTrack]
+    expires_at: float
+
+
+class SearchSessions:
+    """
+    Pending /search results, one session per search
+
+    Sessions expire `ttl` seconds after they were last used, the timeout of
+    the result menu.
+    The tracks held by all sessions together are bounded by `max_tracks`,
+    the least recently used sessions are evicted first.
+    """
+
+    def __init__(self, ttl: float = 60, max_tracks: int = 5000):
+        self.ttl = ttl
+        self.max_tracks = max_tracks
+        self._sessions: "OrderedDict[SessionKey, SearchSession]" = OrderedDict()
+        self._tracks = 0
+
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "SearchSessions":
+        """
+        Build a session store from the "search_sessions" section of the config file
+
+        Args:
+            config: The search sessions configuration section
+
+        Returns:
+            A configured SearchSessions
+        """
+        return cls(ttl=config.get("ttl", 60), max_tracks=config.get("max_tracks", 5000))
+
+    def put(self, key: SessionKey, tracks: List[AudioTrack]) -> None:
+        """
+        Store the results of a search
+
+        Args:
+            key: The session key
+            tracks: The results offered in the menu
+        """
+        self.discard(key)
+        self._purge_expired()
+
+        self._sessions[key] = SearchSession(tracks, time.monotonic() + self.ttl)
+        self._tracks += len(tracks)
+
+        while self._tracks > self.max_tracks and len(self._sessions) > 1:
+            _, evicted = self._sessions.popitem(last=False)
+            self._tracks -= len(evicted.tracks)
+            self.evictions += 1
+
+    def get(self, key: SessionKey) -> Optional[List[AudioTrack]]:
+        """
+        Look up the results of a search
+
+        Args:
+            key: The session key
+
+        Returns:
+            The tracks, or None if the session expired or was evicted
+        """
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+
+        now = time.monotonic()
+        if session.expires_at <= now:
+            self.discard(key)
+            self.expirations += 1
+            return None
+
+        # Refreshing the expiry keeps recency order and expiry order the same
+        self._sessions[key] = session._replace(expires_at=now + self.ttl)
+        self._sessions.move_to_end(key)
+        return session.tracks
+
+    def discard(self, key: SessionKey) -> None:
+        """
+        End a session
+
+        Args:
+            key: The session key
+        """
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            self._tracks -= len(session.tracks)
+
+    def discard_guild(self, guild_id: int) -> None:
+        """
+        End every session of a guild
+
+        Args:
+            guild_id: The guild
+        """
+        for key in [key for key in self._sessions if key[0] == guild_id]:
+            self.discard(key)
+
+    def _purge_expired(self) -> None:
+        # Sessions share one TTL counted from their last use, so the least
+        # recently used ones expire first
+        now = time.monotonic()
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if session.expires_at > now:
+                break
+            self.discard(key)
+            self.expirations += 1
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get session counters
+
+        Returns:
+            Dictionary with session, track, eviction and expiration counts
+        """
+        return {
+            "sessions": len(self._sessions),
+            "tracks": self._tracks,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
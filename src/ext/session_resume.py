@@ -0,0 +1,123 @@
+import json
+import time
+from typing import Any, Dict, Optional
+
+import lavalink  # pylint: disable=E0401
+from lavalink.errors import ClientError, RequestError  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+from ext.utils import Utils  # pylint: disable=E0401
+
+logger = get_logger("SessionStore")
+
+
+class SessionStore:
+    """
+    Saves Lavalink sessions and player bindings across a bot restart
+
+    Before shutting down, resuming is enabled on every node and each player's
+    node, channels and queue are written to disk. The node keeps the session
+    (and audio) alive for the resume timeout, so the next process can attach
+    to the same session and rebind its players instead of starting over.
+    """
+
+    def __init__(self, relative_path: str = "data/resume.json", timeout: int = 60):
+        self.relative_path = relative_path
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "SessionStore":
+        """
+        Build a store from the "resume" section of the config file
+
+        Args:
+            config: The resume configuration section
+
+        Returns:
+            A configured SessionStore
+        """
+        return cls(
+            relative_path=config.get("path", "data/resume.json"),
+            timeout=config.get("timeout", 60),
+        )
+
+    @staticmethod
+    def snapshot_player(player: lavalink.DefaultPlayer) -> Dict[str, Any]:
+        """
+        Capture what is needed to rebind a player after a restart
+
+        Args:
+            player: The player to capture
+
+        Returns:
+            JSON-serializable player state
+        """
+        current = player.current
+        return {
+            "node": player.node.name,
+            "voice_channel": player.channel_id,
+            "text_channel": player.fetch("channel"),
+            "current": [current.track, current.requester] if current else None,
+            "position": player.position,
+            "paused": player.paused,
+            "volume": player.volume,
+            "loop": player.loop,
+            "queue": [[entry.track, entry.requester] for entry in player.queue.entries()],
+        }
+
+    async def suspend(self, client: lavalink.Client) -> int:
+        """
+        Enable resuming on every node and save all player bindings
+
+        Args:
+            client: The Lavalink client
+
+        Returns:
+            Number of players saved
+        """
+        nodes = {}
+        for node in client.nodes:
+            if not node.available or not node.session_id:
+                continue
+
+            try:
+                await node.update_session(resuming=True, timeout=self.timeout)
+                nodes[node.name] = node.session_id
+            except (ClientError, RequestError) as e:
+                logger.warning(f"Could not enable resuming on node {node.name}: {e}")
+
+        players = {
+            str(guild_id): self.snapshot_player(player)
+            for guild_id, player in client.player_manager
+            if player.is_connected and player.node.name in nodes
+        }
+
+        state = {"saved_at": time.time(), "nodes": nodes, "players": players}
+        Utils.write_file(self.relative_path, json.dumps(state))
+        logger.info(f"Saved {len(players)} players on {len(nodes)} nodes for resuming")
+        return len(players)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read and consume the saved state
+
+        Returns:
+            The saved state, or None if there is none or it is too old to resume
+        """
+        path = Utils.resolve_path(self.relative_path)
+
+        try:
+            state = json.loads(Utils.read_file(self.relative_path))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(f"Ignoring unreadable resume state in {path}")
+            state = None
+        finally:
+            path.unlink(missing_ok=True)
+
+        if not state or time.time() - state["saved_at"] > self.timeout:
+            return None
+
+        logger.info(f"Found {len(state['players'])} players to resume")
+        return state
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight task
+
+    The first caller starts the work, every caller arriving before it finishes
+    awaits the same task. Results and exceptions reach every waiter, and a
+    waiter being cancelled never cancels the shared work.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run factory once for all concurrent callers using the same key
+
+        Args:
+            key: Identifies identical work
+            factory: Creates the awaitable doing the work
+
+        Returns:
+            The shared result
+        """
+        future = self._inflight.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+        # Mark the exception as retrieved when every waiter went away
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the coalescing counters
+
+        Returns:
+            Dictionary with in-flight, started and coalesced counts
+        """
+        return {
+            "inflight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,91 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ext.logger import get_logger  # pylint: disable=E0401
+
+logger = get_logger("SqliteStore")
+
+
+class SqliteStore:
+    """
+    Base class for SQLite databases used from the event loop
+
+    All statements run on a single worker thread so the connection is never
+    shared between threads. The database runs in WAL mode, which lets several
+    bot processes read it while one of them writes.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=self.__class__.__name__
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        if self.SCHEMA:
+            self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a blocking database function on the worker thread
+
+        Args:
+            func: Function taking the connection as its first argument
+            *args: Extra arguments for the function
+
+        Returns:
+            Whatever the function returns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, args)
+
+    def submit(self, func: Callable[..., Any], *args) -> None:
+        """
+        Queue a blocking database function without waiting for it
+
+        Errors are logged instead of raised.
+
+        Args:
+            func: Function taking the connection as its first argument
+            *args: Extra arguments for the function
+        """
+        future = self._executor.submit(self._call, func, args)
+        future.add_done_callback(self._log_failure)
+
+    def _call(self, func: Callable[..., Any], args: tuple) -> Any:
+        if self._conn is None:
+            self._connect()
+        return func(self._conn, *args)
+
+    @staticmethod
+    def _log_failure(future) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Background database write failed: {error}")
+
+    async def open(self) -> None:
+        """Open the database and create its schema"""
+        await self.run(lambda conn: None)
+        logger.info(f"Opened {self.path}")
+
+    def close(self) -> None:
+        """Flush pending work and close the database"""
+        self._executor.submit(self._close)
+        self._executor.shutdown(wait=True)
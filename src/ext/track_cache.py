@@ -0,0 +1,233 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from lavalink import LoadResult, LoadType  # pylint: disable=E0401
+
+# Matches Lavalink search identifiers such as "ytsearch:query"
+SEARCH_PREFIX_RX = re.compile(r"^(?P<prefix>[a-z]+search):(?P<query>.*)$", re.I | re.S)
+
+# Sources behind the search prefixes Lavalink and its plugins understand
+SEARCH_SOURCES = {
+    "ytsearch": "youtube",
+    "ytmsearch": "youtube",
+    "scsearch": "soundcloud",
+    "spsearch": "spotify",
+    "amsearch": "applemusic",
+    "dzsearch": "deezer",
+    "bcsearch": "bandcamp",
+}
+
+# Query parameters that only carry tracking data and never change the result
+TRACKING_PARAMS = {"si", "feature", "pp", "fbclid", "gclid", "context", "nd"}
+
+CacheKey = Tuple[str, str, str]
+
+
+class CacheEntry(NamedTuple):
+    result: LoadResult
+    expires_at: float
+
+
+def clone_result(result: LoadResult) -> LoadResult:
+    """
+    Copy a load result so callers can mutate their tracks safely
+
+    Args:
+        result: The result to copy
+
+    Returns:
+        A new LoadResult holding fresh track objects
+    """
+    return LoadResult(
+        result.load_type,
+        [track.__class__(track) for track in result.tracks],
+        result.playlist_info,
+        result.plugin_info,
+        result.error,
+    )
+
+
+class TrackCache:
+    """
+    Bounded LRU cache with per load-type TTLs for Lavalink load results
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        search_ttl: float = 900,
+        track_ttl: float = 21600,
+        playlist_ttl: float = 1800,
+    ):
+        self.max_entries = max_entries
+        self.ttls = {
+            LoadType.SEARCH.value: search_ttl,
+            LoadType.TRACK.value: track_ttl,
+            LoadType.PLAYLIST.value: playlist_ttl,
+        }
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "TrackCache":
+        """
+        Build a cache from the "cache" section of the config file
+
+        Args:
+            config: The cache configuration section
+
+        Returns:
+            A configured TrackCache
+        """
+        return cls(
+            max_entries=config.get("max_entries", 4096),
+            search_ttl=config.get("search_ttl", 900),
+            track_ttl=config.get("track_ttl", 21600),
+            playlist_ttl=config.get("playlist_ttl", 1800),
+        )
+
+    @staticmethod
+    def make_key(query: str) -> CacheKey:
+        """
+        Normalize a Lavalink identifier into a cache key
+
+        Search queries are case and whitespace folded, URLs lose their
+        tracking parameters and fragments so share links hit the same entry.
+
+        Args:
+            query: The identifier passed to Node.get_tracks
+
+        Returns:
+            A (source, prefix, normalized query) tuple
+        """
+        query = query.strip()
+        match = SEARCH_PREFIX_RX.match(query)
+
+        if match:
+            prefix = match.group("prefix").lower()
+            text = " ".join(match.group("query").split()).casefold()
+            return SEARCH_SOURCES.get(prefix, prefix), prefix, text
+
+        parts = urlsplit(query)
+        if not parts.scheme or not parts.netloc:
+            return "unknown", "", query
+
+        host = parts.netloc.lower()
+        if host.startswith("www."):
+            host = host[4:]
+
+        params = sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key not in TRACKING_PARAMS and not key.startswith("utm_")
+        )
+        url = urlunsplit(
+            (parts.scheme.lower(), host, parts.path.rstrip("/"), urlencode(params), "")
+        )
+
+        source = host.split(".")[-2] if host.count(".") else host
+        if source == "youtu":
+            source = "youtube"
+
+        return source, "", url
+
+    def get(self, key: CacheKey) -> Optional[LoadResult]:
+        """
+        Look up a cached result
+
+        Args:
+            key: Key built by make_key
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return clone_result(entry.result)
+
+    def ttl_for(self, result: LoadResult) -> float:
+        """
+        Get how long a result may be cached
+
+        Args:
+            result: The result returned by Lavalink
+
+        Returns:
+            TTL in seconds, 0 for results that must not be cached
+        """
+        if not result.tracks:
+            return 0
+        return self.ttls.get(result.load_type.value, 0)
+
+    def put(self, key: CacheKey, result: LoadResult, ttl: Optional[float] = None) -> None:
+        """
+        Store a result, evicting the least recently used entries when full
+
+        Empty and failed loads are never cached.
+
+        Args:
+            key: Key built by make_key
+            result: The result returned by Lavalink
+            ttl: Override for the load type TTL, in seconds
+        """
+        if ttl is None:
+            ttl = self.ttl_for(result)
+        if ttl <= 0 or not result.tracks:
+            return
+
+        self._entries[key] = CacheEntry(clone_result(result), time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: CacheKey) -> None:
+        """
+        Drop a single entry from the cache
+
+        Args:
+            key: Key built by make_key
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters
+
+        Returns:
+            Dictionary with size, hit, miss, eviction and expiration counts
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
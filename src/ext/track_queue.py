@@ -0,0 +1,278 @@
+import itertools
+import random
+from collections import Counter
+from collections.abc import MutableSequence
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+from lavalink import AudioTrack  # pylint: disable=E0401
+
+from ext.indexed_list import IndexedList  # pylint: disable=E0401
+from ext.queue_entry import Stored, compact, materialize  # pylint: disable=E0401
+
+# Called with the operation name and its arguments after every mutation
+MutationCallback = Callable[..., None]
+
+# Versions are unique across queues, a new queue never reuses an old one
+_versions = itertools.count(1)
+
+
+def playable_duration(track: AudioTrack) -> int:
+    """
+    Duration a track adds to the queue length
+
+    Args:
+        track: The track to measure
+
+    Returns:
+        Its duration in milliseconds, 0 for streams
+    """
+    return 0 if track.is_stream else track.duration
+
+
+class TrackQueue(MutableSequence):
+    """
+    List-like player queue that reports every mutation
+
+    Each change is reported as one operation with plain arguments, so
+    observers such as the queue journal can mirror the queue without
+    diffing it:
+
+        add(index, tracks), remove(index, count), set(index, track),
+        clear(), shuffle(seed), move(source, destination)
+
+    Indexes passed to observers are always normalized and non-negative,
+    and every mutation bumps the queue version.
+    Tracks are kept in an IndexedList, so positional lookups, inserts,
+    moves and range removals stay cheap on queues of thousands of tracks.
+
+    Aggregates are maintained on every mutation instead of being computed
+    by scanning: the total duration, track counts per requester and per
+    source, the stream count and the time until any position starts.
+    Requesters are counted as they were when the track was queued.
+
+    Tracks are stored as compact QueueEntry records. Reading the queue
+    builds AudioTrack objects on demand, entries() gives the records
+    themselves for code that only needs their fields.
+    """
+
+    def __init__(
+        self,
+        on_mutation: Optional[MutationCallback] = None,
+        tracks: Iterable[AudioTrack] = (),
+    ):
+        self._tracks: IndexedList[Stored] = IndexedList(weight=playable_duration)
+        self._on_mutation = on_mutation
+        self.version = next(_versions)
+
+        self.requesters: Counter = Counter()
+        self.sources: Counter = Counter()
+        self.streams = 0
+        self._tracks.insert_many(0, map(compact, tracks))
+        self._count(self._tracks, 1)
+
+    @staticmethod
+    def _bump(counter: Counter, key: Any, sign: int) -> None:
+        count = counter[key] + sign
+        if count:
+            counter[key] = count
+        else:
+            # Drop emptied keys so the counters only hold what is queued
+            del counter[key]
+
+    def _count(self, tracks: Iterable[AudioTrack], sign: int) -> None:
+        for track in tracks:
+            self._bump(self.requesters, track.requester, sign)
+            self._bump(self.sources, track.source_name, sign)
+            self.streams += sign * track.is_stream
+
+    @property
+    def duration(self) -> int:
+        """Total length of the queued tracks in milliseconds, streams excluded"""
+        return self._tracks.total_weight
+
+    def start_time(self, index: int) -> int:
+        """
+        Time from the head of the queue until a position starts playing
+
+        Args:
+            index: The position in the queue
+
+        Returns:
+            The summed duration of every track before it, in milliseconds
+        """
+        return self._tracks.prefix_weight(index)
+
+    def _notify(self, op: str, *args: Any) -> None:
+        self.version = next(_versions)
+        if self._on_mutation is not None:
+            self._on_mutation(op, *args)
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += len(self._tracks)
+        if not 0 <= index < len(self._tracks):
+            raise IndexError("queue index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __iter__(self) -> Iterator[AudioTrack]:
+        return map(materialize, self._tracks)
+
+    def entries(self, start: int = 0) -> Iterator[Stored]:
+        """
+        Iterate over the stored records without building tracks
+
+        Args:
+            start: The first position to yield
+
+        Returns:
+            Iterator over the QueueEntry records from start to the end
+        """
+        return self._tracks.iter_from(start)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[AudioTrack, List[AudioTrack]]:
+        if isinstance(index, slice):
+            return [materialize(stored) for stored in self._tracks[index]]
+        return materialize(self._tracks[index])
+
+    def __setitem__(self, index: int, track: AudioTrack) -> None:
+        index = self._normalize(index)
+        self._count([self._tracks[index]], -1)
+        self._tracks[index] = compact(track)
+        self._count([track], 1)
+        self._notify("set", index, track)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._tracks))
+            if step != 1:
+                # Delete back to front so the remaining indexes stay valid
+                for i in sorted(range(start, stop, step), reverse=True):
+                    del self[i]
+                return
+
+            self.remove_range(start, stop)
+            return
+
+        self.pop(index)
+
+    def iter_from(self, start: int) -> Iterator[AudioTrack]:
+        """
+        Iterate over the queue from a position
+
+        Args:
+            start: The first position to yield
+
+        Returns:
+            Iterator over the tracks from start to the end
+        """
+        return map(materialize, self._tracks.iter_from(start))
+
+    def insert(self, index: int, track: AudioTrack) -> None:
+        self.insert_many(index, [track])
+
+    def insert_many(self, index: int, tracks: Iterable[AudioTrack]) -> None:
+        """
+        Insert several tracks at one position as a single mutation
+
+        Args:
+            index: Position of the first inserted track, clamped like list.insert
+            tracks: The tracks to insert, in order
+        """
+        tracks = list(tracks)
+        if not tracks:
+            return
+
+        size = len(self._tracks)
+        if index < 0:
+            index = max(0, index + size)
+        index = min(index, size)
+
+        self._tracks.insert_many(index, map(compact, tracks))
+        self._count(tracks, 1)
+        self._notify("add", index, tracks)
+
+    def extend(self, tracks: Iterable[AudioTrack]) -> None:
+        """
+        Append several tracks as a single mutation
+
+        Args:
+            tracks: The tracks to append
+        """
+        self.insert_many(len(self._tracks), tracks)
+
+    def remove_range(self, start: int, stop: int) -> int:
+        """
+        Remove every track in [start, stop) as a single mutation
+
+        Args:
+            start: First position to remove
+            stop: Position after the last one to remove
+
+        Returns:
+            The number of removed tracks
+        """
+        start, stop, _ = slice(start, stop).indices(len(self._tracks))
+        removed = self._tracks.delete_range(start, stop)
+        if removed:
+            self._count(removed, -1)
+            self._notify("remove", start, len(removed))
+        return len(removed)
+
+    def pop(self, index: int = -1) -> AudioTrack:
+        index = self._normalize(index)
+        stored = self._tracks.pop(index)
+        self._count([stored], -1)
+        self._notify("remove", index, 1)
+        return materialize(stored)
+
+    def clear(self) -> None:
+        if not self._tracks:
+            return
+
+        self._tracks.clear()
+        self.requesters.clear()
+        self.sources.clear()
+        self.streams = 0
+        self._notify("clear")
+
+    def shuffle(self, seed: Optional[int] = None) -> None:
+        """
+        Shuffle the queue in place
+
+        The seed is reported to observers, replaying the shuffle on a copy
+        of the queue with random.Random(seed) gives the same order.
+
+        Args:
+            seed: Seed for the shuffle, a random one is picked when omitted
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+
+        tracks = list(self._tracks)
+        random.Random(seed).shuffle(tracks)
+        self._tracks.reset(tracks)
+        self._notify("shuffle", seed)
+
+    def move(self, source: int, destination: int) -> AudioTrack:
+        """
+        Move a track to another position
+
+        Args:
+            source: Current index of the track
+            destination: Index the track should end up at
+
+        Returns:
+            The moved track
+        """
+        source = self._normalize(source)
+        stored = self._tracks.pop(source)
+        destination = max(0, min(destination, len(self._tracks)))
+        self._tracks.insert(destination, stored)
+        self._notify("move", source, destination)
+        return materialize(stored)
+
+    def __repr__(self) -> str:
+        return f"<TrackQueue tracks={len(self._tracks)}>"
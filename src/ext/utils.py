@@ -1,4 +1,5 @@
 import functools
+import json
 import os
 import sys
 from pathlib import Path
@@ -189,6 +190,22 @@ class Utils:
         with open(file_path, "w", encoding=encoding) as file:
             file.write(content)
 
+    @staticmethod
+    def load_config(relative_path: str = "config/config.json") -> Dict[str, Any]:
+        """
+        Load the JSON configuration file from a path relative to project root
+
+        Args:
+            relative_path: Path relative to project root
+
+        Returns:
+            Parsed configuration, or an empty dict if the file is missing
+        """
+        try:
+            return json.loads(Utils.read_file(relative_path))
+        except FileNotFoundError:
+            return {}
+
     @staticmethod
     def ensure_str(func):
         @functools.wraps(func)
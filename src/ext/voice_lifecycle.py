@@ -0,0 +1,198 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+import lavalink  # pylint: disable=E0401
+
+from ext.logger import get_logger  # pylint: disable=E0401
+
+logger = get_logger("VoiceLifecycle")
+
+# Called with the guild ID and the reason the bot leaves
+Leave = Callable[[int, str], Awaitable[None]]
+# Returns whether the player's voice channel has no listeners left
+IsEmpty = Callable[[lavalink.DefaultPlayer], bool]
+
+
+class VoiceLifecycle:
+    """
+    Decides when connected players leave their voice channel
+
+    After the queue ends, the connection lingers for `linger` seconds, so
+    the next request reuses it instead of connecting again. One sweep every
+    `sweep_interval` seconds reaps players that lingered too long, stayed
+    paused for `idle_timeout` seconds or were left alone in their channel
+    for `empty_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        leave: Leave,
+        is_empty: IsEmpty,
+        linger: float = 120.0,
+        idle_timeout: float = 600.0,
+        empty_timeout: float = 60.0,
+        sweep_interval: float = 15.0,
+    ):
+        self.leave = leave
+        self.is_empty = is_empty
+        self.linger = linger
+        self.idle_timeout = idle_timeout
+        self.empty_timeout = empty_timeout
+        self.sweep_interval = sweep_interval
+
+        # guild ID -> monotonic time the condition started
+        self._finished: Dict[int, float] = {}
+        self._paused: Dict[int, float] = {}
+        self._empty: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.reaped: Dict[str, int] = {"linger": 0, "idle": 0, "empty": 0}
+
+    @classmethod
+    def from_config(cls, leave: Leave, is_empty: IsEmpty, config: Dict) -> "VoiceLifecycle":
+        """
+        Build a lifecycle policy from the "voice" section of the config file
+
+        Args:
+            leave: Coroutine disconnecting a guild's player
+            is_empty: Checks whether a player's channel has no listeners
+            config: The voice configuration section
+
+        Returns:
+            A configured VoiceLifecycle
+        """
+        return cls(
+            leave,
+            is_empty,
+            linger=config.get("linger", 120.0),
+            idle_timeout=config.get("idle_timeout", 600.0),
+            empty_timeout=config.get("empty_timeout", 60.0),
+            sweep_interval=config.get("sweep_interval", 15.0),
+        )
+
+    def start(self, players: Callable[[], Iterable[lavalink.DefaultPlayer]]) -> None:
+        """
+        Start the sweep
+
+        Args:
+            players: Returns the current players
+        """
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._sweep_loop(players))
+
+    def stop(self) -> None:
+        """Stop the sweep"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def queue_finished(self, guild_id: int) -> None:
+        """
+        Start lingering after the queue ended
+
+        Args:
+            guild_id: The guild whose queue ended
+        """
+        self._finished[guild_id] = time.monotonic()
+
+    def track_started(self, guild_id: int) -> None:
+        """
+        Cancel lingering, a track plays again
+
+        Args:
+            guild_id: The guild playing a track
+        """
+        self._finished.pop(guild_id, None)
+
+    def forget(self, guild_id: int) -> None:
+        """
+        Drop everything kept about a guild
+
+        Args:
+            guild_id: The guild whose player is gone
+        """
+        self._finished.pop(guild_id, None)
+        self._paused.pop(guild_id, None)
+        self._empty.pop(guild_id, None)
+
+    async def _sweep_loop(self, players: Callable[[], Iterable[lavalink.DefaultPlayer]]) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep(list(players()))
+            except Exception:  # pylint: disable=W0718
+                logger.error("Voice lifecycle sweep failed", exc_info=True)
+
+    def _since(self, states: Dict[int, float], guild_id: int, active: bool, now: float) -> float:
+        """Seconds a condition has held, 0 while it does not"""
+        if not active:
+            states.pop(guild_id, None)
+            return 0.0
+        return now - states.setdefault(guild_id, now)
+
+    async def sweep(self, players: Iterable[lavalink.DefaultPlayer]) -> int:
+        """
+        Reap the players that stayed idle or alone for too long
+
+        Args:
+            players: Every current player
+
+        Returns:
+            Number of players reaped
+        """
+        now = time.monotonic()
+        reaped = 0
+        seen = set()
+
+        for player in players:
+            guild_id = player.guild_id
+            seen.add(guild_id)
+            if not player.is_connected:
+                continue
+
+            finished_at = self._finished.get(guild_id)
+            paused_for = self._since(
+                self._paused, guild_id, player.paused and player.current is not None, now
+            )
+            empty_for = self._since(self._empty, guild_id, self.is_empty(player), now)
+
+            reason = None
+            if finished_at is not None and now - finished_at >= self.linger:
+                reason = "linger"
+            elif paused_for >= self.idle_timeout:
+                reason = "idle"
+            elif empty_for >= self.empty_timeout:
+                reason = "empty"
+
+            if reason is None:
+                continue
+
+            self.forget(guild_id)
+            self.reaped[reason] += 1
+            reaped += 1
+            try:
+                await self.leave(guild_id, reason)
+            except asyncio.CancelledError:
+                # Only the sweep being stopped ends it, not a cancelled leave
+                if asyncio.current_task().cancelling():
+                    raise
+                logger.warning(f"Leaving voice in guild {guild_id} was cancelled")
+            except Exception:  # pylint: disable=W0718
+                logger.error(f"Failed to leave voice in guild {guild_id}", exc_info=True)
+
+        # Players destroyed elsewhere
+        for states in (self._finished, self._paused, self._empty):
+            for guild_id in [guild_id for guild_id in states if guild_id not in seen]:
+                del states[guild_id]
+
+        return reaped
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get lifecycle counters
+
+        Returns:
+            Dictionary with lingering players and reaped counts per reason
+        """
+        return {"lingering": len(self._finished), **{f"reaped_{k}": v for k, v in self.reaped.items()}}
@@ -48,10 +48,17 @@ async def on_ready():
     )  # type: ignore
 
 
-async def shutdown(signal, loop):
+async def shutdown(signal, loop, restart=False):
     """Graceful shutdown handler"""
     logger = get_logger(__name__)
     logger.info(f"Received {signal.name}, shutting down...")
+
+    # In restart mode the players are handed over to the next process
+    if restart:
+        music = bot.get_cog("MusicCog")
+        if music:
+            await music.suspend()
+
     await bot.close()
 
 
@@ -70,10 +77,19 @@ if __name__ == "__main__":
     try:
         loop = asyncio.get_event_loop()
         if platform.system() != "Windows":
-            signals = (signal.SIGINT, signal.SIGTERM)
-            for s in signals:
+            # SIGHUP always restarts, SIGTERM only when configured to (for deploy tools)
+            resume_on_sigterm = Utils.load_config().get("resume", {}).get("on_sigterm", False)
+            signals = {
+                signal.SIGINT: False,
+                signal.SIGTERM: resume_on_sigterm,
+                signal.SIGHUP: True,
+            }
+            for s, restart in signals.items():
                 loop.add_signal_handler(
-                    s, lambda s=s: asyncio.create_task(shutdown(s, loop))
+                    s,
+                    lambda s=s, restart=restart: asyncio.create_task(
+                        shutdown(s, loop, restart)
+                    ),
                 )
         else:
             logger.warning("Signal handlers are not supported on Windows. Use Ctrl+C to stop the bot.")